@@ -0,0 +1,138 @@
+"""
+Кэш готовых ответов для горячих GET-эндпоинтов.
+
+Ответ сериализуется один раз и хранится байтами вместе с поколением данных
+(app.services.generation), на котором построен. После записи в БД
+поколение растёт, и старые ответы перестают выдаваться; кроме того, запись
+живёт не дольше RESPONSE_CACHE_TTL_SECONDS (записи из других процессов и
+окна «за последние N часов» сдвигаются без смены поколения).
+
+ETag — хеш тела ответа (сильный валидатор): клиент с If-None-Match получает
+304 без тела, в том числе после смены поколения, если данные не изменились.
+Одновременные промахи по одному ключу строят ответ один раз.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.services.generation import current_generation
+
+
+class CachedResponse(NamedTuple):
+    generation: int
+    created_at: float
+    etag: str
+    body: bytes
+
+
+class ResponseCache:
+    """LRU-кэш тел ответов, ограниченный числом записей и суммарным размером."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._building: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.generation != current_generation() or time.monotonic() - entry.created_at > self.ttl:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._drop(key)
+        self._entries[key] = entry
+        self._size += len(entry.body)
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    async def get_or_build(self, key: str, build: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        """Ответ из кэша или построенный build() (один на ключ, даже при параллельных промахах)."""
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        task = self._building.get(key)
+        if task is None:
+            task = self._building[key] = asyncio.ensure_future(self._build(key, build))
+            task.add_done_callback(lambda _: self._building.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _build(self, key: str, build: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        generation = current_generation()
+        body = _dumps(await build())
+        entry = CachedResponse(generation, time.monotonic(), _etag(body), body)
+        # Если за время построения поколение сменилось, запись уже устарела
+        self.put(key, entry)
+        return entry
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_ENTRIES,
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+async def cached_json(request: Request, build: Callable[[], Awaitable[Any]]) -> Response:
+    """JSON-ответ эндпоинта через кэш: build() вызывается только при промахе.
+
+    Ключ — путь и отсортированные параметры запроса; ответ 304, если
+    If-None-Match совпадает с ETag.
+    """
+    key = f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+    entry = await response_cache.get_or_build(key, build)
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+def _dumps(content: Any) -> bytes:
+    # Как starlette.responses.JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match: список ETag или «*»; сравнение слабое, как требует RFC 9110."""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
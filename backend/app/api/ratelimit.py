@@ -0,0 +1,128 @@
+"""
+Ограничение частоты запросов: ASGI-middleware на корзинах токенов.
+
+Каждому ключу (IP клиента, а для отдельных правил — IP и путь) соответствует
+корзина из двух чисел: сколько запросов осталось и когда она пополнялась.
+Корзина вмещает policy.requests токенов и наполняется равномерно за
+policy.window секунд, так что средний темп совпадает с прежним «N запросов
+за окно», а проверка стоит O(1) независимо от лимита.
+
+Корзины одного лимита лежат в OrderedDict в порядке последнего обращения.
+Ключ, к которому не обращались дольше окна, уже наполнен до краёв и ничем не
+отличается от отсутствующего — такие ключи вычищаются с начала словаря при
+каждом запросе; число ключей дополнительно ограничено max_keys (вытесняются
+самые давние).
+"""
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+
+
+class RatePolicy(NamedTuple):
+    requests: int  # ёмкость корзины
+    window: float  # секунд на полное наполнение
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.window
+
+
+class RateRule(NamedTuple):
+    """Отдельный лимит для метода и пути; считается по IP и пути."""
+    method: str
+    path: str
+    policy: RatePolicy
+
+
+_TOO_MANY = json.dumps({"error": "Too many requests"}).encode()
+
+
+class RateLimitMiddleware:
+    """Лимит запросов по IP (HTTP-запросы; lifespan и прочее проходят насквозь)."""
+
+    def __init__(
+        self,
+        app,
+        default: RatePolicy,
+        rules: Tuple[RateRule, ...] = (),
+        max_keys: int = 100_000,
+    ):
+        self.app = app
+        self.default = default
+        self.rules = {(rule.method, rule.path): rule.policy for rule in rules}
+        self.max_keys = max_keys
+        # Отдельная таблица корзин на каждый лимит: у них разное время простоя
+        self._tables: Dict[RatePolicy, "OrderedDict[str, List[float]]"] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        policy = self.rules.get((scope["method"], scope["path"]))
+        if policy is None:
+            policy, key = self.default, client_ip
+        else:
+            key = f"{client_ip}:{scope['path']}"
+
+        retry_after = self.acquire(key, policy, time.monotonic())
+        if retry_after is None:
+            await self.app(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_TOO_MANY)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _TOO_MANY})
+
+    def acquire(self, key: str, policy: RatePolicy, now: float) -> Optional[float]:
+        """Взять токен. None — запрос пропущен, иначе — секунд до следующего токена."""
+        buckets = self._tables.get(policy)
+        if buckets is None:
+            buckets = self._tables[policy] = OrderedDict()
+        self._evict(buckets, policy, now)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [float(policy.requests), now]
+        else:
+            buckets.move_to_end(key)
+            bucket[0] = min(policy.requests, bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            return (1 - bucket[0]) / policy.rate
+        bucket[0] -= 1
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for buckets in self._tables.values())
+
+    def _evict(self, buckets: "OrderedDict[str, List[float]]", policy: RatePolicy, now: float) -> None:
+        # Корзина, не тронутая дольше окна, снова полная — её можно забыть
+        while buckets:
+            key, (_, updated) = next(iter(buckets.items()))
+            if now - updated <= policy.window and len(buckets) < self.max_keys:
+                break
+            del buckets[key]
+
+
+def default_rules() -> Tuple[RateRule, ...]:
+    """Правила из настроек: отдельный (строже) лимит на ручной сбор."""
+    return (
+        RateRule(
+            "POST", "/api/collect",
+            RatePolicy(settings.RATE_LIMIT_COLLECT_REQUESTS, settings.RATE_LIMIT_COLLECT_WINDOW_SECONDS),
+        ),
+    )
@@ -1,5 +1,15 @@
 from fastapi import APIRouter
+from .archive import router as archive_router
 from .articles import router as articles_router
+from .collect import router as collect_router
+from .schedule import router as schedule_router
+from .search import router as search_router
+from .stream import router as stream_router
 
 api_router = APIRouter()
 api_router.include_router(articles_router)
+api_router.include_router(archive_router)
+api_router.include_router(collect_router)
+api_router.include_router(schedule_router)
+api_router.include_router(search_router)
+api_router.include_router(stream_router)
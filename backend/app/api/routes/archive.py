@@ -0,0 +1,37 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.archive import is_month, list_months, month_articles
+from app.services.read_model import article_dict
+
+router = APIRouter(prefix="/api", tags=["archive"])
+
+
+@router.get("/archive")
+async def archive_index():
+    """Месяцы архива старых статей (от новых к старым) и число статей в каждом."""
+    months = await asyncio.to_thread(list_months)
+    return {"count": len(months), "months": months}
+
+
+@router.get("/archive/{month}")
+async def archive_month(
+    month: str,
+    source_id: Optional[int] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+):
+    """Статьи месяца YYYY-MM из архива, от новых к старым."""
+    if not is_month(month):
+        raise HTTPException(status_code=400, detail="Month must be YYYY-MM")
+    if month not in {m["month"] for m in await asyncio.to_thread(list_months)}:
+        raise HTTPException(status_code=404, detail="Month not archived")
+    rows, total = await asyncio.to_thread(month_articles, month, source_id, limit, offset)
+    return {
+        "month": month,
+        "total": total,
+        "count": len(rows),
+        "articles": [article_dict(row) for row in rows],
+    }
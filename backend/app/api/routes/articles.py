@@ -1,17 +1,34 @@
+import asyncio
+import json
+import zlib
 from datetime import datetime, timedelta, UTC
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.cache import cached_json
 from app.config import settings
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_async_db
 from app.models.article import Article
-from app.models.source import Source
-from app.services.collector import collect_all
+from app.services.archive import archive_row, find_archived
+from app.services.bodies import load_body
+from app.services.read_model import (
+    SUMMARY_LENGTH,
+    article_dict,
+    article_rows,
+    source_rows,
+    story_rows,
+)
+from app.utils.cursor import article_cursor, decode_id_cursor, encode_id_cursor, older_than
 
 router = APIRouter(prefix="/api", tags=["articles"])
 
+# Каждая выгрузка держит соединение с БД до конца ответа
+_export_slots = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT)
+
 
 def _verify_api_key(x_api_key: str = Header(alias="X-API-Key")) -> str:
     """Verify API key for protected endpoints."""
@@ -23,91 +40,205 @@ def _verify_api_key(x_api_key: str = Header(alias="X-API-Key")) -> str:
 
 
 @router.get("/articles")
-def list_articles(
+async def list_articles(
     source_id: Optional[int] = None,
-    limit: int = Query(default=20, le=100),
-    offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="next_cursor предыдущей страницы"),
+    offset: int = Query(default=0, ge=0, deprecated=True),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    query = db.query(Article).options(joinedload(Article.source))
+    """Статьи от новых к старым; страницы листаются по next_cursor (keyset)."""
+    stmt = article_rows()
     if source_id:
-        query = query.filter(Article.source_id == source_id)
-    articles = (
-        query.order_by(Article.published_at.desc()).offset(offset).limit(limit).all()
-    )
+        stmt = stmt.where(Article.source_id == source_id)
+    if cursor:
+        try:
+            stmt = stmt.where(older_than(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    stmt = stmt.order_by(Article.published_at.desc(), Article.id.desc())
+    if offset and not cursor:
+        stmt = stmt.offset(offset)
+    rows = (await db.execute(stmt.limit(limit))).all()
+    next_cursor = article_cursor(rows[-1]) if len(rows) == limit else None
     return {
-        "count": len(articles),
-        "articles": [_article_to_dict(a) for a in articles],
+        "count": len(rows),
+        "articles": [article_dict(row) for row in rows],
+        "next_cursor": next_cursor,
     }
 
 
 @router.get("/articles/latest")
-def latest_articles(
+async def latest_articles(
+    request: Request,
     limit: int = Query(default=10, le=50),
-    db: Session = Depends(get_db),
 ):
-    articles = (
-        db.query(Article)
-        .options(joinedload(Article.source))
-        .order_by(Article.published_at.desc())
-        .limit(limit)
-        .all()
-    )
-    return {"count": len(articles), "articles": [_article_to_dict(a) for a in articles]}
+    # Сессия открывается только при промахе кэша
+    async def build():
+        async with AsyncSessionLocal() as db:
+            rows = (
+                await db.execute(article_rows().order_by(Article.published_at.desc()).limit(limit))
+            ).all()
+        return {"count": len(rows), "articles": [article_dict(row) for row in rows]}
+
+    return await cached_json(request, build)
 
 
 @router.get("/articles/top")
-def top_articles(
+async def top_articles(
+    request: Request,
     hours: int = Query(default=24, le=168),
     limit: int = Query(default=20, le=50),
-    db: Session = Depends(get_db),
 ):
-    """Топ статей за последние N часов (по дате публикации)."""
-    since = datetime.now(UTC) - timedelta(hours=hours)
-    articles = (
-        db.query(Article)
-        .options(joinedload(Article.source))
-        .filter(Article.published_at >= since)
-        .order_by(Article.published_at.desc())
-        .limit(limit)
-        .all()
-    )
-    return {"count": len(articles), "articles": [_article_to_dict(a) for a in articles]}
+    """Топ статей за последние N часов (по дате публикации), одна на сюжет."""
+    async def build():
+        since = datetime.now(UTC) - timedelta(hours=hours)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(story_rows(since, limit))).all()
+        return {"count": len(rows), "articles": [article_dict(row) for row in rows]}
 
+    return await cached_json(request, build)
 
-@router.get("/sources")
-def list_sources(db: Session = Depends(get_db)):
-    sources = db.query(Source).filter(Source.is_active == True).all()
+
+@router.get("/articles/export")
+async def export_articles(
+    request: Request,
+    since: Optional[str] = Query(default=None, description="next_cursor предыдущей выгрузки"),
+    source_id: Optional[int] = None,
+):
+    """Все статьи после курсора в NDJSON: строка на статью, по возрастанию id.
+
+    Последняя строка — {"next_cursor": ..., "count": ...}; выгрузка с этим
+    курсором вернёт только статьи, записанные после неё. Нет этой строки —
+    ответ оборван, повторите с прежним курсором. Строки читаются из курсора
+    БД пачками по EXPORT_BATCH_SIZE, память не зависит от объёма выгрузки;
+    с Accept-Encoding: gzip ответ сжимается на лету.
+    """
+    after_id = 0
+    if since:
+        try:
+            after_id = decode_id_cursor(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    if _export_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many exports in progress")
+    # Свободный слот занимается без ожидания (между проверкой и захватом нет
+    # await), дальше им владеет _export_chunks и освобождает в finally
+    await _export_slots.acquire()
+    try:
+        async with AsyncSessionLocal() as db:
+            upto = (await db.execute(select(func.max(Article.id)))).scalar() or 0
+        if after_id > upto:
+            # Курсор из другой (пересозданной) БД: нужна полная выгрузка
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    except BaseException:
+        _export_slots.release()
+        raise
+
+    next_cursor = encode_id_cursor(upto)
+    body = _export_chunks(after_id, upto, source_id, next_cursor)
+    # Запущенный генератор освободит слот, даже если ответ так и не начнут
+    # отдавать (клиент отключился): его закроет сборщик асинхронных генераторов
+    await anext(body)
+    headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding", "X-Next-Cursor": next_cursor}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+async def _export_chunks(
+    after_id: int, upto: int, source_id: Optional[int], next_cursor: str
+) -> AsyncIterator[bytes]:
+    # Верхняя граница upto фиксирует выгрузку: статьи, записанные во время
+    # неё, достанутся следующей выгрузке по next_cursor
+    stmt = (
+        article_rows(summary_length=None)
+        .add_columns(Article.source_id)
+        .where(Article.id > after_id, Article.id <= upto)
+    )
+    if source_id:
+        stmt = stmt.where(Article.source_id == source_id)
+    stmt = stmt.order_by(Article.id).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    count = 0
+    try:
+        yield b""  # запуск из export_articles: слот уже занят
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for rows in result.partitions():
+                count += len(rows)
+                yield "".join(_export_line(row) for row in rows).encode()
+        yield _json_line({"next_cursor": next_cursor, "count": count}).encode()
+    finally:
+        _export_slots.release()
+
+
+def _export_line(row) -> str:
+    return _json_line({**article_dict(row), "source_id": row.source_id})
+
+
+def _json_line(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: формат gzip
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+@router.get("/articles/{article_id:int}")
+async def get_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Одна статья с полным текстом (из article_bodies, для старых статей — из архива)."""
+    row = (
+        await db.execute(article_rows(summary_length=None).where(Article.id == article_id))
+    ).first()
+    if row is None:
+        record = await asyncio.to_thread(find_archived, article_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail="Article not found")
+        return {
+            **article_dict(archive_row(record)),
+            "content": record["content"] or record["summary"] or "",
+        }
+    content = await db.run_sync(load_body, article_id)
     return {
-        "count": len(sources),
-        "sources": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "url": s.url,
-                "category": s.category,
-                "articles_count": s.articles_count or 0,
-                "last_checked": s.last_checked.isoformat() if s.last_checked else None,
-            }
-            for s in sources
-        ],
+        **article_dict(row),
+        "summary": row.summary[:SUMMARY_LENGTH],
+        "content": content or row.summary,
     }
 
 
-@router.post("/collect")
-async def trigger_collect(_key: str = Depends(_verify_api_key)):
-    """Ручной запуск сбора новостей (requires X-API-Key header)."""
-    result = await collect_all()
-    return result
-
+@router.get("/sources")
+async def list_sources(request: Request):
+    async def build():
+        async with AsyncSessionLocal() as db:
+            sources = (await db.execute(source_rows())).all()
+        return {
+            "count": len(sources),
+            "sources": [
+                {
+                    "id": s.id,
+                    "name": s.name,
+                    "url": s.url,
+                    "category": s.category,
+                    "articles_count": s.articles_count,
+                    "last_checked": s.last_checked.isoformat() if s.last_checked else None,
+                }
+                for s in sources
+            ],
+        }
+
+    return await cached_json(request, build)
 
-def _article_to_dict(a: Article) -> dict:
-    return {
-        "id": a.id,
-        "title": a.title,
-        "url": a.url,
-        "summary": (a.summary or "")[:300],
-        "author": a.author,
-        "source": a.source.name if a.source else None,
-        "published_at": a.published_at.isoformat() if a.published_at else None,
-    }
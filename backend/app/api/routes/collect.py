@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models.collect_run import CollectRun
+from app.services.jobs import collect_jobs, recent_runs, run_dict
+
+from .articles import _verify_api_key
+
+router = APIRouter(prefix="/api", tags=["collect"])
+
+
+@router.post("/collect", status_code=202)
+async def trigger_collect(_key: str = Depends(_verify_api_key)):
+    """Запуск сбора новостей в фоне (requires X-API-Key header).
+
+    Сразу отвечает 202 с id запуска; если сбор уже идёт, возвращает его.
+    Ход сбора — GET /api/collect/{id}.
+    """
+    job = await collect_jobs.submit("api")
+    return JSONResponse(
+        status_code=202,
+        content=job.to_dict(),
+        headers={"Location": f"/api/collect/{job.id}"},
+    )
+
+
+@router.get("/collect")
+async def list_collect_runs(
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """История сборов, от новых к старым."""
+    runs = [
+        job.to_dict() if (job := collect_jobs.get(run.id)) else run_dict(run)
+        for run in await db.run_sync(recent_runs, limit)
+    ]
+    return {"count": len(runs), "runs": runs}
+
+
+@router.get("/collect/{run_id}")
+async def get_collect_run(run_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Состояние сбора: статус, время и прогресс по источникам."""
+    job = collect_jobs.get(run_id)
+    if job:
+        return job.to_dict()
+    run = await db.get(CollectRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Collect run not found")
+    return run_dict(run)
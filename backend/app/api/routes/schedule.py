@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+router = APIRouter(prefix="/api", tags=["schedule"])
+
+
+@router.get("/schedule")
+async def list_schedule():
+    """Следующие плановые опросы источников и их наблюдаемая частота публикаций."""
+    # Планировщик (apscheduler) не импортируется при загрузке API
+    from app.tasks.scheduler import get_schedule
+
+    planned = await get_schedule()
+    return {"count": len(planned), "schedule": planned}
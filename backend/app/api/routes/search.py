@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.services.archive import search_archive
+from app.services.read_model import article_dict
+from app.services.search import count_matches, render_snippet, search_articles
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(min_length=1, max_length=200, description="Слова запроса; «слово*» — по префиксу"),
+    source_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(default=20, ge=1, le=50),
+    offset: int = Query(default=0, ge=0, le=1000),
+    archive: bool = Query(default=False, description="Продолжить поиск в архиве старых статей"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Полнотекстовый поиск (BM25) по заголовку, аннотации и тексту статей.
+
+    С archive=true, когда совпадения в БД кончаются, страница дополняется
+    статьями из архива (от новых к старым, rank = 0).
+    """
+    try:
+        hits = await db.run_sync(
+            search_articles, q, source_id, since, until, limit, offset
+        )
+        if archive and len(hits) < limit:
+            # Позиция в архиве: сколько совпадений страница уже прошла в БД
+            skip = 0
+            if not hits and offset:
+                skip = offset - await db.run_sync(count_matches, q, source_id, since, until)
+            hits += await asyncio.to_thread(
+                search_archive, q, source_id, since, until, limit - len(hits), max(0, skip)
+            )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Empty search query")
+    return {
+        "query": q,
+        "count": len(hits),
+        "articles": [
+            {
+                **article_dict(hit.article),
+                "snippet": render_snippet(hit.snippet, "<mark>", "</mark>"),
+                "rank": hit.rank,
+            }
+            for hit in hits
+        ],
+    }
@@ -0,0 +1,85 @@
+import asyncio
+import contextlib
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.services.events import ArticleEvent, article_broker, article_stream
+
+router = APIRouter(prefix="/api", tags=["stream"])
+
+# Через сколько мс EventSource переподключается после обрыва
+SSE_RETRY_MS = 3000
+
+
+@router.get("/stream")
+async def stream_articles(
+    source_id: Optional[int] = None,
+    last_event_id: Optional[int] = Query(default=None, description="id последней полученной статьи"),
+    last_event_id_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Новые статьи по мере записи (Server-Sent Events, событие article).
+
+    При переподключении EventSource сам присылает Last-Event-ID, и поток
+    начинается с пропущенных статей; событие reset значит, что пропущено
+    слишком много — список стоит перечитать через /api/articles/latest.
+    """
+    if last_event_id_header:
+        try:
+            last_event_id = int(last_event_id_header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+    if article_broker.full:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+
+    async def frames():
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        async for event in article_stream(last_event_id, source_id):
+            if event is None:
+                yield b": ping\n\n"
+            else:
+                yield f"id: {event.id}\nevent: {event.event}\ndata: {event.data}\n\n".encode()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/stream/ws")
+async def stream_articles_ws(
+    websocket: WebSocket,
+    source_id: Optional[int] = None,
+    last_event_id: Optional[int] = None,
+):
+    """Тот же поток через WebSocket: сообщения {"id", "event", "data"}."""
+    await websocket.accept()
+    if article_broker.full:
+        await websocket.close(code=1013)  # Try Again Later
+        return
+
+    async def forward():
+        async for event in article_stream(last_event_id, source_id):
+            await websocket.send_text(_ws_message(event))
+        await websocket.close()
+
+    async def until_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(forward()), asyncio.create_task(until_disconnect())}
+    _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    for task in tasks:
+        # Обрыв соединения посреди отправки — обычное завершение потока
+        with contextlib.suppress(Exception, asyncio.CancelledError):
+            await task
+
+
+def _ws_message(event: Optional[ArticleEvent]) -> str:
+    if event is None:
+        return '{"event":"ping"}'
+    return f'{{"id":{event.id},"event":"{event.event}","data":{event.data}}}'
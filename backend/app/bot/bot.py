@@ -35,25 +35,17 @@ async def start_bot():
 async def send_digest_to_owner():
     """Отправить дайджест владельцу."""
     from datetime import datetime, timedelta, UTC
-    from sqlalchemy.orm import joinedload
-    from app.database import SessionLocal
-    from app.models.article import Article
+    from app.database import AsyncSessionLocal
     from app.bot.formatters import format_digest
+    from app.services.read_model import story_rows
 
     if not settings.TELEGRAM_OWNER_ID:
         return
 
-    db = SessionLocal()
     try:
-        since = datetime.now(UTC) - timedelta(hours=24)
-        articles = (
-            db.query(Article)
-            .options(joinedload(Article.source))
-            .filter(Article.published_at >= since)
-            .order_by(Article.published_at.desc())
-            .limit(20)
-            .all()
-        )
+        async with AsyncSessionLocal() as db:
+            since = datetime.now(UTC) - timedelta(hours=24)
+            articles = (await db.execute(story_rows(since, limit=20))).all()
 
         text = format_digest(articles)
         # Telegram ограничивает длину сообщения 4096 символов
@@ -68,8 +60,6 @@ async def send_digest_to_owner():
         logger.info(f"Дайджест отправлен: {len(articles)} статей")
     except Exception as e:
         logger.error(f"Ошибка отправки дайджеста: {e}")
-    finally:
-        db.close()
 
 
 def setup_digest_job():
@@ -1,12 +1,12 @@
 from datetime import datetime, UTC
-from typing import List
+from typing import Sequence
 
-from app.models.article import Article
+from app.services.search import render_snippet
 
 
-def format_article(article: Article, index: int = 0) -> str:
-    """Форматировать одну статью для Telegram (HTML)."""
-    source_name = article.source.name if article.source else "Неизвестно"
+def format_article(article, index: int = 0) -> str:
+    """Форматировать одну статью (строку read_model.article_rows) для Telegram (HTML)."""
+    source_name = article.source or "Неизвестно"
     date_str = ""
     if article.published_at:
         date_str = article.published_at.strftime("%d.%m %H:%M")
@@ -26,7 +26,7 @@ def format_article(article: Article, index: int = 0) -> str:
     return "\n".join(lines)
 
 
-def format_article_list(articles: List[Article], title: str = "") -> str:
+def format_article_list(articles: Sequence, title: str = "") -> str:
     """Форматировать список статей."""
     if not articles:
         return "Новостей пока нет."
@@ -41,7 +41,7 @@ def format_article_list(articles: List[Article], title: str = "") -> str:
     return "\n\n".join(parts)
 
 
-def format_digest(articles: List[Article]) -> str:
+def format_digest(articles: Sequence) -> str:
     """Форматировать дайджест."""
     if not articles:
         return "За последнее время новых AI-новостей не найдено."
@@ -52,7 +52,7 @@ def format_digest(articles: List[Article]) -> str:
 
     parts = [header]
     for i, article in enumerate(articles, 1):
-        source_name = article.source.name if article.source else ""
+        source_name = article.source or ""
         date_str = article.published_at.strftime("%H:%M") if article.published_at else ""
         parts.append(
             f'{i}. <a href="{article.url}">{_escape(article.title)}</a>\n'
@@ -62,6 +62,26 @@ def format_digest(articles: List[Article]) -> str:
     return "\n".join(parts)
 
 
+def format_search_results(query: str, hits) -> str:
+    """Форматировать результаты поиска (SearchHit) со сниппетами."""
+    if not hits:
+        return f"По запросу «{_escape(query)}» ничего не найдено."
+
+    parts = [f"<b>Поиск: {_escape(query)}</b>\n"]
+    for i, hit in enumerate(hits, 1):
+        article = hit.article
+        source_name = article.source or ""
+        date_str = article.published_at.strftime("%d.%m.%Y") if article.published_at else ""
+        snippet = render_snippet(hit.snippet, "<b>", "</b>", escape=_escape)
+        parts.append(
+            f'<b>{i}.</b> <a href="{article.url}">{_escape(article.title)}</a>\n'
+            f"<i>{source_name}</i> | {date_str}\n"
+            f"{snippet}"
+        )
+
+    return "\n\n".join(parts)
+
+
 def format_sources(sources) -> str:
     """Форматировать список источников."""
     if not sources:
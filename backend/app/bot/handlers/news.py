@@ -1,75 +1,79 @@
 import logging
 import math
 from datetime import datetime, timedelta, UTC
+from typing import Optional
 
 from aiogram import F, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.types import CallbackQuery, Message
-from sqlalchemy.orm import joinedload
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.article import Article
-from app.models.source import Source
-from app.bot.formatters import format_article_list, format_digest, format_sources
+from app.bot.formatters import (
+    format_article_list,
+    format_digest,
+    format_search_results,
+    format_sources,
+)
 from app.bot.keyboards import get_main_keyboard, get_pagination_kb, get_refresh_kb
-from app.services.collector import collect_all
+from app.services.jobs import collect_jobs
+from app.services.counters import total_articles
+from app.services.read_model import article_rows, source_rows, story_rows
+from app.services.search import search_articles
+from app.utils.cursor import article_cursor, decode_cursor, newer_than, older_than
 
 logger = logging.getLogger(__name__)
 
 router = Router()
 
 ARTICLES_PER_PAGE = 10
+SEARCH_RESULTS = 10
+
+
+async def _get_articles(limit: int = 10, cursor: Optional[str] = None, backward: bool = False):
+    """Страница статей от новых к старым по keyset-курсору.
+
+    backward=True — страница перед курсором (кнопка «Назад»).
+    """
+    async with AsyncSessionLocal() as db:
+        stmt = article_rows()
+        if cursor and backward:
+            stmt = (
+                stmt.where(newer_than(cursor))
+                .order_by(Article.published_at.asc(), Article.id.asc())
+            )
+        else:
+            if cursor:
+                stmt = stmt.where(older_than(cursor))
+            stmt = stmt.order_by(Article.published_at.desc(), Article.id.desc())
+        articles = (await db.execute(stmt.limit(limit))).all()
+        if backward:
+            articles = articles[::-1]
+        total = await db.run_sync(total_articles)
+        return articles, total
 
 
-def _get_articles(limit: int = 10, offset: int = 0):
-    db = SessionLocal()
-    try:
-        articles = (
-            db.query(Article)
-            .options(joinedload(Article.source))
-            .order_by(Article.published_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
-        total = db.query(Article).count()
-        # Eagerly load all needed data before closing session
-        for a in articles:
-            _ = a.source.name if a.source else None
-        return articles, total
-    finally:
-        db.close()
+def _pagination_kb(articles, page: int, total_pages: int):
+    if not articles:
+        return get_pagination_kb(page, total_pages, prefix="latest")
+    return get_pagination_kb(
+        page,
+        total_pages,
+        prefix="latest",
+        prev_cursor=article_cursor(articles[0]),
+        next_cursor=article_cursor(articles[-1]),
+    )
 
 
-def _get_articles_since(hours: int = 24, limit: int = 20):
-    db = SessionLocal()
-    try:
+async def _get_articles_since(hours: int = 24, limit: int = 20):
+    async with AsyncSessionLocal() as db:
         since = datetime.now(UTC) - timedelta(hours=hours)
-        articles = (
-            db.query(Article)
-            .options(joinedload(Article.source))
-            .filter(Article.published_at >= since)
-            .order_by(Article.published_at.desc())
-            .limit(limit)
-            .all()
-        )
-        for a in articles:
-            _ = a.source.name if a.source else None
-        return articles
-    finally:
-        db.close()
+        return (await db.execute(story_rows(since, limit))).all()
 
 
-def _get_sources():
-    db = SessionLocal()
-    try:
-        sources = db.query(Source).filter(Source.is_active == True).all()
-        # Force load before closing session
-        for s in sources:
-            _ = s.articles_count
-        return sources
-    finally:
-        db.close()
+async def _get_sources():
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(source_rows())).all()
 
 
 # --- Команды ---
@@ -78,10 +82,10 @@ def _get_sources():
 @router.message(Command("latest"))
 @router.message(F.text == "Последние новости")
 async def cmd_latest(message: Message):
-    articles, total = _get_articles(limit=ARTICLES_PER_PAGE, offset=0)
+    articles, total = await _get_articles(limit=ARTICLES_PER_PAGE)
     text = format_article_list(articles, title="Последние новости AI")
     total_pages = math.ceil(total / ARTICLES_PER_PAGE)
-    kb = get_pagination_kb(0, total_pages, prefix="latest")
+    kb = _pagination_kb(articles, 0, total_pages)
 
     if len(text) > 4000:
         text = text[:4000] + "\n\n..."
@@ -92,7 +96,7 @@ async def cmd_latest(message: Message):
 @router.message(Command("digest"))
 @router.message(F.text == "Дайджест")
 async def cmd_digest(message: Message):
-    articles = _get_articles_since(hours=24, limit=20)
+    articles = await _get_articles_since(hours=24, limit=20)
     text = format_digest(articles)
 
     if len(text) > 4000:
@@ -104,7 +108,7 @@ async def cmd_digest(message: Message):
 @router.message(Command("top20"))
 @router.message(F.text == "Топ-20")
 async def cmd_top20(message: Message):
-    articles = _get_articles_since(hours=48, limit=20)
+    articles = await _get_articles_since(hours=48, limit=20)
     text = format_article_list(articles, title="Топ-20 AI новостей за 48 часов")
 
     if len(text) > 4000:
@@ -116,16 +120,40 @@ async def cmd_top20(message: Message):
 @router.message(Command("sources"))
 @router.message(F.text == "Источники")
 async def cmd_sources(message: Message):
-    sources = _get_sources()
+    sources = await _get_sources()
     text = format_sources(sources)
     await message.answer(text, disable_web_page_preview=True)
 
 
+@router.message(Command("search"))
+async def cmd_search(message: Message, command: CommandObject):
+    query = (command.args or "").strip()
+    if not query:
+        await message.answer("Использование: /search &lt;запрос&gt;, например /search gpt agents")
+        return
+
+    async with AsyncSessionLocal() as db:
+        try:
+            hits = await db.run_sync(search_articles, query[:200], limit=SEARCH_RESULTS)
+        except ValueError:
+            hits = []
+    text = format_search_results(query[:200], hits)
+
+    if len(text) > 4000:
+        text = text[:4000] + "\n\n..."
+
+    await message.answer(text, disable_web_page_preview=True)
+
+
 @router.message(Command("collect"))
 async def cmd_collect(message: Message):
-    msg = await message.answer("Запускаю сбор новостей...")
+    if collect_jobs.busy:
+        msg = await message.answer("Сбор уже идёт, дождусь его завершения...")
+    else:
+        msg = await message.answer("Запускаю сбор новостей...")
     try:
-        result = await collect_all()
+        job = await collect_jobs.submit("bot")
+        result = await job.wait()
         await msg.edit_text(
             f"Сбор завершён!\n\n"
             f"Найдено статей: {result['total_found']}\n"
@@ -143,19 +171,31 @@ async def cmd_collect(message: Message):
 @router.callback_query(F.data.startswith("latest:"))
 async def cb_latest_page(callback: CallbackQuery):
     await callback.answer()
+    # latest:{страница}:{b|f}:{курсор}; кнопки старого формата latest:{страница}
+    # курсора не несут — для них показываем первую страницу
+    parts = callback.data.split(":")
+    cursor = None
+    backward = False
     try:
-        page = int(callback.data.split(":")[1])
+        page = int(parts[1])
         if page < 0 or page > 10000:
             return
+        if len(parts) == 4 and parts[2] in ("b", "f"):
+            backward = parts[2] == "b"
+            cursor = parts[3]
+            decode_cursor(cursor)
+        else:
+            page = 0
     except (ValueError, IndexError):
         return
-    offset = page * ARTICLES_PER_PAGE
 
-    articles, total = _get_articles(limit=ARTICLES_PER_PAGE, offset=offset)
+    articles, total = await _get_articles(
+        limit=ARTICLES_PER_PAGE, cursor=cursor, backward=backward
+    )
     total_pages = math.ceil(total / ARTICLES_PER_PAGE)
 
     text = format_article_list(articles, title=f"Новости AI (стр. {page + 1}/{total_pages})")
-    kb = get_pagination_kb(page, total_pages, prefix="latest")
+    kb = _pagination_kb(articles, page, total_pages)
 
     if len(text) > 4000:
         text = text[:4000] + "\n\n..."
@@ -168,7 +208,7 @@ async def cb_latest_page(callback: CallbackQuery):
 @router.callback_query(F.data == "refresh")
 async def cb_refresh(callback: CallbackQuery):
     await callback.answer("Обновляю...")
-    articles = _get_articles_since(hours=24, limit=20)
+    articles = await _get_articles_since(hours=24, limit=20)
     text = format_digest(articles)
 
     if len(text) > 4000:
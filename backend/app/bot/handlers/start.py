@@ -12,12 +12,13 @@ async def cmd_start(message: Message):
     await message.answer(
         "<b>AI News Monitor</b>\n\n"
         "Мониторинг новостей искусственного интеллекта "
-        "из 8 ведущих мировых источников.\n\n"
+        "из 10 ведущих мировых источников.\n\n"
         "Команды:\n"
         "/latest — последние 10 новостей\n"
         "/digest — дайджест за 24 часа\n"
         "/top20 — топ-20 новостей\n"
         "/sources — источники\n"
+        "/search — поиск по архиву\n"
         "/collect — запустить сбор вручную\n"
         "/help — помощь",
         reply_markup=get_main_keyboard(),
@@ -32,6 +33,7 @@ async def cmd_help(message: Message):
         "/digest — дайджест за последние 24 часа\n"
         "/top20 — топ-20 новостей за 48 часов\n"
         "/sources — список источников и статистика\n"
+        "/search &lt;запрос&gt; — поиск по всем статьям\n"
         "/collect — запустить сбор новостей вручную\n\n"
         "Новости собираются автоматически каждые 4 часа.\n"
         "Утренний дайджест приходит в 10:00 МСК.",
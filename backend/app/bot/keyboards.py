@@ -1,3 +1,5 @@
+from typing import Optional
+
 from aiogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -24,17 +26,25 @@ def get_main_keyboard() -> ReplyKeyboardMarkup:
     )
 
 
-def get_pagination_kb(page: int, total_pages: int, prefix: str = "page") -> InlineKeyboardMarkup:
-    """Клавиатура пагинации."""
+def get_pagination_kb(
+    page: int,
+    total_pages: int,
+    prefix: str = "page",
+    prev_cursor: Optional[str] = None,
+    next_cursor: Optional[str] = None,
+) -> InlineKeyboardMarkup:
+    """Клавиатура пагинации.
+
+    С курсорами кнопки несут позицию keyset-пагинации:
+    callback_data = "{prefix}:{страница}:{b|f}:{курсор}" (b — назад, f — вперёд).
+    """
     buttons = []
     if page > 0:
-        buttons.append(
-            InlineKeyboardButton(text="← Назад", callback_data=f"{prefix}:{page - 1}")
-        )
+        data = f"{prefix}:{page - 1}:b:{prev_cursor}" if prev_cursor else f"{prefix}:{page - 1}"
+        buttons.append(InlineKeyboardButton(text="← Назад", callback_data=data))
     if page < total_pages - 1:
-        buttons.append(
-            InlineKeyboardButton(text="Вперёд →", callback_data=f"{prefix}:{page + 1}")
-        )
+        data = f"{prefix}:{page + 1}:f:{next_cursor}" if next_cursor else f"{prefix}:{page + 1}"
+        buttons.append(InlineKeyboardButton(text="Вперёд →", callback_data=data))
 
     if not buttons:
         return None
@@ -13,17 +13,83 @@ class Settings(BaseSettings):
         db_path = self.DATA_DIR / "ai_news.db"
         return f"sqlite:///{db_path}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        db_path = self.DATA_DIR / "ai_news.db"
+        return f"sqlite+aiosqlite:///{db_path}"
+
+    # Архив старых статей (помесячные .jsonl.gz, см. app.services.archive)
+    @property
+    def ARCHIVE_DIR(self) -> Path:
+        return self.DATA_DIR / "archive"
+
+    RETENTION_DAYS: int = 365  # статьи старше переносятся в архив; 0 — хранить всё в БД
+
+    # Статический сайт (export_news.py): шарды data/news/ по дням и источникам
+    STATIC_EXPORT_DAYS: int = 90  # сколько дней статей выгружать; 0 — все статьи из БД
+
+    # SQLite (PRAGMA на каждом соединении)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 30_000
+    WRITER_MAX_BATCH: int = 64  # заданий записи на одну транзакцию
+
     # API
     API_HOST: str = "127.0.0.1"
     API_PORT: int = 8000
 
+    # Кэш ответов горячих эндпоинтов (app.api.cache); 0 записей — без кэша
+    RESPONSE_CACHE_ENTRIES: int = 256
+    RESPONSE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+
+    # Поток новых статей /api/stream (app.services.events)
+    STREAM_QUEUE_SIZE: int = 256  # событий в очереди подписчика; переполнение — отключение
+    STREAM_REPLAY_LIMIT: int = 1000  # сколько пропущенных статей досылать по Last-Event-ID
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    STREAM_MAX_CONNECTION_SECONDS: float = 300.0  # потом клиент переподключается с Last-Event-ID
+    STREAM_MAX_SUBSCRIBERS: int = 10_000
+
+    # Выгрузка /api/articles/export (NDJSON)
+    EXPORT_BATCH_SIZE: int = 1000  # строк из курсора БД на один кусок ответа
+    EXPORT_MAX_CONCURRENT: int = 2  # одновременных выгрузок; остальным 503
+
     # Security
     API_SECRET_KEY: str = ""
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
+    # Лимит запросов с одного IP (app.api.ratelimit) и отдельный — на POST /api/collect
+    RATE_LIMIT_REQUESTS: int = 60
+    RATE_LIMIT_WINDOW_SECONDS: float = 60.0
+    RATE_LIMIT_COLLECT_REQUESTS: int = 2
+    RATE_LIMIT_COLLECT_WINDOW_SECONDS: float = 3600.0
+    RATE_LIMIT_MAX_KEYS: int = 100_000
 
     # Monitoring
     COLLECT_INTERVAL_HOURS: int = 4
+    ADAPTIVE_POLLING: bool = True
+    POLL_MIN_MINUTES: int = 15
+    POLL_MAX_MINUTES: int = 24 * 60
+    POLL_HISTORY_DAYS: int = 30
     MAX_ARTICLES_PER_SOURCE: int = 50
+    COLLECT_BATCH_SIZE: int = 25
+    DEDUP_SIMILARITY: float = 0.5
+    PARSE_MODE: str = "thread"  # inline | thread | process
+    PARSE_WORKERS: int = 0  # 0 = по числу CPU
+    COLLECT_CONCURRENCY: int = 8
+    SOURCE_TIMEOUT_SECONDS: float = 60.0
+    SEARCH_RANK_WINDOW: int = 2000  # сколько свежих совпадений ранжировать по BM25
+    SEARCH_COMMON_TERM_DOCS: int = 50_000  # слова чаще этого не участвуют в BM25
+    BODY_CODEC: str = "auto"  # zstd | zlib | auto (zstd, если установлен zstandard)
+
+    # HTTP
+    HTTP_USER_AGENT: str = "Mozilla/5.0 (compatible; AINewsMonitor/1.0)"
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4
+    HTTP_MAX_RESPONSE_BYTES: int = 10 * 1024 * 1024
 
     # Telegram
     TELEGRAM_BOT_TOKEN: str = ""
@@ -1,21 +1,95 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
+from app.utils.compression import register_sqlite_functions
 
+_BUSY_TIMEOUT = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+# Sync engine: export_news.py, manage.py, init_db() and the ingest writer
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False, "timeout": 30},
+    connect_args={"check_same_thread": False, "timeout": _BUSY_TIMEOUT},
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine (aiosqlite): API, bot, collector and scheduler, so queries
+# never block the event loop
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    connect_args={"timeout": _BUSY_TIMEOUT},
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 Base = declarative_base()
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the storage profile to every new connection.
+
+    WAL lets readers run alongside the single ingest writer; with WAL,
+    synchronous=NORMAL is still crash-safe (only the last commits may be
+    lost on power failure). cache_size is negative, i.e. in KiB.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _register_functions(dbapi_connection, connection_record):
+    """SQL functions used by the schema (article_body() in the FTS source view)."""
+    register_sqlite_functions(dbapi_connection)
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "connect", _set_sqlite_pragmas)
+    event.listen(_engine, "connect", _register_functions)
+
+
 def init_db():
     """Create all tables."""
     from app.models.source import Source  # noqa: F401
     from app.models.article import Article  # noqa: F401
+    from app.models.lsh import LSHBucket  # noqa: F401
+    from app.models.article_body import ArticleBody, CompressionDict  # noqa: F401
+    from app.models.collect_run import CollectRun  # noqa: F401
+    from app.services.bodies import migrate_inline_content
+    from app.services.search import ensure_fts_index
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    migrate_inline_content(engine)
+    ensure_fts_index(engine)
+
+
+def _add_missing_columns():
+    """Add columns (and their indexes) introduced after a table was first created.
+
+    create_all() never alters existing tables, so new nullable columns are
+    added with ALTER TABLE ... ADD COLUMN (the only ALTER SQLite supports).
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+                )
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
 
 
 def get_db():
@@ -25,3 +99,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, UTC
 from app.database import Base
+from app.models.article_body import ArticleBody  # noqa: F401  (Article.body)
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # Keyset-пагинация: ORDER BY published_at DESC, id DESC
+        Index("ix_articles_published_id", "published_at", "id"),
+        Index("ix_articles_source_published_id", "source_id", "published_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
@@ -12,7 +18,6 @@ class Article(Base):
     title = Column(String(500), nullable=False)
     url = Column(String(1000), nullable=False, unique=True)
     summary = Column(Text)
-    content = Column(Text)
     author = Column(String(200))
 
     published_at = Column(DateTime, nullable=False)
@@ -23,4 +28,11 @@ class Article(Base):
     word_count = Column(Integer)
     content_hash = Column(String(64))
 
+    # Near-duplicate: MinHash-сигнатура и id первой статьи сюжета
+    minhash = Column(LargeBinary)
+    cluster_id = Column(Integer, index=True)
+
     source = relationship("Source", back_populates="articles")
+    # Полный текст лежит сжатым в article_bodies и сам не загружается:
+    # app.services.bodies.load_body(s) или selectinload(Article.body)
+    body = relationship("ArticleBody", uselist=False, lazy="raise")
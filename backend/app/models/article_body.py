@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary
+from datetime import datetime, UTC
+from app.database import Base
+
+class ArticleBody(Base):
+    """Полный текст статьи, сжатый; читается только по явному запросу."""
+    __tablename__ = "article_bodies"
+
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    codec = Column(String(8), nullable=False)  # zstd | zlib
+    dict_id = Column(Integer, ForeignKey("compression_dicts.id"))
+    raw_size = Column(Integer)
+    data = Column(LargeBinary, nullable=False)
+
+
+class CompressionDict(Base):
+    """Обученный словарь сжатия (zstd) для ArticleBody."""
+    __tablename__ = "compression_dicts"
+
+    id = Column(Integer, primary_key=True)
+    codec = Column(String(8), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    samples = Column(Integer)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from datetime import datetime, UTC
+from app.database import Base
+
+class CollectRun(Base):
+    """Запуск сбора новостей: кто запустил, сколько шёл, итог по источникам."""
+    __tablename__ = "collect_runs"
+
+    id = Column(Integer, primary_key=True)
+    trigger = Column(String(20), nullable=False)  # api | scheduler | bot | startup | export
+    sources = Column(JSON)  # имена источников; NULL — все активные
+    status = Column(String(20), nullable=False, index=True)  # queued | running | done | failed | interrupted
+
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+
+    total_found = Column(Integer)
+    total_new = Column(Integer)
+    errors = Column(JSON)  # ["источник: ошибка", ...]
+    progress = Column(JSON)  # {источник: {status, found, new, error, seconds}}
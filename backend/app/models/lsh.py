@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from app.database import Base
+
+class LSHBucket(Base):
+    """Полоса MinHash-сигнатуры статьи: индекс кандидатов в near-duplicate."""
+    __tablename__ = "article_lsh"
+
+    band_hash = Column(BigInteger, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True, index=True)
@@ -15,7 +15,7 @@ class Source(Base):
 
     # Ratings
     authority_score = Column(Float, default=0.0)
-    update_frequency_score = Column(Float, default=0.0)
+    update_frequency_score = Column(Float, default=0.0)  # публикаций в сутки (по истории)
     content_quality_score = Column(Float, default=0.0)
     significance_score = Column(Float, default=0.0)
     rss_availability_score = Column(Float, default=0.0)
@@ -26,6 +26,15 @@ class Source(Base):
     last_checked = Column(DateTime)
     articles_count = Column(Integer, default=0)
 
+    # Conditional GET: валидаторы последнего ответа фида
+    etag = Column(String(500))
+    last_modified = Column(String(100))
+    body_hash = Column(String(64))
+
+    # Водяной знак: самая свежая сохранённая статья, на ней разбор фида останавливается
+    last_seen_url = Column(String(1000))
+    last_published_at = Column(DateTime)
+
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
     updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
 
@@ -0,0 +1,486 @@
+"""
+Архив старых статей: помесячные сжатые JSONL-файлы вне SQLite.
+
+Статьи старше RETENTION_DAYS переносятся из articles (вместе с текстом,
+строками FTS и LSH) в ARCHIVE_DIR/YYYY-MM.jsonl.gz — по строке JSON на
+статью. Файл месяца только дописывается: каждый проход compact() добавляет
+новый gzip-член в конец, старые данные не переписываются.
+
+index.json — маленький индекс архива: для каждого месяца число статей,
+диапазон дат и id и длина файла, до которой он записан целиком. Читатели
+не заходят дальше этой длины, а compact() перед дописыванием обрезает
+недописанный хвост, так что сбой посреди записи архив не портит.
+Рядом с файлом месяца лежит фильтр Блума по словам его статей
+(YYYY-MM.bloom): поиск по архиву не распаковывает месяцы, где слов
+запроса точно нет.
+
+Порядок переноса: сначала запись в архив, потом удаление из БД. Если
+удаление не случилось, статьи попадут в архив ещё раз; читатели
+оставляют последнюю копию каждого id.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import struct
+import threading
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.article import Article
+from app.models.lsh import LSHBucket
+from app.models.source import Source
+from app.services.bodies import load_bodies, remove_bodies
+from app.services.counters import adjust_source_count
+from app.services.generation import bump_generation
+from app.services.read_model import SUMMARY_LENGTH
+from app.services.search import (
+    MARK_END,
+    MARK_START,
+    SNIPPET_TOKENS,
+    SearchHit,
+    optimize_index,
+    remove_articles,
+)
+from app.utils.dates import naive_utc
+from app.utils.files import write_atomic
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+ARCHIVE_CHUNK = 2000  # статей за одну транзакцию переноса
+
+# Фильтр Блума месяца: 2^21 бит (256 КБ) и 4 хеша — около 1% ложных
+# срабатываний на 200 тыс. различных слов
+BLOOM_BITS = 1 << 21
+BLOOM_HASHES = 4
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_TERM_RE = re.compile(r"\w+\*?", re.UNICODE)
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}$")
+
+# compact() в одном процессе выполняется по одному
+_compact_lock = threading.Lock()
+
+
+class ArchivedArticle(NamedTuple):
+    """Статья из архива в форме строки read_model.article_rows()."""
+    id: int
+    title: str
+    url: str
+    summary: str
+    author: Optional[str]
+    source: Optional[str]
+    published_at: Optional[datetime]
+
+    @property
+    def _mapping(self) -> Dict[str, Any]:
+        """Колонки по именам, как у строки SQLAlchemy (для read_model.article_dict)."""
+        return self._asdict()
+
+
+def archive_dir() -> Path:
+    return settings.ARCHIVE_DIR
+
+
+def retention_cutoff(days: Optional[int] = None) -> Optional[datetime]:
+    """Граница хранения (naive UTC): статьи старше неё уходят в архив; None — без ограничения."""
+    days = settings.RETENTION_DAYS if days is None else days
+    if days <= 0:
+        return None
+    return datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
+
+
+def is_month(month: str) -> bool:
+    return bool(_MONTH_RE.match(month or ""))
+
+
+# --- Перенос ---
+
+
+def count_expired(db: Session, cutoff: datetime) -> int:
+    """Сколько статей перенесёт compact(db, cutoff)."""
+    return db.execute(
+        select(func.count()).select_from(Article).where(*_expired(db, cutoff))
+    ).scalar_one()
+
+
+def compact(
+    db: Session, cutoff: datetime, write: Optional[Callable[..., Any]] = None
+) -> Dict[str, int]:
+    """Перенести статьи с published_at < cutoff в архив и удалить их из БД.
+
+    Работает пакетами по ARCHIVE_CHUNK статей, каждый пакет — отдельная
+    транзакция. Статья с наибольшим id не переносится никогда: без
+    AUTOINCREMENT SQLite выдал бы её id следующей новой статье.
+    db только читает; записи (удаление пакета, слияние сегментов FTS) идут
+    через write(func, *args) — он выполняет func(сессия, *args) в своей
+    транзакции и коммитит. По умолчанию пишет в ту же db; планировщик
+    передаёт запись через ingest_writer, чтобы перенос не спорил со сбором
+    за блокировку SQLite.
+    Returns: {месяц: перенесено статей}.
+    """
+    write = write or _write_in(db)
+    moved: Dict[str, int] = {}
+    with _compact_lock:
+        directory = archive_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        index = load_index()
+        while True:
+            conditions = _expired(db, cutoff)
+            rows = db.execute(
+                select(
+                    Article.id,
+                    Article.source_id,
+                    Source.name.label("source"),
+                    Article.title,
+                    Article.url,
+                    Article.summary,
+                    Article.author,
+                    Article.published_at,
+                    Article.fetched_at,
+                    Article.tags,
+                    Article.image_url,
+                    Article.word_count,
+                    Article.content_hash,
+                    Article.cluster_id,
+                )
+                .outerjoin(Source, Source.id == Article.source_id)
+                .where(*conditions)
+                .order_by(Article.published_at, Article.id)
+                .limit(ARCHIVE_CHUNK)
+            ).all()
+            if not rows:
+                break
+
+            ids = [row.id for row in rows]
+            bodies = load_bodies(db, ids)
+            by_month: Dict[str, List[dict]] = {}
+            for row in rows:
+                record = {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in row._asdict().items()
+                }
+                record["content"] = bodies.get(row.id, "")
+                by_month.setdefault(row.published_at.strftime("%Y-%m"), []).append(record)
+
+            for month, records in by_month.items():
+                index["months"][month] = _append_month(
+                    directory, month, records, index["months"].get(month)
+                )
+                moved[month] = moved.get(month, 0) + len(records)
+            write_atomic(directory / INDEX_FILE, json.dumps(index, indent=1).encode())
+
+            # Чтение закрывается до записи: следующий пакет должен видеть удаление
+            db.rollback()
+            write(delete_articles, ids)
+            logger.info(f"В архив перенесено {len(ids)} статей (до {rows[-1].published_at:%Y-%m-%d})")
+        if moved:
+            # Удаления копятся в FTS5 отметками, которые читает каждый запрос
+            write(_optimize_index)
+    return moved
+
+
+def _write_in(db: Session) -> Callable[..., Any]:
+    def write(func: Callable[..., Any], *args) -> Any:
+        result = func(db, *args)
+        db.commit()
+        bump_generation()
+        return result
+    return write
+
+
+def _optimize_index(db: Session) -> None:
+    optimize_index(db, commit=False)
+
+
+def delete_articles(db: Session, article_ids: Sequence[int]) -> None:
+    """Удалить статьи со всеми производными данными, без commit().
+
+    FTS, тексты, LSH-полосы, счётчики источников; сюжеты, чья первая статья
+    удалена, получают новую первую статью (самую раннюю из оставшихся).
+    """
+    if not article_ids:
+        return
+    ids = list(article_ids)
+    remove_articles(db, ids)  # до удаления текстов: FTS читает их для 'delete'
+    remove_bodies(db, ids)
+    db.execute(delete(LSHBucket).where(LSHBucket.article_id.in_(ids)))
+    for source_id, count in db.execute(
+        select(Article.source_id, func.count()).where(Article.id.in_(ids)).group_by(Article.source_id)
+    ).all():
+        adjust_source_count(db, source_id, -count)
+    db.execute(delete(Article).where(Article.id.in_(ids)))
+    representatives = db.execute(
+        select(Article.cluster_id, func.min(Article.id))
+        .where(Article.cluster_id.in_(ids))
+        .group_by(Article.cluster_id)
+    ).all()
+    if representatives:
+        db.execute(
+            update(Article.__table__)
+            .where(Article.__table__.c.cluster_id == bindparam("old"))
+            .values(cluster_id=bindparam("new")),
+            [{"old": old, "new": new} for old, new in representatives],
+        )
+
+
+def _expired(db: Session, cutoff: datetime) -> list:
+    newest_id = db.execute(select(func.max(Article.id))).scalar() or 0
+    return [Article.published_at < cutoff, Article.id < newest_id]
+
+
+def _append_month(directory: Path, month: str, records: List[dict], entry: Optional[dict]) -> dict:
+    """Дописать статьи в файл месяца и обновить его фильтр Блума; вернуть запись индекса."""
+    entry = dict(entry or {
+        "file": f"{month}.jsonl.gz", "bloom": f"{month}.bloom", "count": 0, "bytes": 0,
+        "first": None, "last": None, "min_id": None, "max_id": None,
+    })
+    path = directory / entry["file"]
+    payload = "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records
+    ).encode()
+    with open(path, "ab") as f:
+        f.truncate(entry["bytes"])  # хвост неудачной прошлой записи
+        f.write(gzip.compress(payload))
+        f.flush()
+        os.fsync(f.fileno())
+        entry["bytes"] = f.tell()
+
+    bloom_path = directory / entry["bloom"]
+    bloom = bytearray(bloom_path.read_bytes()) if bloom_path.exists() else bytearray(BLOOM_BITS // 8)
+    terms: Set[str] = set()
+    for record in records:
+        terms.update(_words(_record_text(record)))
+    for term in terms:
+        for bit in _bloom_bits(term):
+            bloom[bit >> 3] |= 1 << (bit & 7)
+    write_atomic(bloom_path, bytes(bloom))
+
+    dates = [record["published_at"] for record in records]
+    ids = [record["id"] for record in records]
+    entry["count"] += len(records)
+    entry["first"] = min(filter(None, [entry["first"], *dates]))
+    entry["last"] = max(filter(None, [entry["last"], *dates]))
+    entry["min_id"] = min(filter(lambda v: v is not None, [entry["min_id"], *ids]))
+    entry["max_id"] = max(filter(lambda v: v is not None, [entry["max_id"], *ids]))
+    return entry
+
+
+# --- Чтение ---
+
+
+def load_index() -> dict:
+    path = archive_dir() / INDEX_FILE
+    if not path.exists():
+        return {"version": 1, "months": {}}
+    return json.loads(path.read_text())
+
+
+def list_months() -> List[dict]:
+    """Месяцы архива от новых к старым: month, count, first, last, bytes."""
+    months = load_index()["months"]
+    return [
+        {"month": month, **{key: entry[key] for key in ("count", "first", "last", "bytes")}}
+        for month, entry in sorted(months.items(), reverse=True)
+    ]
+
+
+def iter_month(month: str, with_content: bool = True) -> Iterator[dict]:
+    """Статьи месяца в порядке записи (без повторов id, последняя копия побеждает)."""
+    entry = load_index()["months"].get(month)
+    if not entry:
+        return
+    records: Dict[int, dict] = {}
+    for record in _read_records(entry):
+        if not with_content:
+            record.pop("content", None)
+        records[record["id"]] = record
+    yield from records.values()
+
+
+def month_articles(
+    month: str,
+    source_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[ArchivedArticle], int]:
+    """Страница статей месяца от новых к старым и общее число (с учётом фильтра)."""
+    records = [
+        record for record in iter_month(month, with_content=False)
+        if source_id is None or record["source_id"] == source_id
+    ]
+    records.sort(key=lambda r: (r["published_at"] or "", r["id"]), reverse=True)
+    return [archive_row(record) for record in records[offset:offset + limit]], len(records)
+
+
+def find_archived(article_id: int) -> Optional[dict]:
+    """Запись статьи из архива (с полным текстом) или None."""
+    for month, entry in sorted(load_index()["months"].items(), reverse=True):
+        if entry["min_id"] is None or not entry["min_id"] <= article_id <= entry["max_id"]:
+            continue
+        found = None
+        for record in _read_records(entry):
+            if record["id"] == article_id:
+                found = record
+        if found:
+            return found
+    return None
+
+
+def archive_row(record: dict) -> ArchivedArticle:
+    published_at = record.get("published_at")
+    return ArchivedArticle(
+        record["id"],
+        record.get("title") or "",
+        record.get("url") or "",
+        (record.get("summary") or "")[:SUMMARY_LENGTH],
+        record.get("author"),
+        record.get("source"),
+        datetime.fromisoformat(published_at) if published_at else None,
+    )
+
+
+def search_archive(
+    query: str,
+    source_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[SearchHit]:
+    """Найти в архиве статьи со всеми словами запроса, от новых к старым.
+
+    Совпадение — по словам без учёта регистра, «слово*» — по префиксу;
+    месяцы вне [since, until) и месяцы, где по фильтру Блума нет хотя бы
+    одного слова, не читаются. ValueError, если запрос пустой.
+    """
+    terms = [token.lower() for token in _TERM_RE.findall(query or "") if token.rstrip("*")]
+    if not terms:
+        raise ValueError("Пустой поисковый запрос")
+    exact = [term for term in terms if not term.endswith("*")]
+    prefixes = [term[:-1] for term in terms if term.endswith("*")]
+    since_key = naive_utc(since).isoformat() if since else None
+    until_key = naive_utc(until).isoformat() if until else None
+
+    hits: List[SearchHit] = []
+    skip = offset
+    for month, entry in sorted(load_index()["months"].items(), reverse=True):
+        if since_key and (entry["last"] or "") < since_key:
+            break
+        if until_key and (entry["first"] or "") >= until_key:
+            continue
+        if exact and not _bloom_may_contain(entry, exact):
+            continue
+
+        matches = {}
+        for record in _read_records(entry, contains=exact + prefixes):
+            if source_id is not None and record["source_id"] != source_id:
+                continue
+            published = record["published_at"] or ""
+            if (since_key and published < since_key) or (until_key and published >= until_key):
+                continue
+            text_lower = _record_text(record).lower()
+            if not all(word in text_lower for word in exact + prefixes):
+                continue
+            words = set(_words(text_lower))
+            if all(word in words for word in exact) and all(
+                any(w.startswith(prefix) for w in words) for prefix in prefixes
+            ):
+                matches[record["id"]] = record
+        matches = list(matches.values())
+
+        matches.sort(key=lambda r: (r["published_at"] or "", r["id"]), reverse=True)
+        if skip >= len(matches):
+            skip -= len(matches)
+            continue
+        for record in matches[skip:]:
+            hits.append(SearchHit(archive_row(record), _snippet(record, exact, prefixes), 0.0))
+            if len(hits) >= limit:
+                return hits
+        skip = 0
+    return hits
+
+
+def _read_records(entry: dict, contains: Sequence[str] = ()) -> Iterator[dict]:
+    """Записи файла месяца; contains — разобрать только строки со всеми этими подстроками.
+
+    Проверка подстрок по сырой строке (в нижнем регистре) отсекает
+    большинство записей до json.loads, который и есть основная цена чтения.
+    """
+    path = archive_dir() / entry["file"]
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        data = f.read(entry["bytes"])  # только целиком записанная часть
+    with gzip.GzipFile(fileobj=io.BytesIO(data)) as lines:
+        for line in lines:
+            if contains:
+                lowered = line.decode().lower()
+                if not all(word in lowered for word in contains):
+                    continue
+            yield json.loads(line)
+
+
+def _record_text(record: dict) -> str:
+    return f"{record.get('title') or ''}\n{record.get('summary') or ''}\n{record.get('content') or ''}"
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _bloom_bits(term: str) -> List[int]:
+    a, b = struct.unpack("<QQ", hashlib.blake2b(term.encode(), digest_size=16).digest())
+    return [(a + i * b) % BLOOM_BITS for i in range(BLOOM_HASHES)]
+
+
+_blooms: Dict[str, Tuple[int, bytes]] = {}
+
+
+def _bloom_may_contain(entry: dict, terms: List[str]) -> bool:
+    cached = _blooms.get(entry["bloom"])
+    if cached is None or cached[0] != entry["bytes"]:
+        path = archive_dir() / entry["bloom"]
+        if not path.exists():
+            return True
+        cached = _blooms[entry["bloom"]] = (entry["bytes"], path.read_bytes())
+    bloom = cached[1]
+    return all(
+        bloom[bit >> 3] & (1 << (bit & 7))
+        for term in terms
+        for bit in _bloom_bits(term)
+    )
+
+
+def _snippet(record: dict, exact: List[str], prefixes: List[str]) -> str:
+    """Фрагмент из SNIPPET_TOKENS слов вокруг первого совпадения, с маркерами как у FTS."""
+    def matches(word: str) -> bool:
+        word = word.lower()
+        return word in exact or any(word.startswith(prefix) for prefix in prefixes)
+
+    for text_value in (record.get("content"), record.get("summary"), record.get("title")):
+        words = list(_WORD_RE.finditer(text_value or ""))
+        hits = {i for i, m in enumerate(words) if matches(m.group())}
+        if not hits:
+            continue
+        start = max(0, min(hits) - SNIPPET_TOKENS // 4)
+        end = min(len(words), start + SNIPPET_TOKENS)
+        parts = ["…" if start else ""]
+        position = words[start].start()
+        for i in range(start, end):
+            m = words[i]
+            parts.append(text_value[position:m.start()])
+            parts.append(f"{MARK_START}{m.group()}{MARK_END}" if i in hits else m.group())
+            position = m.end()
+        parts.append("…" if end < len(words) else "")
+        return "".join(parts)
+    return ""
@@ -0,0 +1,183 @@
+"""
+Холодное хранение полных текстов статей.
+
+Тексты лежат сжатыми в article_bodies (zstd или zlib, для zstd — с
+обученным словарём), а не в articles: списки статей их не читают вовсе,
+текст распаковывается только по явному запросу (load_body / load_bodies).
+"""
+import logging
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.article_body import ArticleBody, CompressionDict
+from app.utils.compression import (
+    CODEC_ZSTD,
+    compress,
+    decompress,
+    default_codec,
+    train_dictionary,
+)
+
+logger = logging.getLogger(__name__)
+
+# Сколько строк переносить/пережимать за один проход
+MIGRATION_CHUNK = 1000
+
+
+def save_bodies(db, rows: Iterable[Tuple[int, str]]) -> None:
+    """Сжать и сохранить тексты (article_id, text), без commit().
+
+    db — Session или Connection. Используются BODY_CODEC и последний
+    словарь этого кодека, если он есть.
+    """
+    codec = default_codec(settings.BODY_CODEC)
+    dict_id, dictionary = _current_dictionary(db, codec)
+    params = []
+    for article_id, body in rows:
+        if not body:
+            continue
+        params.append({
+            "article_id": article_id,
+            "codec": codec,
+            "dict_id": dict_id,
+            "raw_size": len(body.encode()),
+            "data": compress(body, codec, dict_id, dictionary),
+        })
+    if params:
+        db.execute(
+            text(
+                "INSERT OR REPLACE INTO article_bodies (article_id, codec, dict_id, raw_size, data) "
+                "VALUES (:article_id, :codec, :dict_id, :raw_size, :data)"
+            ),
+            params,
+        )
+
+
+def load_bodies(db: Session, article_ids: Sequence[int]) -> Dict[int, str]:
+    """Распакованные тексты статей по id (статьи без текста в ответ не попадают)."""
+    if not article_ids:
+        return {}
+    rows = db.execute(
+        select(
+            ArticleBody.article_id,
+            ArticleBody.codec,
+            ArticleBody.dict_id,
+            CompressionDict.data.label("dictionary"),
+            ArticleBody.data,
+        )
+        .outerjoin(CompressionDict, CompressionDict.id == ArticleBody.dict_id)
+        .where(ArticleBody.article_id.in_(article_ids))
+    ).all()
+    return {
+        row.article_id: decompress(row.data, row.codec, row.dict_id, row.dictionary)
+        for row in rows
+    }
+
+
+def load_body(db: Session, article_id: int) -> Optional[str]:
+    return load_bodies(db, [article_id]).get(article_id)
+
+
+def remove_bodies(db: Session, article_ids: Sequence[int]) -> None:
+    """Удалить тексты статей, без commit()."""
+    if article_ids:
+        db.execute(delete(ArticleBody).where(ArticleBody.article_id.in_(article_ids)))
+
+
+def train_body_dictionary(db: Session, samples: int, size: int) -> CompressionDict:
+    """Обучить zstd-словарь на samples последних текстах и сохранить его.
+
+    Новые тексты сразу начинают сжиматься с ним; старые остаются со своим
+    словарём, пока их не пережмёт recompress_bodies().
+    """
+    ids = db.execute(
+        select(ArticleBody.article_id).order_by(ArticleBody.article_id.desc()).limit(samples)
+    ).scalars().all()
+    texts = list(load_bodies(db, ids).values())
+    zdict = CompressionDict(
+        codec=CODEC_ZSTD, data=train_dictionary(texts, size), samples=len(texts)
+    )
+    db.add(zdict)
+    db.commit()
+    logger.info(f"Обучен словарь #{zdict.id}: {size} байт на {len(texts)} текстах")
+    return zdict
+
+
+def recompress_bodies(db: Session) -> Tuple[int, int, int]:
+    """Пережать все тексты текущим кодеком и словарём.
+
+    Returns: (текстов, байт до, байт после).
+    """
+    count = before = after = 0
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(ArticleBody.article_id, ArticleBody.data)
+            .where(ArticleBody.article_id > last_id)
+            .order_by(ArticleBody.article_id)
+            .limit(MIGRATION_CHUNK)
+        ).all()
+        if not rows:
+            break
+        ids = [row.article_id for row in rows]
+        before += sum(len(row.data) for row in rows)
+        save_bodies(db, load_bodies(db, ids).items())
+        after += db.execute(
+            text("SELECT sum(length(data)) FROM article_bodies WHERE article_id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        ).scalar() or 0
+        db.commit()
+        count += len(rows)
+        last_id = ids[-1]
+    return count, before, after
+
+
+def migrate_inline_content(engine: Engine) -> int:
+    """Перенести articles.content (старая схема) в article_bodies и удалить колонку.
+
+    Выполняется один раз из init_db(), в одной транзакции. Место в файле
+    освобождается только после VACUUM (python manage.py vacuum).
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("articles")}
+    if "content" not in columns:
+        return 0
+
+    moved = 0
+    with engine.begin() as conn:
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    "SELECT id, content FROM articles WHERE id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": MIGRATION_CHUNK},
+            ).all()
+            if not rows:
+                break
+            save_bodies(conn, [(row.id, row.content) for row in rows])
+            moved += sum(1 for row in rows if row.content)
+            last_id = rows[-1].id
+        conn.execute(text("ALTER TABLE articles DROP COLUMN content"))
+    logger.info(
+        f"Тексты статей перенесены в article_bodies: {moved}. "
+        "Чтобы уменьшить файл БД, выполните: python manage.py vacuum"
+    )
+    return moved
+
+
+def _current_dictionary(db, codec: str) -> Tuple[Optional[int], Optional[bytes]]:
+    if codec != CODEC_ZSTD:
+        return None, None
+    row = db.execute(
+        select(CompressionDict.id, CompressionDict.data)
+        .where(CompressionDict.codec == codec)
+        .order_by(CompressionDict.id.desc())
+        .limit(1)
+    ).first()
+    return (row.id, row.data) if row else (None, None)
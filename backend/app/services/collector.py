@@ -1,14 +1,29 @@
+import asyncio
 import logging
+import time
+from contextlib import aclosing
 from datetime import datetime, UTC
-from typing import List
+from typing import Collection, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.article import Article
 from app.models.source import Source
+from app.services.archive import retention_cutoff
+from app.services.bodies import save_bodies
+from app.services.counters import adjust_source_count
+from app.services.dedup import assign_clusters, story_text
+from app.services.events import article_broker, article_events
+from app.services.http_client import HTTPClient
+from app.services.search import index_articles
+from app.services.parsers.base_parser import BaseParser
+from app.services.writer import after_commit, ingest_writer
+from app.utils.dates import naive_utc
 from app.services.parsers.openai_blog import OpenAIBlogParser
 from app.services.parsers.google_ai import GoogleAIParser
 from app.services.parsers.mit_news import MITNewsParser
@@ -17,9 +32,14 @@ from app.services.parsers.techcrunch import TechCrunchParser
 from app.services.parsers.the_verge import TheVergeParser
 from app.services.parsers.venturebeat import VentureBeatParser
 from app.services.parsers.ai_news import AINewsParser
+from app.services.parsers.deepmind import DeepMindParser
+from app.services.parsers.ai_magazine import AIMagazineParser
 
 logger = logging.getLogger(__name__)
 
+# Сколько URL проверять одним SELECT ... IN
+URL_LOOKUP_CHUNK = 500
+
 # Реестр всех парсеров
 PARSERS = [
     OpenAIBlogParser,
@@ -30,6 +50,8 @@ PARSERS = [
     TheVergeParser,
     VentureBeatParser,
     AINewsParser,
+    DeepMindParser,
+    AIMagazineParser,
 ]
 
 
@@ -42,55 +64,64 @@ def seed_sources(db: Session) -> None:
             source = Source(
                 name=parser.source_name,
                 url=parser.source_url,
-                feed_url=parser.feed_url,
-                source_type="rss",
+                feed_url=getattr(parser, "feed_url", None),
+                source_type=parser.source_type,
                 category="AI",
                 is_active=True,
             )
             db.add(source)
             logger.info(f"Добавлен источник: {parser.source_name}")
-    db.commit()
+    db.flush()
+
+
+async def collect_all(
+    source_names: Optional[Collection[str]] = None,
+    progress: Optional[Dict[str, dict]] = None,
+) -> dict:
+    """Собрать статьи со всех активных источников (или только из source_names).
 
+    Источники опрашиваются параллельно (не больше COLLECT_CONCURRENCY
+    одновременно, каждый с таймаутом SOURCE_TIMEOUT_SECONDS). Все парсеры
+    ходят в сеть через один общий пул соединений HTTPClient, а все записи
+    идут через единственного писателя (ingest_writer), так что сбор не
+    конкурирует с читателями и сам с собой за блокировку SQLite.
 
-async def collect_all() -> dict:
-    """Собрать статьи со всех активных источников."""
-    db = SessionLocal()
-    try:
-        seed_sources(db)
+    Запускать сбор лучше через app.services.jobs.collect_jobs: он не даёт
+    двум сборам идти одновременно. В progress (если передан) по ходу сбора
+    обновляется состояние каждого источника: {status, found, new, error, seconds}.
+    """
+    await ingest_writer.submit(seed_sources)
+    async with AsyncSessionLocal() as db:
+        sources = (
+            await db.execute(select(Source).where(Source.is_active == True))
+        ).scalars().all()
+    source_map = {s.name: s for s in sources}
 
+    async with HTTPClient() as http:
+        run = _CollectRun(http, progress)
         total_found = 0
         total_new = 0
         errors = []
 
-        sources = db.query(Source).filter(Source.is_active == True).all()
-        source_map = {s.name: s for s in sources}
-
+        tasks = []
         for parser_cls in PARSERS:
             parser = parser_cls()
             source = source_map.get(parser.source_name)
             if not source:
                 continue
+            if source_names is not None and source.name not in source_names:
+                continue
+            run.progress[parser.source_name] = {
+                "status": "pending", "found": 0, "new": 0, "error": None, "seconds": None,
+            }
+            tasks.append(asyncio.create_task(_collect_source(run, parser, source)))
 
-            try:
-                articles = await parser.fetch_articles()
-                articles = articles[:settings.MAX_ARTICLES_PER_SOURCE]
-                total_found += len(articles)
-
-                new_count = _save_articles(db, source, articles)
-                total_new += new_count
-
-                source.last_checked = datetime.now(UTC)
-                source.articles_count = (
-                    db.query(Article).filter(Article.source_id == source.id).count()
-                )
-                db.commit()
-
-                logger.info(
-                    f"{parser.source_name}: найдено {len(articles)}, новых {new_count}"
-                )
-            except Exception as e:
-                errors.append(f"{parser.source_name}: {e}")
-                logger.error(f"Ошибка сбора {parser.source_name}: {e}")
+        for next_done in asyncio.as_completed(tasks):
+            name, found, new_count, error = await next_done
+            total_found += found
+            total_new += new_count
+            if error:
+                errors.append(f"{name}: {error}")
 
         result = {
             "total_found": total_found,
@@ -102,43 +133,211 @@ async def collect_all() -> dict:
             f"ошибок {len(errors)}"
         )
         return result
-    finally:
-        db.close()
 
 
-def _save_articles(db: Session, source: Source, articles: List[dict]) -> int:
-    """Сохранить статьи с дедупликацией по URL."""
-    new_count = 0
+class _CollectRun:
+    """Общие ресурсы одного сбора."""
+
+    def __init__(self, http: HTTPClient, progress: Optional[Dict[str, dict]] = None):
+        self.http = http
+        self.progress = progress if progress is not None else {}
+        self.semaphore = asyncio.Semaphore(max(1, settings.COLLECT_CONCURRENCY))
+
+
+async def _collect_source(
+    run: _CollectRun, parser: BaseParser, source: Source
+) -> Tuple[str, int, int, Optional[str]]:
+    """Собрать один источник с ограничением параллелизма и таймаутом.
+
+    Returns: (имя источника, найдено, новых, ошибка или None).
+    """
+    parser.etag = source.etag
+    parser.last_modified = source.last_modified
+    parser.body_hash = source.body_hash
+    parser.watermark_url = source.last_seen_url
+    parser.watermark_published_at = source.last_published_at
+
+    stats = run.progress[parser.source_name]
+    error = None
+    async with run.semaphore:
+        stats["status"] = "running"
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                _ingest_source(run, parser, source, stats),
+                timeout=settings.SOURCE_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            error = f"таймаут {settings.SOURCE_TIMEOUT_SECONDS:g}с"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        stats.update(
+            status="failed" if error else "done",
+            error=error,
+            seconds=round(time.perf_counter() - started, 3),
+        )
+
+    if error:
+        logger.error(f"Ошибка сбора {parser.source_name}: {error}")
+    return parser.source_name, stats["found"], stats["new"], error
+
+
+async def _ingest_source(
+    run: _CollectRun, parser: BaseParser, source: Source, stats: dict
+) -> None:
+    """Читать статьи парсера до водяного знака и сохранять их пакетами.
+
+    В памяти одновременно не больше COLLECT_BATCH_SIZE статей; разбор фида
+    прекращается на первой уже сохранённой статье (Source.last_seen_url /
+    last_published_at) или после MAX_ARTICLES_PER_SOURCE. Парсеры страниц
+    без хронологического порядка вместо этого пропускают URL из seen_urls.
+    """
+    if not parser.chronological:
+        parser.seen_urls = await _recent_urls(source.id)
+    batch = []
+    newest = None
+    async with aclosing(parser.iter_articles(run.http)) as articles:
+        async for article in articles:
+            if parser.reached_watermark(article):
+                break
+
+            if newest is None or naive_utc(article["published_at"]) > naive_utc(newest["published_at"]):
+                newest = article
+            batch.append(article)
+            stats["found"] += 1
+
+            if len(batch) >= settings.COLLECT_BATCH_SIZE:
+                stats["new"] += (await ingest_writer.submit(_save_articles, source.id, batch))[0]
+                batch = []
+            if stats["found"] >= settings.MAX_ARTICLES_PER_SOURCE:
+                break
+
+    if batch:
+        stats["new"] += (await ingest_writer.submit(_save_articles, source.id, batch))[0]
+
+    # Валидаторы сохраняются и без изменений: при том же теле сервер мог
+    # выдать новые ETag/Last-Modified, и со старыми каждый следующий опрос
+    # снова скачивал бы ответ целиком
+    state = {
+        "last_checked": datetime.now(UTC),
+        "etag": parser.etag,
+        "last_modified": parser.last_modified,
+    }
+    if parser.not_modified:
+        await ingest_writer.submit(_update_source, source.id, state)
+        logger.info(f"{parser.source_name}: без изменений")
+        return
+
+    state["body_hash"] = parser.body_hash
+    if newest:
+        newest_at = naive_utc(newest["published_at"])
+        if not source.last_published_at or newest_at >= source.last_published_at:
+            state.update(last_seen_url=newest["url"], last_published_at=newest_at)
+    await ingest_writer.submit(_update_source, source.id, state)
+
+    logger.info(
+        f"{parser.source_name}: найдено {stats['found']}, новых {stats['new']}"
+    )
+
+
+async def _recent_urls(source_id: int) -> Set[str]:
+    """URL последних сохранённых статей источника (с запасом на страницу списка).
+
+    Статья, выпавшая из этого набора, просто загрузится ещё раз и будет
+    отброшена дедупликацией по URL в _save_articles.
+    """
+    async with AsyncSessionLocal() as db:
+        return set((await db.execute(
+            select(Article.url)
+            .where(Article.source_id == source_id)
+            .order_by(Article.id.desc())
+            .limit(settings.MAX_ARTICLES_PER_SOURCE * 4)
+        )).scalars())
+
+
+def _save_articles(db: Session, source_id: int, articles: List[dict]) -> Tuple[int, int]:
+    """Сохранить статьи пакетно с дедупликацией по URL.
+
+    Все URL-кандидаты проверяются одним запросом, новые строки вставляются
+    одним INSERT ... ON CONFLICT (url) DO NOTHING (статьи старше срока
+    хранения RETENTION_DAYS пропускаются), полный текст сжимается
+    в article_bodies; Source.articles_count увеличивается в той же
+    транзакции, новые статьи попадают в полнотекстовый индекс и
+    раскладываются по сюжетам (near-duplicate), а после commit рассылаются
+    подписчикам потока /api/stream. Без commit(): транзакцией управляет
+    ingest_writer. Возвращает (новых, пропущено).
+    """
+    rows = {}
+    contents = {}
+    cutoff = retention_cutoff()
     for data in articles:
-        url = data.get("url", "").strip()
-        if not url:
+        url = (data.get("url") or "").strip()
+        if not url or url in rows:
             continue
 
         parsed_url = urlparse(url)
         if parsed_url.scheme not in ("http", "https"):
             continue
 
-        existing = db.query(Article).filter(Article.url == url).first()
-        if existing:
+        published_at = data.get("published_at") or datetime.now(UTC)
+        if cutoff and naive_utc(published_at) < cutoff:
+            # Старше срока хранения: такая статья сразу ушла бы в архив повторно
             continue
 
         content = data.get("content", "") or data.get("summary", "") or ""
-        article = Article(
-            source_id=source.id,
-            title=data.get("title", "")[:500],
-            url=url,
-            summary=(data.get("summary", "") or "")[:2000],
-            content=content,
-            author=data.get("author", ""),
-            published_at=data.get("published_at", datetime.now(UTC)),
-            content_hash=_hash(content),
+        rows[url] = {
+            "source_id": source_id,
+            "title": (data.get("title", "") or "")[:500],
+            "url": url,
+            "summary": (data.get("summary", "") or "")[:2000],
+            "author": data.get("author", ""),
+            "published_at": published_at,
+            "content_hash": _hash(content),
+        }
+        contents[url] = content
+
+    existing = _existing_urls(db, list(rows))
+    new_rows = [row for url, row in rows.items() if url not in existing]
+
+    new_count = 0
+    if new_rows:
+        stmt = (
+            sqlite_insert(Article)
+            .on_conflict_do_nothing(index_elements=[Article.url])
+            .returning(Article.id, Article.url)
         )
-        db.add(article)
-        new_count += 1
+        inserted = db.execute(stmt, new_rows).all()
+        new_count = len(inserted)
+        adjust_source_count(db, source_id, new_count)
+        save_bodies(db, [(article_id, contents[url]) for article_id, url in inserted])
+        index_articles(db, [
+            (article_id, rows[url]["title"], rows[url]["summary"], contents[url])
+            for article_id, url in inserted
+        ])
+        assign_clusters(db, [
+            (article_id, story_text(rows[url]["title"], rows[url]["summary"]))
+            for article_id, url in inserted
+        ])
+        if inserted and article_broker.subscribers:
+            events = article_events(db, [article_id for article_id, _ in inserted])
+            after_commit(db, article_broker.publish, events)
+    return new_count, len(articles) - new_count
+
+
+def _update_source(db: Session, source_id: int, values: dict) -> None:
+    """Обновить состояние источника после опроса (валидаторы, водяной знак)."""
+    db.execute(update(Source).where(Source.id == source_id).values(**values))
 
-    if new_count:
-        db.commit()
-    return new_count
+
+def _existing_urls(db: Session, urls: List[str]) -> Set[str]:
+    """URL, которые уже есть в БД (IN-запросы пачками под лимит переменных SQLite)."""
+    found = set()
+    for i in range(0, len(urls), URL_LOOKUP_CHUNK):
+        chunk = urls[i:i + URL_LOOKUP_CHUNK]
+        found.update(
+            db.execute(select(Article.url).where(Article.url.in_(chunk))).scalars()
+        )
+    return found
 
 
 def _hash(text: str) -> str:
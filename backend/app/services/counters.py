@@ -0,0 +1,52 @@
+"""Счётчики статей, поддерживаемые при записи вместо COUNT(*) по таблице."""
+import logging
+from typing import Dict
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.models.source import Source
+
+logger = logging.getLogger(__name__)
+
+
+def adjust_source_count(db: Session, source_id: int, delta: int) -> None:
+    """Изменить Source.articles_count на delta в текущей транзакции."""
+    if not delta:
+        return
+    db.execute(
+        update(Source)
+        .where(Source.id == source_id)
+        .values(articles_count=func.coalesce(Source.articles_count, 0) + delta)
+    )
+
+
+def total_articles(db: Session) -> int:
+    """Общее число статей: сумма счётчиков источников, без прохода по articles."""
+    return db.execute(
+        select(func.coalesce(func.sum(Source.articles_count), 0))
+    ).scalar_one()
+
+
+def reconcile_counts(db: Session) -> Dict[str, int]:
+    """Пересчитать счётчики по фактическим строкам и исправить расхождения.
+
+    Returns: {имя источника: новое значение} только для исправленных источников.
+    """
+    actual = dict(
+        db.execute(
+            select(Article.source_id, func.count()).group_by(Article.source_id)
+        ).all()
+    )
+    fixed = {}
+    for source in db.query(Source).all():
+        count = actual.get(source.id, 0)
+        if (source.articles_count or 0) != count:
+            logger.warning(
+                f"{source.name}: счётчик {source.articles_count} → {count}"
+            )
+            source.articles_count = count
+            fixed[source.name] = count
+    db.commit()
+    return fixed
@@ -0,0 +1,225 @@
+"""Поиск почти одинаковых статей (один сюжет из разных источников).
+
+Заголовок и анонс разбиваются на шинглы (пары слов), по ним строится
+MinHash-сигнатура из NUM_PERM минимумов. Используется one-permutation
+hashing: один хеш на шингл раскладывается по NUM_PERM корзинам, пустые
+корзины заполняются из соседних, так что цена сигнатуры O(шинглов), а не
+O(шинглов * NUM_PERM). Сигнатура режется на BANDS полос;
+статьи с совпадающей полосой становятся кандидатами (LSH), поэтому
+поиск идёт по индексу article_lsh, а не перебором архива. Кандидат с
+оценкой Жаккара >= DEDUP_SIMILARITY даёт статье свой cluster_id.
+"""
+import hashlib
+import re
+import struct
+from collections import deque
+from functools import lru_cache
+from operator import eq
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.article import Article
+from app.models.lsh import LSHBucket
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 2
+
+# Не больше стольких кандидатов на полосу: защита от «мусорных» полос
+MAX_CANDIDATES_PER_BAND = 50
+LOOKUP_CHUNK = 500
+# Полос в одном запросе кандидатов (SQLite ограничивает UNION 500 частями)
+BAND_QUERY_CHUNK = 100
+
+_MASK64 = (1 << 64) - 1
+_SIGNATURE = struct.Struct(f"<{NUM_PERM}I")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str) -> Set[int]:
+    """64-битные хеши словесных n-грамм нормализованного текста."""
+    words = _WORD_RE.findall((text or "").lower())
+    if not words:
+        return set()
+    hashes = [_word_hash(w) for w in words]
+    if len(hashes) <= SHINGLE_SIZE:
+        return {_combine(hashes)}
+    return {
+        _combine(hashes[i:i + SHINGLE_SIZE])
+        for i in range(len(hashes) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(features: Set[int]) -> Optional[bytes]:
+    """Упакованная MinHash-сигнатура (one-permutation hashing) или None для пустого текста."""
+    if not features:
+        return None
+    bins: List[Optional[int]] = [None] * NUM_PERM
+    for h in features:
+        slot = h % NUM_PERM
+        value = h >> 32
+        if bins[slot] is None or value < bins[slot]:
+            bins[slot] = value
+
+    # Densification: пустая корзина берёт значение ближайшей следующей
+    filled = [i for i, v in enumerate(bins) if v is not None]
+    for i, value in enumerate(bins):
+        if value is None:
+            donor = next((j for j in filled if j > i), filled[0])
+            bins[i] = bins[donor]
+    return _SIGNATURE.pack(*bins)
+
+
+def band_hashes(signature: bytes) -> List[int]:
+    """Хеши LSH-полос сигнатуры (номер полосы входит в хеш)."""
+    width = ROWS * 4
+    return [
+        _hash64(bytes([band]) + signature[band * width:(band + 1) * width])
+        for band in range(BANDS)
+    ]
+
+
+def similarity(sig_a: bytes, sig_b: bytes) -> float:
+    """Оценка коэффициента Жаккара по доле совпавших минимумов."""
+    return _similarity(_SIGNATURE.unpack(sig_a), _SIGNATURE.unpack(sig_b))
+
+
+def _similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(map(eq, a, b)) / NUM_PERM
+
+
+def story_text(title: str, summary: str) -> str:
+    return f"{title or ''} {summary or ''}"
+
+
+def assign_clusters(db: Session, articles: Iterable[Tuple[int, str]]) -> int:
+    """Посчитать сигнатуры новых статей и разложить их по сюжетам.
+
+    articles: пары (article_id, текст). Изменения не коммитятся.
+    Returns: сколько статей оказались дубликатами уже известного сюжета.
+    """
+    pending = []
+    for article_id, text in articles:
+        signature = minhash(shingles(text))
+        bands = band_hashes(signature) if signature else []
+        pending.append((article_id, signature, bands))
+    if not pending:
+        return 0
+
+    # Кандидаты из индекса: не больше MAX_CANDIDATES_PER_BAND новейших на
+    # полосу. Новые раньше старых; maxlen держит предел и для статей,
+    # добавленных ниже из этого же пакета
+    buckets: Dict[int, Deque[int]] = {
+        band: deque(sorted(ids, reverse=True), maxlen=MAX_CANDIDATES_PER_BAND)
+        for band, ids in _band_candidates(db, {h for _, _, bands in pending for h in bands}).items()
+    }
+
+    known = _load_signatures(db, {i for ids in buckets.values() for i in ids})
+
+    duplicates = 0
+    updates = []
+    new_buckets = []
+    for article_id, signature, bands in pending:
+        cluster_id = article_id
+        if signature:
+            values = _SIGNATURE.unpack(signature)
+            best = settings.DEDUP_SIMILARITY
+            for candidate in {i for h in bands for i in buckets.get(h, ())}:
+                if candidate == article_id or candidate not in known:
+                    continue
+                other_values, other_cluster = known[candidate]
+                score = _similarity(values, other_values)
+                if score >= best:
+                    best = score
+                    cluster_id = other_cluster or candidate
+            if cluster_id != article_id:
+                duplicates += 1
+
+            # Следующие статьи пакета видят эту как кандидата
+            known[article_id] = (values, cluster_id)
+            for h in bands:
+                buckets.setdefault(h, deque(maxlen=MAX_CANDIDATES_PER_BAND)).appendleft(article_id)
+                new_buckets.append({"band_hash": h, "article_id": article_id})
+
+        updates.append({"_id": article_id, "minhash": signature, "cluster_id": cluster_id})
+
+    db.execute(
+        update(Article.__table__)
+        .where(Article.__table__.c.id == bindparam("_id"))
+        .values(minhash=bindparam("minhash"), cluster_id=bindparam("cluster_id")),
+        updates,
+    )
+    if new_buckets:
+        db.execute(LSHBucket.__table__.insert().prefix_with("OR IGNORE"), new_buckets)
+    return duplicates
+
+
+def story_representative():
+    """Фильтр «одна статья на сюжет»: первая статья кластера или ещё не размеченная."""
+    return (Article.cluster_id.is_(None)) | (Article.cluster_id == Article.id)
+
+
+def _band_candidates(db: Session, bands: Set[int]) -> Dict[int, List[int]]:
+    """{полоса: id новейших статей}, предел MAX_CANDIDATES_PER_BAND — в SQL.
+
+    Подзапрос с LIMIT на каждую полосу (UNION ALL по BAND_QUERY_CHUNK полос)
+    читает из первичного ключа (band_hash, article_id) только нужные строки:
+    «мусорная» полоса с тысячами статей стоит столько же, сколько обычная.
+    """
+    bands = list(bands)
+    found: Dict[int, List[int]] = {}
+    for i in range(0, len(bands), BAND_QUERY_CHUNK):
+        parts = [
+            select(
+                select(LSHBucket.band_hash, LSHBucket.article_id)
+                .where(LSHBucket.band_hash == band)
+                .order_by(LSHBucket.article_id.desc())
+                .limit(MAX_CANDIDATES_PER_BAND)
+                .subquery()
+            )
+            for band in bands[i:i + BAND_QUERY_CHUNK]
+        ]
+        for band, article_id in db.execute(union_all(*parts)):
+            found.setdefault(band, []).append(article_id)
+    return found
+
+
+def _load_signatures(db: Session, ids: Set[int]) -> Dict[int, Tuple[Tuple[int, ...], Optional[int]]]:
+    """{id: (распакованная сигнатура, cluster_id)} — распаковка один раз на пакет."""
+    ids = list(ids)
+    found = {}
+    for i in range(0, len(ids), LOOKUP_CHUNK):
+        rows = db.execute(
+            select(Article.id, Article.minhash, Article.cluster_id)
+            .where(Article.id.in_(ids[i:i + LOOKUP_CHUNK]))
+            .where(Article.minhash.is_not(None))
+        )
+        for article_id, signature, cluster_id in rows:
+            found[article_id] = (_SIGNATURE.unpack(signature), cluster_id)
+    return found
+
+
+@lru_cache(maxsize=100_000)
+def _word_hash(word: str) -> int:
+    return _hash64(word.encode(), signed=False)
+
+
+def _combine(hashes: List[int]) -> int:
+    """Хеш n-граммы из хешей слов (перемешивание splitmix64)."""
+    x = 0
+    for h in hashes:
+        x = (x * 0x9E3779B97F4A7C15 + h) & _MASK64
+    x ^= x >> 31
+    x = (x * 0xBF58476D1CE4E5B9) & _MASK64
+    return x ^ (x >> 29)
+
+
+def _hash64(data: bytes, signed: bool = True) -> int:
+    # signed — чтобы значение помещалось в INTEGER SQLite
+    return int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), "little", signed=signed
+    )
@@ -0,0 +1,187 @@
+"""
+Поток новых статей для подписчиков /api/stream (SSE и WebSocket).
+
+_save_articles в той же транзакции готовит событие на каждую новую статью
+(JSON в форме /api/articles/latest сериализуется один раз на всех
+подписчиков), а рассылка идёт через after_commit() писателя — только после
+commit. У каждого подписчика своя очередь на STREAM_QUEUE_SIZE событий;
+кто не успевает её разбирать, отключается (медленный клиент не держит
+память и не тормозит остальных) и при переподключении дочитывает
+пропущенное из БД по Last-Event-ID — id последней полученной статьи.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Collection, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.article import Article
+from app.services.read_model import article_dict, article_rows
+
+ARTICLE = "article"
+# Клиент отстал больше чем на STREAM_REPLAY_LIMIT статей (или курсор не из
+# этой БД): пропущенное надо перечитать списком, поток идёт с текущего места
+RESET = "reset"
+
+
+class ArticleEvent(NamedTuple):
+    id: int  # id статьи, он же Last-Event-ID
+    source_id: Optional[int]
+    event: str
+    data: str  # JSON
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class Subscription:
+    """Очередь событий одного подключения; None в очереди — конец потока."""
+
+    def __init__(self, source_id: Optional[int], maxsize: int):
+        self.source_id = source_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.evicted = False
+
+    def wants(self, event: ArticleEvent) -> bool:
+        return self.source_id is None or event.source_id == self.source_id
+
+
+class ArticleBroker:
+    """Рассылка событий подписчикам в одном event loop."""
+
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = max(1, queue_size)
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.evicted = 0
+        self._subscribers: Set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    def subscribe(self, source_id: Optional[int] = None) -> Subscription:
+        if self.full:
+            raise TooManySubscribers(f"Подписчиков уже {len(self._subscribers)}")
+        subscription = Subscription(source_id, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, events: List[ArticleEvent]) -> None:
+        """Разослать события; подписчик с переполненной очередью отключается."""
+        self.published += len(events)
+        for subscription in list(self._subscribers):
+            for event in events:
+                if not subscription.wants(event):
+                    continue
+                try:
+                    subscription.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    self.evicted += 1
+                    subscription.evicted = True
+                    self._disconnect(subscription)
+                    break
+
+    def close(self) -> None:
+        """Завершить все потоки (при остановке приложения)."""
+        for subscription in list(self._subscribers):
+            self._disconnect(subscription)
+
+    def _disconnect(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        # Недоставленное клиент дочитает по Last-Event-ID
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+
+article_broker = ArticleBroker(settings.STREAM_QUEUE_SIZE, settings.STREAM_MAX_SUBSCRIBERS)
+
+
+def article_events(db: Session, article_ids: Collection[int]) -> List[ArticleEvent]:
+    """События для только что вставленных статей (в транзакции писателя)."""
+    rows = db.execute(
+        article_rows().add_columns(Article.source_id)
+        .where(Article.id.in_(article_ids))
+        .order_by(Article.id)
+    ).all()
+    return [_event(row) for row in rows]
+
+
+async def article_stream(
+    last_event_id: Optional[int] = None,
+    source_id: Optional[int] = None,
+) -> AsyncIterator[Optional[ArticleEvent]]:
+    """События для одного подключения: сначала пропущенные после last_event_id, затем новые.
+
+    None — пора отправить heartbeat (событий не было STREAM_HEARTBEAT_SECONDS).
+    Поток заканчивается через STREAM_MAX_CONNECTION_SECONDS или при
+    отключении медленного подписчика; клиент переподключается с Last-Event-ID.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.STREAM_MAX_CONNECTION_SECONDS
+    # Подписка до чтения пропущенного: статьи, записанные между ними, не теряются
+    subscription = article_broker.subscribe(source_id)
+    try:
+        last_id = 0
+        if last_event_id is not None:
+            missed, reset_id = await _replay(last_event_id, source_id, settings.STREAM_REPLAY_LIMIT)
+            if reset_id is not None:
+                yield ArticleEvent(reset_id, None, RESET, json.dumps({"reason": "replay_unavailable"}))
+                last_id = reset_id
+            for event in missed:
+                yield event
+                last_id = event.id
+
+        while True:
+            timeout = min(settings.STREAM_HEARTBEAT_SECONDS, deadline - loop.time())
+            if timeout <= 0:
+                return
+            try:
+                # asyncio.timeout, а не wait_for: без лишней задачи на каждое ожидание
+                async with asyncio.timeout(timeout):
+                    event = await subscription.queue.get()
+            except TimeoutError:
+                yield None
+                continue
+            if event is None:
+                return
+            if event.id <= last_id:
+                continue  # уже отправлено из БД
+            last_id = event.id
+            yield event
+    finally:
+        article_broker.unsubscribe(subscription)
+
+
+async def _replay(
+    after_id: int, source_id: Optional[int], limit: int
+) -> Tuple[List[ArticleEvent], Optional[int]]:
+    """Статьи с id > after_id по возрастанию; если их больше limit — ([], id для RESET)."""
+    stmt = article_rows().add_columns(Article.source_id).where(Article.id > after_id)
+    if source_id:
+        stmt = stmt.where(Article.source_id == source_id)
+    async with AsyncSessionLocal() as db:
+        newest = (await db.execute(select(func.max(Article.id)))).scalar() or 0
+        if after_id > newest:
+            return [], newest  # курсор из другой (пересозданной) БД
+        rows = (await db.execute(stmt.order_by(Article.id).limit(limit + 1))).all()
+    if len(rows) > limit:
+        return [], newest
+    return [_event(row) for row in rows], None
+
+
+def _event(row) -> ArticleEvent:
+    data = json.dumps(article_dict(row), ensure_ascii=False, separators=(",", ":"))
+    return ArticleEvent(row.id, row.source_id, ARTICLE, data)
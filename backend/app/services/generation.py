@@ -0,0 +1,25 @@
+"""
+Поколение данных: счётчик, который растёт после каждой записи в БД.
+
+Писатель (ingest_writer) и перенос в архив увеличивают его после commit;
+кэш ответов API (app.api.cache) хранит ответ вместе с поколением, на
+котором он построен, и считает устаревшим всё, что построено раньше.
+Счётчик живёт в памяти процесса: записи из других процессов (manage.py,
+export_news.py) он не видит, их кэш подхватывает по RESPONSE_CACHE_TTL_SECONDS.
+"""
+import threading
+
+_lock = threading.Lock()
+_generation = 0
+
+
+def current_generation() -> int:
+    return _generation
+
+
+def bump_generation() -> int:
+    """Отметить изменение данных; вызывается после commit (из любого потока)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        return _generation
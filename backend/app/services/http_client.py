@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseTooLarge(Exception):
+    """Ответ превысил HTTP_MAX_RESPONSE_BYTES."""
+
+
+class HTTPClient:
+    """Общий HTTP-клиент сбора: пул keep-alive соединений, HTTP/2, gzip/brotli.
+
+    Один экземпляр живёт на время collect_all() и передаётся всем парсерам,
+    поэтому фиды с одного хоста/CDN переиспользуют соединения.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._client = httpx.AsyncClient(
+            http2=_http2_available(),
+            follow_redirects=True,
+            headers={"User-Agent": settings.HTTP_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT,
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+            ),
+            transport=transport,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> "HTTPClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def get(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[httpx.Response, bytes]:
+        """GET с ограничением параллелизма на хост и размера (распакованного) тела."""
+        limit = settings.HTTP_MAX_RESPONSE_BYTES
+        async with self._host_limit(url):
+            async with self._client.stream("GET", url, headers=headers) as response:
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > limit:
+                    raise ResponseTooLarge(f"{url}: {declared} байт")
+
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > limit:
+                        raise ResponseTooLarge(f"{url}: больше {limit} байт")
+                    chunks.append(chunk)
+        return response, b"".join(chunks)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(
+                max(1, settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+            )
+        return self._host_limits[host]
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,276 @@
+"""
+Фоновые сборы новостей: не больше одного одновременно.
+
+Все, кто запускает сбор (POST /api/collect, планировщик, /collect в боте,
+старт приложения, export_news.py), идут через collect_jobs.submit(). Если
+сбор уже идёт и покрывает нужные источники, вызывающий получает этот же
+запуск; иначе запрос ставится в очередь — в единственный ожидающий запуск,
+куда сливаются все такие запросы (их источники объединяются), и он стартует
+сразу после текущего. submit() возвращает CollectJob сразу, дождаться
+итога можно через job.wait().
+
+Каждый запуск — строка CollectRun в БД: статус, время, итог и состояние
+источников. Живой прогресс по источникам есть только в памяти процесса,
+который ведёт сбор; в БД он записывается в конце.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, UTC
+from typing import Any, Collection, Dict, FrozenSet, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.collect_run import CollectRun
+from app.services.writer import ingest_writer
+
+logger = logging.getLogger(__name__)
+
+# Статусы, после которых запуск не меняется
+FINISHED = ("done", "failed", "interrupted")
+
+
+class CollectJob:
+    """Один запуск сбора: состояние в памяти, пока он идёт или ждёт очереди."""
+
+    def __init__(self, run_id: int, trigger: str, sources: Optional[FrozenSet[str]], created_at: datetime):
+        self.id = run_id
+        self.trigger = trigger
+        self.sources = sources  # None — все активные источники
+        self.status = "queued"
+        self.created_at = created_at
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.duration_seconds: Optional[float] = None
+        self.progress: Dict[str, dict] = {}
+        self.result: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+        self._done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def covers(self, sources: Optional[FrozenSet[str]]) -> bool:
+        """Соберёт ли этот запуск (ещё не закончившийся) источники sources."""
+        if self.status in FINISHED:
+            return False
+        return self.sources is None or (sources is not None and sources <= self.sources)
+
+    async def wait(self) -> dict:
+        """Итог сбора ({total_found, total_new, errors}); отмена ожидания сбор не прерывает."""
+        return await asyncio.shield(self._done)
+
+    def _resolve(self) -> None:
+        if self._done.done():
+            return
+        if self.status == "done":
+            self._done.set_result(self.result)
+        else:
+            self._done.set_exception(self.error or RuntimeError(f"Сбор #{self.id}: {self.status}"))
+            self._done.exception()  # ожидающих может не быть — не предупреждать
+
+    def to_dict(self) -> dict:
+        result = self.result or {}
+        return {
+            "id": self.id,
+            "status": self.status,
+            "trigger": self.trigger,
+            "sources": sorted(self.sources) if self.sources is not None else None,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "duration_seconds": self.duration_seconds,
+            "total_found": result.get("total_found"),
+            "total_new": result.get("total_new"),
+            "errors": result.get("errors", []),
+            "progress": self.progress,
+        }
+
+
+class CollectJobManager:
+    """Текущий сбор и не больше одного ожидающего."""
+
+    def __init__(self):
+        self._current: Optional[CollectJob] = None
+        self._pending: Optional[CollectJob] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def submit(self, trigger: str, source_names: Optional[Collection[str]] = None) -> CollectJob:
+        """Запустить сбор, присоединиться к идущему или встать в очередь за ним."""
+        self._ensure_loop()
+        sources = frozenset(source_names) if source_names is not None else None
+        async with self._lock:
+            if self._current and self._current.covers(sources):
+                return self._current
+            if self._pending:
+                if not self._pending.covers(sources):
+                    self._pending.sources = None if sources is None else self._pending.sources | sources
+                    await ingest_writer.submit(
+                        _update_run, self._pending.id,
+                        {"sources": _sources_json(self._pending.sources)},
+                    )
+                return self._pending
+
+            job = await self._create(trigger, sources)
+            if self._current is None:
+                self._start(job)
+            else:
+                self._pending = job
+            return job
+
+    @property
+    def busy(self) -> bool:
+        """Идёт ли сейчас сбор в этом процессе."""
+        return self._current is not None and self._loop is asyncio.get_running_loop()
+
+    def get(self, run_id: int) -> Optional[CollectJob]:
+        """Запуск из памяти процесса (идущий или ожидающий)."""
+        for job in (self._current, self._pending):
+            if job is not None and job.id == run_id:
+                return job
+        return None
+
+    async def close(self) -> None:
+        """Прервать текущий и ожидающий сбор (при остановке приложения)."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        pending, self._pending = self._pending, None
+        if pending:
+            await self._finish(pending, "interrupted")
+            pending._resolve()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _ensure_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Первый вызов или новый event loop (asyncio.run в скриптах)
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._current = self._pending = self._task = None
+
+    async def _create(self, trigger: str, sources: Optional[FrozenSet[str]]) -> CollectJob:
+        created_at = _now()
+        run_id = await ingest_writer.submit(_insert_run, {
+            "trigger": trigger,
+            "sources": _sources_json(sources),
+            "status": "queued",
+            "created_at": created_at,
+        })
+        return CollectJob(run_id, trigger, sources, created_at)
+
+    def _start(self, job: CollectJob) -> None:
+        self._current = job
+        self._task = self._loop.create_task(self._run(job), name=f"collect-{job.id}")
+
+    async def _run(self, job: CollectJob) -> None:
+        # Парсеры (feedparser, lxml) импортируются при первом сборе, а не при старте API
+        from app.services.collector import collect_all
+
+        job.status = "running"
+        job.started_at = _now()
+        started = time.perf_counter()
+        status = "failed"
+        try:
+            await ingest_writer.submit(_update_run, job.id, {"status": "running", "started_at": job.started_at})
+            logger.info(f"Сбор #{job.id} ({job.trigger}) запущен")
+            job.result = await collect_all(job.sources, progress=job.progress)
+            status = "done"
+        except asyncio.CancelledError:
+            status = "interrupted"
+            raise
+        except Exception as e:
+            logger.error(f"Сбор #{job.id} завершился ошибкой: {e}", exc_info=True)
+            job.error = e
+            job.result = {"total_found": 0, "total_new": 0, "errors": [str(e) or type(e).__name__]}
+        finally:
+            job.duration_seconds = round(time.perf_counter() - started, 3)
+            await asyncio.shield(self._finish(job, status))
+            async with self._lock:
+                self._current = None
+                if self._pending is not None and status != "interrupted":
+                    self._start(self._pending)
+                    self._pending = None
+            job._resolve()
+
+    async def _finish(self, job: CollectJob, status: str) -> None:
+        job.status = status
+        job.finished_at = _now()
+        result = job.result or {}
+        try:
+            await ingest_writer.submit(_update_run, job.id, {
+                "status": status,
+                "finished_at": job.finished_at,
+                "duration_seconds": job.duration_seconds,
+                "total_found": result.get("total_found"),
+                "total_new": result.get("total_new"),
+                "errors": result.get("errors", []),
+                "progress": job.progress,
+            })
+        except Exception as e:
+            logger.error(f"Не удалось записать итог сбора #{job.id}: {e}")
+
+
+collect_jobs = CollectJobManager()
+
+
+def run_dict(run: CollectRun) -> dict:
+    """Запуск из БД в том же виде, что CollectJob.to_dict()."""
+    return {
+        "id": run.id,
+        "status": run.status,
+        "trigger": run.trigger,
+        "sources": run.sources,
+        "created_at": _iso(run.created_at),
+        "started_at": _iso(run.started_at),
+        "finished_at": _iso(run.finished_at),
+        "duration_seconds": run.duration_seconds,
+        "total_found": run.total_found,
+        "total_new": run.total_new,
+        "errors": run.errors or [],
+        "progress": run.progress or {},
+    }
+
+
+def recent_runs(db: Session, limit: int = 20) -> List[CollectRun]:
+    return db.execute(select(CollectRun).order_by(CollectRun.id.desc()).limit(limit)).scalars().all()
+
+
+def mark_interrupted(db: Session) -> int:
+    """Запуски, оставшиеся «в работе» после прошлой остановки процесса, — прерванными."""
+    result = db.execute(
+        update(CollectRun)
+        .where(CollectRun.status.notin_(FINISHED))
+        .values(status="interrupted", finished_at=_now())
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _insert_run(db: Session, values: Dict[str, Any]) -> int:
+    run = CollectRun(**values)
+    db.add(run)
+    db.flush()
+    return run.id
+
+
+def _update_run(db: Session, run_id: int, values: Dict[str, Any]) -> None:
+    db.execute(update(CollectRun).where(CollectRun.id == run_id).values(**values))
+
+
+def _sources_json(sources: Optional[FrozenSet[str]]) -> Optional[List[str]]:
+    return sorted(sources) if sources is not None else None
+
+
+def _now() -> datetime:
+    # Наивное UTC, как DateTime-колонки возвращаются из SQLite
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
@@ -0,0 +1,51 @@
+"""Где выполнять CPU-bound разбор фидов: inline, в потоке или в пуле процессов."""
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PARSE_MODES = ("inline", "thread", "process")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def run_parse(func: Callable[..., T], *args, mode: Optional[str] = None) -> T:
+    """Выполнить func(*args) согласно PARSE_MODE.
+
+    process — в ProcessPoolExecutor на PARSE_WORKERS процессов, не держит GIL
+    event loop'а; func и аргументы должны быть picklable.
+    thread — в пуле потоков по умолчанию (прежнее поведение).
+    inline — прямо в event loop, без накладных расходов на передачу.
+    """
+    mode = mode or settings.PARSE_MODE
+    if mode == "process":
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pool(), partial(func, *args))
+    if mode == "thread":
+        return await asyncio.to_thread(func, *args)
+    if mode == "inline":
+        return func(*args)
+    raise ValueError(f"Неизвестный PARSE_MODE: {mode!r}, ожидается один из {PARSE_MODES}")
+
+
+def shutdown_pool() -> None:
+    """Остановить пул процессов (если он создавался)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.PARSE_WORKERS or None)
+        logger.info(f"Пул разбора фидов: {_pool._max_workers} процессов")
+    return _pool
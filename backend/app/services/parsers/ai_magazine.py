@@ -1,22 +1,25 @@
-from .base_parser import BaseParser
-from typing import List, Dict
-import logging
+from .deepmind import ARTICLE_META
+from .html_scraper import HTMLScraperParser
 
-logger = logging.getLogger(__name__)
+AI_MAGAZINE_CONFIG = {
+    "list_url": "https://aimagazine.com/",
+    "item": "a[href]",
+    "link_pattern": r"aimagazine\.com/(articles|news)/[a-z0-9-]+/?$",
+    "fields": {
+        "title": ["h2", "h3", ""],
+    },
+    "detail": ARTICLE_META,
+}
 
-class AIMagazineParser(BaseParser):
+
+class AIMagazineParser(HTMLScraperParser):
     """
     Parser for AI Magazine (web scraping)
-    Note: Web scraping implementation pending
     """
 
     def __init__(self):
         super().__init__(
             source_name="AI Magazine",
-            source_url="https://aimagazine.com/"
+            source_url="https://aimagazine.com/",
+            config=AI_MAGAZINE_CONFIG,
         )
-
-    async def fetch_articles(self) -> List[Dict]:
-        logger.info(f"AI Magazine parser - web scraping not yet implemented")
-        # TODO: Implement web scraping with BeautifulSoup
-        return []
@@ -1,31 +1,101 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Set
 from datetime import datetime
 import hashlib
 
+from app.services.http_client import HTTPClient
+from app.utils.dates import naive_utc
+from .feed_parsing import clean_text
+
+
 class BaseParser(ABC):
     """
     Базовый класс для всех парсеров новостных источников
     """
 
+    source_type: Optional[str] = None
+    # Статьи идут от новых к старым (фиды). Для False (страницы сайтов, где
+    # закреплённые посты стоят выше новых) коллектор не останавливается на
+    # водяном знаке, а передаёт в seen_urls URL уже сохранённых статей
+    chronological = True
+
     def __init__(self, source_name: str, source_url: str):
         self.source_name = source_name
         self.source_url = source_url
 
+        # Валидаторы conditional GET: коллектор заполняет их из Source
+        # перед загрузкой и сохраняет обратно после неё
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.body_hash: Optional[str] = None
+        self.not_modified = False
+
+        # Водяной знак: самая свежая уже сохранённая статья источника
+        self.watermark_url: Optional[str] = None
+        self.watermark_published_at: Optional[datetime] = None
+        self.seen_urls: Set[str] = set()
+
     @abstractmethod
-    async def fetch_articles(self) -> List[Dict]:
+    def iter_articles(self, http: HTTPClient) -> AsyncIterator[Dict]:
         """
-        Получить список статей из источника
-        Returns: List of dicts with keys: title, url, summary, author, published_at, content
+        Лениво отдавать статьи источника, от новых к старым (если chronological)
+        Yields: dicts with keys: title, url, summary, author, published_at, content
+        Ошибки загрузки и разбора списка пробрасываются: коллектор отмечает
+        источник как failed
         """
         pass
 
+    async def fetch_articles(self, http: HTTPClient) -> List[Dict]:
+        """Получить все статьи источника списком"""
+        return [article async for article in self.iter_articles(http)]
+
+    def reached_watermark(self, article: Dict) -> bool:
+        """True when the article is the newest already stored one or older than it"""
+        if not self.chronological:
+            return False
+        if self.watermark_url and article.get("url") == self.watermark_url:
+            return True
+        if self.watermark_published_at and article.get("published_at"):
+            return naive_utc(article["published_at"]) < naive_utc(self.watermark_published_at)
+        return False
+
+    async def fetch_body(self, http: HTTPClient, url: str) -> Optional[bytes]:
+        """
+        Conditional GET with the stored validators.
+        Returns None (and sets not_modified) on 304 or when the body hash is unchanged.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        response, body = await http.get(url, headers=headers)
+        if response.status_code == 304:
+            self.not_modified = True
+            return None
+        response.raise_for_status()
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        if body_hash == self.body_hash:
+            self.not_modified = True
+            return None
+
+        self.body_hash = body_hash
+        return body
+
+    def reset_validators(self) -> None:
+        """Forget validators so the next run downloads the resource in full"""
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+
     def generate_content_hash(self, content: str) -> str:
         """Generate SHA256 hash for deduplication"""
         return hashlib.sha256(content.encode()).hexdigest()
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        if not text:
-            return ""
-        return " ".join(text.split()).strip()
+        return clean_text(text)
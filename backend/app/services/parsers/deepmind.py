@@ -1,22 +1,35 @@
-from .base_parser import BaseParser
-from typing import List, Dict
-import logging
+from .html_scraper import HTMLScraperParser
 
-logger = logging.getLogger(__name__)
+# Поля страницы статьи по стандартной разметке Open Graph / article:*
+ARTICLE_META = {
+    "title": ["meta[property='og:title']@content", "h1"],
+    "summary": ["meta[property='og:description']@content", "meta[name='description']@content"],
+    "published_at": ["meta[property='article:published_time']@content", "time@datetime"],
+    "author": ["meta[name='author']@content"],
+    "content": ["article", "main"],
+}
 
-class DeepMindParser(BaseParser):
+DEEPMIND_CONFIG = {
+    "list_url": "https://deepmind.google/discover/blog/",
+    "item": "a[href*='/discover/blog/']",
+    "link_pattern": r"/discover/blog/[^/?#]+/?$",
+    "fields": {
+        "title": ["h3", "h2", ""],
+        "summary": ["p"],
+        "published_at": ["time@datetime", "time"],
+    },
+    "detail": ARTICLE_META,
+}
+
+
+class DeepMindParser(HTMLScraperParser):
     """
     Parser for DeepMind Blog (web scraping)
-    Note: Web scraping implementation pending
     """
 
     def __init__(self):
         super().__init__(
             source_name="DeepMind Blog",
-            source_url="https://www.deepmind.com/blog"
+            source_url="https://deepmind.google/discover/blog/",
+            config=DEEPMIND_CONFIG,
         )
-
-    async def fetch_articles(self) -> List[Dict]:
-        logger.info(f"DeepMind parser - web scraping not yet implemented")
-        # TODO: Implement web scraping with BeautifulSoup
-        return []
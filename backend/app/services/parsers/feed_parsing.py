@@ -0,0 +1,73 @@
+"""
+CPU-bound часть разбора фидов: XML → компактные очищенные записи.
+
+Функции модуля не зависят от HTTP и БД и принимают/возвращают только
+picklable-значения, поэтому parse_feed можно выполнять в пуле процессов.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+import feedparser
+
+from app.utils.dates import naive_utc
+
+# (title, url, summary, author, published_at, content)
+FeedRecord = Tuple[str, str, str, str, datetime, str]
+
+
+def parse_feed(
+    body: bytes,
+    watermark_url: Optional[str] = None,
+    watermark_published_at: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[FeedRecord]:
+    """Parse a feed body into cleaned records, stopping at the watermark or limit"""
+    feed = feedparser.parse(body)
+    records = []
+    for entry in feed.entries:
+        url = entry.get('link', '')
+        if not url:
+            continue
+
+        published_at = parse_date(entry)
+        if watermark_url and url == watermark_url:
+            break
+        if watermark_published_at and naive_utc(published_at) < naive_utc(watermark_published_at):
+            break
+
+        records.append((
+            clean_text(entry.get('title', '')),
+            url,
+            clean_text(entry.get('summary', '')),
+            entry.get('author', ''),
+            published_at,
+            extract_content(entry),
+        ))
+        if limit and len(records) >= limit:
+            break
+    return records
+
+
+def parse_date(entry) -> datetime:
+    """Parse publication date from entry"""
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        return datetime(*entry.published_parsed[:6])
+    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        return datetime(*entry.updated_parsed[:6])
+    return datetime.now(timezone.utc)
+
+
+def extract_content(entry) -> str:
+    """Extract full content from entry"""
+    if hasattr(entry, 'content') and entry.content:
+        return clean_text(entry.content[0].value)
+    elif hasattr(entry, 'summary'):
+        return clean_text(entry.summary)
+    return ""
+
+
+def clean_text(text: str) -> str:
+    """Clean and normalize text"""
+    if not text:
+        return ""
+    return " ".join(text.split()).strip()
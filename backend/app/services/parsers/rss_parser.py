@@ -1,8 +1,9 @@
-import asyncio
-import feedparser
-from typing import List, Dict
-from datetime import datetime, UTC
+from typing import AsyncIterator, Dict
 from .base_parser import BaseParser
+from .feed_parsing import parse_feed
+from app.config import settings
+from app.services.http_client import HTTPClient
+from app.services.parse_pool import run_parse
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,46 +13,39 @@ class RSSParser(BaseParser):
     Универсальный парсер для RSS/Atom фидов
     """
 
+    source_type = "rss"
+
     def __init__(self, source_name: str, source_url: str, feed_url: str):
         super().__init__(source_name, source_url)
         self.feed_url = feed_url
 
-    async def fetch_articles(self) -> List[Dict]:
-        articles = []
-
+    async def iter_articles(self, http: HTTPClient) -> AsyncIterator[Dict]:
         try:
-            feed = await asyncio.to_thread(feedparser.parse, self.feed_url)
-
-            for entry in feed.entries:
-                article = {
-                    'title': self.clean_text(entry.get('title', '')),
-                    'url': entry.get('link', ''),
-                    'summary': self.clean_text(entry.get('summary', '')),
-                    'author': entry.get('author', ''),
-                    'published_at': self._parse_date(entry),
-                    'content': self._extract_content(entry)
-                }
-
-                if article['url']:  # Only add if URL exists
-                    articles.append(article)
-
+            body = await self.fetch_body(http, self.feed_url)
+            if body is None:
+                return
+
+            # XML parsing and text cleaning run where PARSE_MODE says
+            # (thread / process pool / inline) and stop at the watermark
+            records = await run_parse(
+                parse_feed,
+                body,
+                self.watermark_url,
+                self.watermark_published_at,
+                settings.MAX_ARTICLES_PER_SOURCE,
+            )
         except Exception as e:
             logger.error(f"Error parsing RSS feed {self.feed_url}: {e}")
-
-        return articles
-
-    def _parse_date(self, entry) -> datetime:
-        """Parse publication date from entry"""
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            return datetime(*entry.published_parsed[:6])
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-            return datetime(*entry.updated_parsed[:6])
-        return datetime.now(UTC)
-
-    def _extract_content(self, entry) -> str:
-        """Extract full content from entry"""
-        if hasattr(entry, 'content') and entry.content:
-            return self.clean_text(entry.content[0].value)
-        elif hasattr(entry, 'summary'):
-            return self.clean_text(entry.summary)
-        return ""
+            # Otherwise a 304 on the next run would hide the entries lost here
+            self.reset_validators()
+            raise
+
+        for title, url, summary, author, published_at, content in records:
+            yield {
+                'title': title,
+                'url': url,
+                'summary': summary,
+                'author': author,
+                'published_at': published_at,
+                'content': content
+            }
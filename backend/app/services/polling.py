@@ -0,0 +1,50 @@
+"""Частота публикаций источников и интервалы их опроса."""
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.article import Article
+
+# Сколько последних статей источника учитывать при оценке частоты
+HISTORY_SIZE = 20
+
+
+def publish_rate(db: Session, source_id: int) -> Optional[float]:
+    """Наблюдаемая частота публикаций источника, статей в сутки.
+
+    Берутся последние HISTORY_SIZE статей за POLL_HISTORY_DAYS; частота —
+    их число, делённое на время от самой старой из них до текущего момента,
+    поэтому затихший источник постепенно получает всё меньшую частоту.
+    None — истории ещё нет (источник не собирался).
+    """
+    now = datetime.now(UTC).replace(tzinfo=None)
+    window_start = now - timedelta(days=settings.POLL_HISTORY_DAYS)
+    dates = db.execute(
+        select(Article.published_at)
+        .where(Article.source_id == source_id, Article.published_at >= window_start)
+        .order_by(Article.published_at.desc())
+        .limit(HISTORY_SIZE)
+    ).scalars().all()
+    if not dates:
+        has_history = db.execute(
+            select(Article.id).where(Article.source_id == source_id).limit(1)
+        ).first()
+        return 0.0 if has_history else None
+
+    span_days = max((now - dates[-1]).total_seconds() / 86400, 1 / 24)
+    return len(dates) / span_days
+
+
+def poll_interval_minutes(rate: Optional[float]) -> int:
+    """Интервал опроса: половина среднего промежутка между публикациями,
+    в пределах POLL_MIN_MINUTES..POLL_MAX_MINUTES."""
+    if rate is None:
+        interval = settings.COLLECT_INTERVAL_HOURS * 60
+    elif rate <= 0:
+        interval = settings.POLL_MAX_MINUTES
+    else:
+        interval = 24 * 60 / rate / 2
+    return int(min(max(interval, settings.POLL_MIN_MINUTES), settings.POLL_MAX_MINUTES))
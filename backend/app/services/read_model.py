@@ -0,0 +1,82 @@
+"""
+Модель чтения для списков статей: Core-запросы только по нужным колонкам.
+
+Списки в API, боте и экспорте не создают ORM-объекты Article/Source
+(identity map, отслеживание изменений, joinedload) — запрос возвращает
+готовые строки (Row: кортеж с доступом по имени) сразу в форме ответа:
+id, title, url, summary (обрезанная в SQL), author, source (имя), published_at.
+Курсоры пагинации и форматтеры бота работают с этими строками так же,
+как с Article.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import Select, func, select
+
+from app.models.article import Article
+from app.models.source import Source
+from app.services.dedup import story_representative
+
+# Сколько символов аннотации отдаётся в списках
+SUMMARY_LENGTH = 300
+
+
+def article_rows(summary_length: Optional[int] = SUMMARY_LENGTH) -> Select:
+    """SELECT строк статей с именем источника; summary_length=None — аннотация целиком."""
+    summary = func.coalesce(Article.summary, "")
+    if summary_length is not None:
+        summary = func.substr(summary, 1, summary_length)
+    return (
+        select(
+            Article.id,
+            Article.title,
+            Article.url,
+            summary.label("summary"),
+            Article.author,
+            Source.name.label("source"),
+            Article.published_at,
+        )
+        .select_from(Article)
+        .outerjoin(Source, Source.id == Article.source_id)
+    )
+
+
+def story_rows(since: Optional[datetime] = None, limit: int = 20) -> Select:
+    """Свежие статьи, одна на сюжет (топ, дайджест, экспорт)."""
+    stmt = article_rows().where(story_representative())
+    if since is not None:
+        stmt = stmt.where(Article.published_at >= since)
+    return stmt.order_by(Article.published_at.desc()).limit(limit)
+
+
+def source_rows() -> Select:
+    """Активные источники: id, name, url, category, articles_count, last_checked,
+    last_published_at."""
+    return select(
+        Source.id,
+        Source.name,
+        Source.url,
+        Source.category,
+        func.coalesce(Source.articles_count, 0).label("articles_count"),
+        Source.last_checked,
+        Source.last_published_at,
+    ).where(Source.is_active == True)
+
+
+def article_dict(row, missing: Any = None) -> dict:
+    """Строка article_rows() → словарь ответа; missing — значение для пустых полей.
+
+    Колонки выбираются по меткам (row._mapping), а не по позиции: запросу
+    можно добавлять свои колонки через add_columns().
+    """
+    fields = row._mapping
+    author, source, published_at = fields["author"], fields["source"], fields["published_at"]
+    return {
+        "id": fields["id"],
+        "title": fields["title"],
+        "url": fields["url"],
+        "summary": fields["summary"],
+        "author": missing if author is None else author,
+        "source": missing if source is None else source,
+        "published_at": published_at.isoformat() if published_at else missing,
+    }
@@ -0,0 +1,309 @@
+"""
+Полнотекстовый поиск по статьям (SQLite FTS5).
+
+articles_fts — FTS5-индекс с внешним содержимым (rowid = Article.id): свои
+копии текстов он не хранит, а для сниппетов читает представление
+articles_fts_source, которое распаковывает полный текст из article_bodies
+SQL-функцией article_body(). Строки индексируются в той же транзакции, что
+и статьи (_save_articles), поэтому индекс не расходится с таблицей.
+Ранжирование — BM25 с весами полей (заголовок важнее аннотации, аннотация
+важнее текста).
+"""
+import html
+import logging
+import re
+from datetime import datetime
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.article import Article
+from app.services.read_model import article_rows
+from app.utils.dates import naive_utc
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "articles_fts"
+FTS_SOURCE_VIEW = "articles_fts_source"
+
+# Веса BM25 для (title, summary, content)
+RANK = "bm25(10.0, 4.0, 1.0)"
+
+# Маркеры совпадений в snippet(): управляющие символы, которых нет в тексте,
+# чтобы потребитель мог сначала экранировать текст, а потом подставить теги
+MARK_START = "\x02"
+MARK_END = "\x03"
+SNIPPET_TOKENS = 24
+
+# Сколько свежих совпадений смотреть, оценивая частоту слова
+COMMON_TERM_PROBE = 256
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+
+class SearchHit(NamedTuple):
+    article: Any  # строка app.services.read_model.article_rows()
+    snippet: str
+    rank: float
+
+
+def ensure_fts_index(engine: Engine) -> None:
+    """Создать FTS5-индекс и его представление-источник.
+
+    Индекс, созданный без внешнего содержимого (со своей копией текстов),
+    пересоздаётся; новый индекс заполняется из articles.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE VIEW IF NOT EXISTS {FTS_SOURCE_VIEW} AS "
+            "SELECT a.id AS id, coalesce(a.title, '') AS title, "
+            "coalesce(a.summary, '') AS summary, "
+            "article_body(b.codec, b.dict_id, d.data, b.data) AS content "
+            "FROM articles a "
+            "LEFT JOIN article_bodies b ON b.article_id = a.id "
+            "LEFT JOIN compression_dicts d ON d.id = b.dict_id"
+        ))
+        sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).scalar()
+        if sql and f"content='{FTS_SOURCE_VIEW}'" in sql:
+            return
+        if sql:
+            conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, summary, content, "
+            f"content='{FTS_SOURCE_VIEW}', content_rowid='id', "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        conn.execute(text(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', :rank)"
+        ), {"rank": RANK})
+        count = _rebuild(conn)
+    logger.info(f"Создан полнотекстовый индекс, статей: {count}")
+
+
+def index_articles(db: Session, rows: Iterable[Tuple[int, str, str, str]]) -> None:
+    """Добавить статьи в индекс: (id, title, summary, content), без commit()."""
+    params = [
+        {"id": article_id, "title": title or "", "summary": summary or "", "content": content or ""}
+        for article_id, title, summary, content in rows
+    ]
+    if params:
+        db.execute(text(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, summary, content) "
+            "VALUES (:id, :title, :summary, :content)"
+        ), params)
+
+
+def remove_articles(db: Session, article_ids: Sequence[int]) -> None:
+    """Удалить статьи из индекса, без commit().
+
+    Вызывать до удаления самих статей и их текстов: внешнему индексу для
+    удаления нужны те же значения, что были проиндексированы.
+    """
+    if article_ids:
+        db.execute(
+            text(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary, content) "
+                f"SELECT 'delete', id, title, summary, content FROM {FTS_SOURCE_VIEW} "
+                "WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": list(article_ids)},
+        )
+
+
+def rebuild_index(db: Session) -> int:
+    """Переиндексировать все статьи заново. Возвращает число статей."""
+    count = _rebuild(db)
+    db.commit()
+    return count
+
+
+def optimize_index(db: Session, commit: bool = True) -> None:
+    """Слить сегменты индекса в один (ускоряет запросы после массовой записи)."""
+    db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    if commit:
+        db.commit()
+
+
+def build_match_query(query: str) -> str:
+    """Превратить пользовательский ввод в безопасное выражение MATCH.
+
+    Каждое слово берётся в кавычки (никакого синтаксиса FTS5 от пользователя),
+    слова объединяются через AND; «слово*» — поиск по префиксу.
+    ValueError, если слов нет.
+    """
+    return " ".join(_query_terms(query))
+
+
+def search_articles(
+    db: Session,
+    query: str,
+    source_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[SearchHit]:
+    """Найти статьи по запросу, лучшие по BM25 первыми.
+
+    Ранжирование ограничено, чтобы время ответа не росло с архивом:
+    - BM25 считается только для SEARCH_RANK_WINDOW самых свежих совпадений
+      (обход FTS5 по убыванию rowid останавливается сам);
+    - слова, которые встречаются примерно в SEARCH_COMMON_TERM_DOCS статьях
+      и больше, в BM25 не участвуют: их IDF близок к нулю, а его расчёт
+      читает весь список документов слова. Совпадать по-прежнему должны все
+      слова запроса. Если частые все слова, результаты идут от новых к старым.
+    Затем для страницы результатов строятся сниппеты и загружаются строки
+    статей (read_model.article_rows).
+    ValueError, если запрос пустой.
+    """
+    terms = _query_terms(query)
+    rare = [term for term in terms if not _is_common_term(db, term)]
+
+    params = {"limit": limit, "offset": offset}
+    filters = _filters(params, source_id, since, until)
+
+    if rare and len(rare) < len(terms):
+        # Окно — свежие совпадения всех слов, без BM25; затем BM25 только по
+        # редким словам одним проходом по диапазону rowid окна. «+rowid» не
+        # даёт FTS5 искать каждую строку отдельно (и каждый раз заново
+        # считать IDF)
+        params["match"] = " ".join(terms)
+        params["rare"] = " ".join(rare)
+        params["window"] = max(settings.SEARCH_RANK_WINDOW, limit + offset)
+        window_sql = _matches_sql("0.0", filters) + " LIMIT :window"
+        ranked_sql = (
+            f"WITH recent AS MATERIALIZED ({window_sql}) "
+            f"SELECT rowid AS id, rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :rare "
+            "AND rowid >= (SELECT min(id) FROM recent) AND +rowid IN (SELECT id FROM recent) "
+            "ORDER BY rank LIMIT :limit OFFSET :offset"
+        )
+    elif rare:
+        params["match"] = " ".join(rare)
+        params["window"] = max(settings.SEARCH_RANK_WINDOW, limit + offset)
+        window_sql = _matches_sql(f"{FTS_TABLE}.rank", filters) + " LIMIT :window"
+        ranked_sql = (
+            f"SELECT id, rank FROM ({window_sql}) ORDER BY rank LIMIT :limit OFFSET :offset"
+        )
+    else:
+        params["match"] = " ".join(terms)
+        ranked_sql = _matches_sql("0.0", filters) + " LIMIT :limit OFFSET :offset"
+    ranked = db.execute(text(ranked_sql), params).all()
+    if not ranked:
+        return []
+
+    ids = [row.id for row in ranked]
+    snippets = dict(db.execute(
+        text(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, :start, :end, '…', :tokens) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match AND rowid IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"match": " ".join(terms), "start": MARK_START, "end": MARK_END,
+         "tokens": SNIPPET_TOKENS, "ids": ids},
+    ).all())
+    articles = {
+        row.id: row for row in db.execute(article_rows().where(Article.id.in_(ids)))
+    }
+    return [
+        SearchHit(articles[row.id], snippets.get(row.id, ""), row.rank)
+        for row in ranked
+        if row.id in articles
+    ]
+
+
+def count_matches(
+    db: Session,
+    query: str,
+    source_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> int:
+    """Сколько статей в БД подходят под запрос (для перехода к поиску по архиву)."""
+    params = {"match": build_match_query(query)}
+    filters = _filters(params, source_id, since, until)
+    return db.execute(
+        text(f"SELECT count(*) FROM ({_matches_sql('0.0', filters)})"), params
+    ).scalar_one()
+
+
+def render_snippet(snippet: str, start: str, end: str, escape=html.escape) -> str:
+    """Экранировать сниппет и заменить маркеры совпадений на теги start/end."""
+    return escape(snippet).replace(MARK_START, start).replace(MARK_END, end)
+
+
+def _query_terms(query: str) -> List[str]:
+    terms = []
+    for token in _TOKEN_RE.findall(query or ""):
+        word = token.rstrip("*")
+        if not word:
+            continue
+        terms.append(f'"{word}"*' if token.endswith("*") else f'"{word}"')
+    if not terms:
+        raise ValueError("Пустой поисковый запрос")
+    return terms
+
+
+def _filters(
+    params: dict,
+    source_id: Optional[int],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> List[str]:
+    """Условия на статью для _matches_sql; значения добавляются в params."""
+    filters = []
+    if source_id:
+        filters.append("a.source_id = :source_id")
+        params["source_id"] = source_id
+    if since:
+        filters.append("a.published_at >= :since")
+        params["since"] = naive_utc(since)
+    if until:
+        filters.append("a.published_at < :until")
+        params["until"] = naive_utc(until)
+    return filters
+
+
+def _matches_sql(rank_sql: str, filters: List[str]) -> str:
+    """Совпадения :match (с фильтрами по статье) от новых к старым."""
+    sql = f"SELECT {FTS_TABLE}.rowid AS id, {rank_sql} AS rank FROM {FTS_TABLE} "
+    if filters:
+        sql += f"JOIN articles a ON a.id = {FTS_TABLE}.rowid "
+    sql += f"WHERE {FTS_TABLE} MATCH :match "
+    if filters:
+        sql += "AND " + " AND ".join(filters) + " "
+    return sql + f"ORDER BY {FTS_TABLE}.rowid DESC"
+
+
+def _is_common_term(db: Session, term: str) -> bool:
+    """Оценить, встречается ли слово в SEARCH_COMMON_TERM_DOCS статьях и больше.
+
+    Берутся COMMON_TERM_PROBE самых свежих совпадений: чем плотнее они лежат
+    по rowid, тем чаще слово. Стоит долю миллисекунды, в отличие от точного
+    подсчёта.
+    """
+    rowids = db.execute(
+        text(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :term "
+            "ORDER BY rowid DESC LIMIT :probe"
+        ),
+        {"term": term, "probe": COMMON_TERM_PROBE},
+    ).scalars().all()
+    if len(rowids) < COMMON_TERM_PROBE:
+        return False
+    first, last = db.execute(text(
+        f"SELECT (SELECT rowid FROM {FTS_TABLE} ORDER BY rowid LIMIT 1), "
+        f"(SELECT rowid FROM {FTS_TABLE} ORDER BY rowid DESC LIMIT 1)"
+    )).one()
+    density = len(rowids) / (rowids[0] - rowids[-1] + 1)
+    return density * (last - first + 1) >= settings.SEARCH_COMMON_TERM_DOCS
+
+
+def _rebuild(conn) -> int:
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return conn.execute(text("SELECT count(*) FROM articles")).scalar()
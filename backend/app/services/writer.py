@@ -0,0 +1,142 @@
+"""
+Единственный писатель в БД для сбора статей.
+
+SQLite допускает только одного писателя одновременно. Вместо того чтобы
+задачи сбора соревновались за блокировку, все записи ставятся в очередь и
+выполняются одной фоновой задачей: несколько заданий подряд объединяются в
+одну транзакцию (до WRITER_MAX_BATCH), сама транзакция идёт в потоке
+через синхронный Session и не блокирует event loop. После каждого commit
+растёт поколение данных (app.services.generation) — по нему сбрасывается
+кэш ответов API, — и выполняются колбэки, отложенные заданиями через
+after_commit() (например, рассылка новых статей подписчикам потока).
+"""
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.generation import bump_generation
+
+logger = logging.getLogger(__name__)
+
+# (функция(db, *args), args, future)
+_Job = Tuple[Callable[..., Any], tuple, asyncio.Future]
+# (функция(*args), args)
+_Callback = Tuple[Callable[..., Any], tuple]
+
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(db: Session, func: Callable[..., Any], *args) -> None:
+    """Вызвать func(*args) в event loop писателя, когда транзакция db закоммичена.
+
+    Если транзакция откатится, вызова не будет. Вне писателя (скрипты,
+    бенчмарки с собственным commit) колбэк просто не выполняется.
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append((func, args))
+
+
+class IngestWriter:
+    """Очередь заданий записи и задача, которая их выполняет.
+
+    Задание — функция func(db: Session, *args) без commit(): коммит делает
+    писатель. Если пакет падает, он откатывается и задания повторяются по
+    одному, так что ошибка достаётся только виновному заданию.
+    """
+
+    def __init__(self, max_batch: Optional[int] = None):
+        self.max_batch = max(1, max_batch or settings.WRITER_MAX_BATCH)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, func: Callable[..., Any], *args) -> Any:
+        """Поставить задание в очередь и дождаться результата после commit."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((func, args, future))
+        return await future
+
+    async def close(self) -> None:
+        """Выполнить оставшиеся задания и остановить задачу писателя."""
+        if not self._task or self._task.done() or self._loop is not asyncio.get_running_loop():
+            self._task = None
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._loop is loop:
+            return
+        # Первый вызов или новый event loop (asyncio.run в скриптах)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._task = loop.create_task(self._run(), name="ingest-writer")
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            stop = False
+            while len(jobs) < self.max_batch and not self._queue.empty():
+                job = self._queue.get_nowait()
+                if job is None:
+                    stop = True
+                    break
+                jobs.append(job)
+
+            # Задания, чьи ожидающие уже отменены (таймаут источника), не пишем
+            jobs = [job for job in jobs if not job[2].done()]
+            if jobs:
+                outcomes, callbacks = await asyncio.to_thread(self._apply, jobs)
+                for func, args in callbacks:
+                    try:
+                        func(*args)
+                    except Exception as e:
+                        logger.error(f"Ошибка колбэка после commit {func.__name__}: {e}", exc_info=True)
+                for (_, _, future), (result, error) in zip(jobs, outcomes):
+                    if future.done():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            if stop:
+                return
+
+    def _apply(
+        self, jobs: List[_Job]
+    ) -> Tuple[List[Tuple[Any, Optional[BaseException]]], List[_Callback]]:
+        """Выполнить задания в одной транзакции (в потоке писателя).
+
+        Возвращает результаты заданий и колбэки after_commit() закоммиченных транзакций.
+        """
+        db = SessionLocal()
+        try:
+            results = [func(db, *args) for func, args, _ in jobs]
+            db.commit()
+            bump_generation()
+            return [(result, None) for result in results], db.info.pop(_AFTER_COMMIT, [])
+        except Exception as e:
+            db.rollback()
+            if len(jobs) == 1:
+                return [(None, e)], []
+            logger.warning(f"Пакет записи из {len(jobs)} заданий откатан, повтор по одному: {e}")
+        finally:
+            db.close()
+        outcomes, callbacks = [], []
+        for job in jobs:
+            job_outcomes, job_callbacks = self._apply([job])
+            outcomes += job_outcomes
+            callbacks += job_callbacks
+        return outcomes, callbacks
+
+
+ingest_writer = IngestWriter()
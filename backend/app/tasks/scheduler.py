@@ -1,10 +1,22 @@
+import asyncio
 import logging
+from datetime import datetime, UTC
+from typing import Dict, Optional
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.services.collector import collect_all
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.source import Source
+from app.services.archive import compact, retention_cutoff
+from app.services.collector import seed_sources
+from app.services.jobs import collect_jobs
+from app.services.polling import poll_interval_minutes, publish_rate
+from app.services.writer import ingest_writer
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +36,29 @@ async def _job_collect():
     """Задача сбора новостей."""
     logger.info("Запуск планового сбора новостей...")
     try:
-        result = await collect_all()
-        logger.info(f"Сбор завершён: {result}")
+        job = await collect_jobs.submit("scheduler")
+        result = await job.wait()
+        logger.info(f"Сбор #{job.id} завершён: {result}")
     except Exception as e:
         logger.error(f"Ошибка планового сбора: {e}")
 
 
+async def _job_collect_source(source_id: int, source_name: str):
+    """Задача сбора одного источника (адаптивный режим).
+
+    Если сбор уже идёт, источник собирается в нём или в следующем за ним
+    запуске вместе с другими подошедшими по расписанию источниками.
+    """
+    try:
+        job = await collect_jobs.submit("scheduler", source_names={source_name})
+        result = await job.wait()
+        if result["errors"]:
+            logger.warning(f"{source_name}: {result['errors']}")
+    except Exception as e:
+        logger.error(f"Ошибка сбора {source_name}: {e}")
+    await plan_source_jobs(source_ids={source_id})
+
+
 async def _job_morning_digest():
     """Задача отправки утреннего дайджеста."""
     if _digest_sender:
@@ -42,15 +71,127 @@ async def _job_morning_digest():
         logger.warning("Функция отправки дайджеста не зарегистрирована")
 
 
+async def _job_compact():
+    """Задача переноса старых статей в архив (RETENTION_DAYS)."""
+    cutoff = retention_cutoff()
+    if cutoff is None:
+        return
+
+    loop = asyncio.get_running_loop()
+
+    def write(func, *args):
+        # Из потока переноса — в очередь единственного писателя
+        return asyncio.run_coroutine_threadsafe(ingest_writer.submit(func, *args), loop).result()
+
+    def run():
+        with SessionLocal() as db:
+            return compact(db, cutoff, write)
+
+    try:
+        moved = await asyncio.to_thread(run)
+        logger.info(f"Перенесено в архив статей: {sum(moved.values())}")
+    except Exception as e:
+        logger.error(f"Ошибка переноса в архив: {e}")
+
+
+async def plan_source_jobs(source_ids=None):
+    """Пересчитать частоту публикаций источников и их интервалы опроса.
+
+    Для каждого активного источника (или только source_ids) обновляет
+    Source.update_frequency_score (через ingest_writer) и ставит/переставляет
+    задачу collect_source:<id> с интервалом из poll_interval_minutes().
+    """
+    if source_ids is None:
+        # На новой БД источники появляются только с первым сбором, и без
+        # этого опрос по источникам ждал бы следующего пересчёта
+        await ingest_writer.submit(seed_sources)
+    async with AsyncSessionLocal() as db:
+        stmt = select(Source).where(Source.is_active == True)
+        if source_ids is not None:
+            stmt = stmt.where(Source.id.in_(source_ids))
+        sources = (await db.execute(stmt)).scalars().all()
+        rates = {source.id: await db.run_sync(publish_rate, source.id) for source in sources}
+    await ingest_writer.submit(_save_publish_rates, rates)
+
+    for source in sources:
+        rate = rates[source.id]
+        interval = poll_interval_minutes(rate)
+
+        job_id = f"collect_source:{source.id}"
+        job = scheduler.get_job(job_id)
+        if job and job.trigger.interval.total_seconds() == interval * 60:
+            continue
+        if job:
+            scheduler.reschedule_job(
+                job_id, trigger=IntervalTrigger(minutes=interval, jitter=60)
+            )
+        else:
+            scheduler.add_job(
+                _job_collect_source,
+                IntervalTrigger(minutes=interval, jitter=60),
+                args=[source.id, source.name],
+                id=job_id,
+                name=source.name,
+                replace_existing=True,
+            )
+        logger.info(
+            f"{source.name}: {rate or 0:.2f} публикаций/сутки → опрос каждые {interval} мин"
+        )
+
+
+def _save_publish_rates(db: Session, rates: Dict[int, Optional[float]]) -> None:
+    for source_id, rate in rates.items():
+        db.execute(
+            update(Source)
+            .where(Source.id == source_id)
+            .values(update_frequency_score=round(rate or 0.0, 3))
+        )
+
+
+async def get_schedule() -> list:
+    """Запланированные опросы источников (адаптивный режим)."""
+    async with AsyncSessionLocal() as db:
+        sources = {s.id: s for s in (await db.execute(select(Source))).scalars().all()}
+
+    planned = []
+    for job in scheduler.get_jobs():
+        if not job.id.startswith("collect_source:"):
+            continue
+        source = sources.get(int(job.id.split(":", 1)[1]))
+        if not source:
+            continue
+        planned.append({
+            "source_id": source.id,
+            "name": source.name,
+            "publish_rate_per_day": source.update_frequency_score or 0.0,
+            "interval_minutes": int(job.trigger.interval.total_seconds() // 60),
+            "next_run_at": job.next_run_time.isoformat() if job.next_run_time else None,
+            "last_checked": source.last_checked.isoformat() if source.last_checked else None,
+        })
+    planned.sort(key=lambda p: p["next_run_at"] or "")
+    return planned
+
+
 def start_scheduler():
     """Запустить планировщик задач."""
-    # Сбор новостей каждые N часов
-    scheduler.add_job(
-        _job_collect,
-        IntervalTrigger(hours=settings.COLLECT_INTERVAL_HOURS),
-        id="collect_news",
-        replace_existing=True,
-    )
+    if settings.ADAPTIVE_POLLING:
+        # Свой интервал для каждого источника; сразу после старта и затем
+        # раз в N часов — пересчёт интервалов и подхват новых источников
+        scheduler.add_job(
+            plan_source_jobs,
+            IntervalTrigger(hours=settings.COLLECT_INTERVAL_HOURS),
+            id="plan_sources",
+            next_run_time=datetime.now(UTC),
+            replace_existing=True,
+        )
+    else:
+        # Сбор новостей каждые N часов
+        scheduler.add_job(
+            _job_collect,
+            IntervalTrigger(hours=settings.COLLECT_INTERVAL_HOURS),
+            id="collect_news",
+            replace_existing=True,
+        )
 
     # Утренний дайджест в 07:00 UTC = 10:00 MSK
     scheduler.add_job(
@@ -60,11 +201,27 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # Перенос старых статей в архив раз в сутки, в 03:30 UTC
+    if settings.RETENTION_DAYS > 0:
+        scheduler.add_job(
+            _job_compact,
+            CronTrigger(hour=3, minute=30),
+            id="compact_archive",
+            replace_existing=True,
+        )
+
     scheduler.start()
-    logger.info(
-        f"Планировщик запущен: сбор каждые {settings.COLLECT_INTERVAL_HOURS}ч, "
-        f"дайджест в 10:00 MSK"
-    )
+    if settings.ADAPTIVE_POLLING:
+        logger.info(
+            f"Планировщик запущен: адаптивный опрос источников "
+            f"({settings.POLL_MIN_MINUTES}–{settings.POLL_MAX_MINUTES} мин), "
+            f"дайджест в 10:00 MSK"
+        )
+    else:
+        logger.info(
+            f"Планировщик запущен: сбор каждые {settings.COLLECT_INTERVAL_HOURS}ч, "
+            f"дайджест в 10:00 MSK"
+        )
 
 
 def stop_scheduler():
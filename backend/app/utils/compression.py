@@ -0,0 +1,114 @@
+"""Сжатие полных текстов статей: zstd (если установлен zstandard) или zlib.
+
+Кодек записывается рядом с данными, поэтому смена BODY_CODEC не мешает
+читать старые строки. Для zstd можно обучить словарь на уже собранных
+текстах: короткие статьи одного сайта сжимаются с ним заметно лучше.
+"""
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # необязательная зависимость
+    zstandard = None
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+
+
+def available_codecs() -> List[str]:
+    return [CODEC_ZSTD, CODEC_ZLIB] if zstandard else [CODEC_ZLIB]
+
+
+def default_codec(preferred: str = "auto") -> str:
+    """Кодек для новых записей: preferred, если он доступен, иначе лучший из доступных."""
+    if preferred in available_codecs():
+        return preferred
+    return available_codecs()[0]
+
+
+def compress(
+    text: str,
+    codec: str,
+    dict_id: Optional[int] = None,
+    dictionary: Optional[bytes] = None,
+) -> bytes:
+    """Сжать текст; словарь поддерживается только для zstd."""
+    raw = (text or "").encode()
+    if codec == CODEC_ZSTD:
+        return _zstd_compressor(dict_id, dictionary).compress(raw)
+    if codec == CODEC_ZLIB:
+        return zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"Неизвестный кодек: {codec}")
+
+
+def decompress(
+    data: bytes,
+    codec: str,
+    dict_id: Optional[int] = None,
+    dictionary: Optional[bytes] = None,
+) -> str:
+    if data is None:
+        return ""
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Текст сжат zstd, а пакет zstandard не установлен")
+        return _zstd_decompressor(dict_id, dictionary).decompress(data).decode()
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data).decode()
+    raise ValueError(f"Неизвестный кодек: {codec}")
+
+
+def train_dictionary(samples: List[str], size: int) -> bytes:
+    """Обучить zstd-словарь размером size байт на примерах текстов."""
+    if zstandard is None:
+        raise RuntimeError("Для словаря нужен пакет zstandard")
+    encoded = [sample.encode() for sample in samples if sample]
+    return zstandard.train_dictionary(size, encoded).as_bytes()
+
+
+def sql_article_body(codec: Optional[str], dict_id: Optional[int],
+                     dictionary: Optional[bytes], data: Optional[bytes]) -> str:
+    """SQL-функция article_body(codec, dict_id, dictionary, data) для FTS-представления."""
+    if not codec:
+        return ""
+    return decompress(data, codec, dict_id, dictionary)
+
+
+def register_sqlite_functions(dbapi_connection) -> None:
+    dbapi_connection.create_function("article_body", 4, sql_article_body, deterministic=True)
+
+
+# Словари неизменяемы, поэтому кэшируются по id; объекты zstd не
+# потокобезопасны — компрессоры и декомпрессоры свои у каждого потока.
+_dicts: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+_local = threading.local()
+
+
+def _zstd_dict(dict_id: Optional[int], dictionary: Optional[bytes]):
+    if dict_id is None or dictionary is None:
+        return None
+    zdict = _dicts.get(dict_id)
+    if zdict is None:
+        zdict = _dicts[dict_id] = zstandard.ZstdCompressionDict(dictionary)
+    return zdict
+
+
+def _zstd_compressor(dict_id: Optional[int], dictionary: Optional[bytes]):
+    cache = _local.__dict__.setdefault("compressors", {})
+    if dict_id not in cache:
+        cache[dict_id] = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL, dict_data=_zstd_dict(dict_id, dictionary)
+        )
+    return cache[dict_id]
+
+
+def _zstd_decompressor(dict_id: Optional[int], dictionary: Optional[bytes]):
+    cache = _local.__dict__.setdefault("decompressors", {})
+    if dict_id not in cache:
+        cache[dict_id] = zstandard.ZstdDecompressor(dict_data=_zstd_dict(dict_id, dictionary))
+    return cache[dict_id]
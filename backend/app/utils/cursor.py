@@ -0,0 +1,62 @@
+"""Непрозрачные курсоры: keyset-пагинация по (published_at, id) и выгрузка по id."""
+import base64
+from datetime import datetime, timedelta
+from typing import Tuple
+
+from sqlalchemy import tuple_
+
+from app.models.article import Article
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def encode_cursor(published_at: datetime, article_id: int) -> str:
+    """Курсор на позицию статьи: base64url от «микросекунды:id»."""
+    if published_at.tzinfo is not None:
+        published_at = published_at.replace(tzinfo=None)
+    micros = (published_at - _EPOCH) // timedelta(microseconds=1)
+    raw = f"{micros}:{article_id}".encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Разобрать курсор; ValueError, если он повреждён."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        micros, article_id = raw.split(":")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(article_id)
+    except Exception as e:
+        raise ValueError(f"Некорректный курсор: {cursor!r}") from e
+
+
+def article_cursor(article) -> str:
+    return encode_cursor(article.published_at, article.id)
+
+
+def older_than(cursor: str):
+    """Условие «после курсора» при сортировке published_at DESC, id DESC."""
+    published_at, article_id = decode_cursor(cursor)
+    return tuple_(Article.published_at, Article.id) < tuple_(published_at, article_id)
+
+
+def newer_than(cursor: str):
+    """Условие «до курсора» (для перехода на предыдущую страницу)."""
+    published_at, article_id = decode_cursor(cursor)
+    return tuple_(Article.published_at, Article.id) > tuple_(published_at, article_id)
+
+
+def encode_id_cursor(article_id: int) -> str:
+    """Курсор выгрузки: «всё с id не больше article_id уже получено»."""
+    return base64.urlsafe_b64encode(f"id:{article_id}".encode()).rstrip(b"=").decode()
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Разобрать курсор выгрузки; ValueError, если он повреждён."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, article_id = raw.split(":")
+        if prefix != "id":
+            raise ValueError(prefix)
+        return int(article_id)
+    except Exception as e:
+        raise ValueError(f"Некорректный курсор: {cursor!r}") from e
@@ -0,0 +1,9 @@
+"""Даты в том виде, в каком их хранит SQLite."""
+from datetime import datetime, UTC
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Naive UTC, как datetime лежит в БД; aware-значение переводится в UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
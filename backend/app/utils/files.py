@@ -0,0 +1,13 @@
+"""Запись файлов, которые в это время могут читать другие процессы."""
+import os
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Записать через временный файл и rename: читатель видит старый файл или новый целиком."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
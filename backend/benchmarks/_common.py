@@ -0,0 +1,100 @@
+"""
+Общая часть бенчмарков: путь к backend, временный DATA_DIR и наполнение БД.
+
+Импортируется первым, до app.*: настройки читают DATA_DIR при импорте.
+Каждый запуск получает новый каталог /tmp/<имя скрипта>_*.
+"""
+import itertools
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix=f"{Path(sys.argv[0]).stem}_")
+
+from app.database import engine, SessionLocal  # noqa: E402
+from app.models.source import Source  # noqa: E402
+from app.services.search import FTS_TABLE  # noqa: E402
+from app.utils.compression import compress, default_codec  # noqa: E402
+
+
+def populate(
+    count: int,
+    article: Callable[[int], Dict],
+    sources: int = 10,
+    bodies: bool = True,
+    index: bool = False,
+    chunk: int = 10_000,
+) -> None:
+    """Заполнить БД в обход ORM: sources источников bench-<n> и count статей.
+
+    article(i) — колонки статьи i (1..count), id подставляется сам, source_id
+    по умолчанию i % sources + 1. content при bodies=True пишется сжатым в
+    article_bodies, иначе — в колонку articles.content (схема до миграции);
+    index=True добавляет статьи в полнотекстовый индекс. Пакеты по chunk
+    статей, в конце пересчитывается Source.articles_count.
+    """
+    if sources:
+        with SessionLocal() as db:
+            db.add_all(Source(name=f"bench-{n}", url=f"https://example.com/{n}") for n in range(sources))
+            db.commit()
+
+    codec = default_codec()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for first in range(1, count + 1, chunk):
+            rows = []
+            for i in range(first, min(count, first + chunk - 1) + 1):
+                row = {"id": i, **article(i)}
+                if sources:
+                    row.setdefault("source_id", i % sources + 1)
+                rows.append(row)
+            if index:
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, summary, content) "
+                    "VALUES (:id, :title, :summary, :content)", rows,
+                )
+            if bodies and "content" in rows[0]:
+                packed = []
+                for row in rows:
+                    content = row.pop("content")
+                    packed.append((row["id"], codec, len(content), compress(content, codec)))
+                cursor.executemany(
+                    "INSERT INTO article_bodies (article_id, codec, raw_size, data) VALUES (?, ?, ?, ?)",
+                    packed,
+                )
+            columns = list(rows[0])
+            cursor.executemany(
+                f"INSERT INTO articles ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + column for column in columns)})", rows,
+            )
+            raw.commit()
+        cursor.execute(
+            "UPDATE sources SET articles_count = "
+            "(SELECT count(*) FROM articles WHERE articles.source_id = sources.id)"
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def story(i: int, published_at: datetime, **columns) -> Dict:
+    """Обычная статья ленты для populate(): короткий заголовок, аннотация ~600 символов."""
+    return {
+        "title": f"Story {i} about models and agents",
+        "url": f"https://example.com/a/{i}",
+        "summary": "Summary sentence of the story. " * 20,
+        "author": "Author Name",
+        "published_at": published_at.isoformat(" "),
+        **columns,
+    }
+
+
+def zipf_weights(size: int) -> List[float]:
+    """Накопленные веса Ципфа (вес слова ~ 1/ранг) для rng.choices(cum_weights=...)."""
+    return list(itertools.accumulate(1 / (rank + 1) for rank in range(size)))
@@ -0,0 +1,119 @@
+"""
+Бенчмарк задержки API во время сбора: p50/p99 GET /api/articles/latest
+без нагрузки и пока в том же event loop идёт collect_all() с записью в БД.
+Сеть подменена httpx.MockTransport, фиды синтетические (каждый прогон — новые статьи).
+Запуск: python benchmarks/bench_api_latency.py [--seconds 5] [--clients 8] [--feeds 8]
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_api_")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.api.routes import api_router  # noqa: E402
+from app.database import init_db  # noqa: E402
+from app.services import collector  # noqa: E402
+from app.services.http_client import HTTPClient  # noqa: E402
+from app.services.parsers.rss_parser import RSSParser  # noqa: E402
+
+_generation = itertools.count()
+
+
+def make_feed(feed_no: int, items: int) -> bytes:
+    run = next(_generation)
+    entries = "".join(
+        f"<item><title>Run {run} feed {feed_no} story {i} about agents</title>"
+        f"<link>https://example.com/{run}/{feed_no}/{i}</link>"
+        f"<description>{'Summary text of the story. ' * 20}</description>"
+        f"<pubDate>Mon, 01 Jun 2026 10:{i % 60:02d}:00 GMT</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{entries}</channel></rss>'.encode()
+
+
+def install_fake_sources(feeds: int, items: int) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=make_feed(int(request.url.path.strip("/")), items))
+
+    def parser_cls(feed_no: int):
+        class FakeParser(RSSParser):
+            def __init__(self):
+                super().__init__(f"bench-{feed_no}", "https://bench", f"https://bench/{feed_no}")
+        return FakeParser
+
+    collector.PARSERS = [parser_cls(i) for i in range(feeds)]
+    collector.HTTPClient = lambda: HTTPClient(transport=httpx.MockTransport(handler))
+
+
+async def measure(client: httpx.AsyncClient, seconds: float, clients: int) -> list:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get("/api/articles/latest", params={"limit": 20})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return latencies
+
+
+def report(label: str, latencies: list, seconds: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(
+        f"{label:>18}: {len(ordered) / seconds:,.0f} req/s, "
+        f"p50 {statistics.median(ordered) * 1000:.1f} мс, p99 {p99 * 1000:.1f} мс, "
+        f"max {ordered[-1] * 1000:.1f} мс"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--feeds", type=int, default=8)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    install_fake_sources(args.feeds, args.items)
+    await collector.collect_all()
+
+    app = FastAPI()
+    app.include_router(api_router)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        report("без сбора", await measure(client, args.seconds, args.clients), args.seconds)
+
+        stop = asyncio.Event()
+        runs = 0
+
+        async def collect_loop():
+            nonlocal runs
+            while not stop.is_set():
+                await collector.collect_all()
+                runs += 1
+
+        collecting = asyncio.create_task(collect_loop())
+        latencies = await measure(client, args.seconds, args.clients)
+        stop.set()
+        await collecting
+        report("во время сбора", latencies, args.seconds)
+        print(f"{'':>18}  прогонов сбора: {runs}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Бенчмарк хранения с архивом: размер БД, задержка списков и поиска по
+горячей таблице до и после переноса старых статей в помесячный архив
+(app.services.archive), размер архива и скорость его чтения и поиска.
+Статьи синтетические, равномерно за --months месяцев; в БД остаются
+последние --keep-days дней.
+Запуск: python benchmarks/bench_archive.py [--articles 100000] [--months 24] [--keep-days 90]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+from _common import populate, zipf_weights  # первым: задаёт DATA_DIR до импорта app
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine, init_db, SessionLocal
+from app.models.article import Article
+from app.services import archive
+from app.services.read_model import article_rows
+from app.services.search import optimize_index, search_articles
+
+SOURCES = 10
+CHUNK = 10_000
+# Редкое слово встречается в каждой 500-й статье, частое — в каждой
+RARE_WORD = "regulation"
+COMMON_WORD = "model"
+
+
+def load(count: int, months: int, rng: random.Random) -> None:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = list({
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(30_000)
+    } - {RARE_WORD, COMMON_WORD})
+    cum_weights = zipf_weights(len(vocabulary))
+    now = datetime.now(UTC).replace(tzinfo=None)
+    step = timedelta(days=30 * months) / count
+
+    def article(article_id: int) -> dict:
+        title = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=8))
+        summary = f"{COMMON_WORD} " + " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=30))
+        content = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=150))
+        if article_id % 500 == 0:
+            content += f" {RARE_WORD}"
+        return {
+            "title": title,
+            "url": f"https://example.com/a/{article_id}",
+            "summary": summary,
+            "content": content,
+            "published_at": (now - step * (count - article_id + 1)).isoformat(" "),
+        }
+
+    populate(count, article, sources=SOURCES, index=True, chunk=CHUNK)
+    with SessionLocal() as db:
+        optimize_index(db)
+
+
+def vacuum_size() -> float:
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        conn.execute(text("VACUUM"))
+    return Path(engine.url.database).stat().st_size / 1024 / 1024
+
+
+def timed(func, repeat: int) -> str:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p99 = timings[max(0, int(len(timings) * 0.99) - 1)]
+    return f"p50 {statistics.median(timings) * 1000:7.2f} мс, p99 {p99 * 1000:7.2f} мс"
+
+
+def report_hot(label: str, repeat: int) -> None:
+    print(f"--- {label}: БД {vacuum_size():.1f} МБ")
+    with SessionLocal() as db:
+        source_page = (
+            article_rows().where(Article.source_id == 3)
+            .order_by(Article.published_at.desc(), Article.id.desc()).limit(20)
+        )
+        print(f"{'список источника':>24}: {timed(lambda: db.execute(source_page).all(), repeat)}")
+        for query in (RARE_WORD, COMMON_WORD):
+            print(f"{'поиск ' + query:>24}: {timed(lambda: search_articles(db, query), repeat)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--keep-days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    load(args.articles, args.months, random.Random(1))
+    report_hot(f"до переноса, статей {args.articles:,}", args.repeat)
+
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        moved = archive.compact(db, archive.retention_cutoff(args.keep_days))
+        elapsed = time.perf_counter() - started
+    total = sum(moved.values())
+    print(f"--- перенос: {total:,} статей за {elapsed:.1f}с ({total / elapsed:,.0f} статей/с)")
+    report_hot("после переноса", args.repeat)
+
+    files = list(settings.ARCHIVE_DIR.glob("*.jsonl.gz"))
+    blooms = list(settings.ARCHIVE_DIR.glob("*.bloom"))
+    print(
+        f"--- архив: {len(files)} месяцев, данные {sum(f.stat().st_size for f in files) / 1024 / 1024:.1f} МБ, "
+        f"фильтры Блума {sum(f.stat().st_size for f in blooms) / 1024 / 1024:.1f} МБ"
+    )
+    month = archive.list_months()[len(files) // 2]["month"]
+    started = time.perf_counter()
+    scanned = sum(1 for _ in archive.iter_month(month))
+    elapsed = time.perf_counter() - started
+    print(f"{'чтение месяца':>24}: {scanned:,} статей за {elapsed * 1000:.0f} мс "
+          f"({scanned / elapsed:,.0f} статей/с)")
+    print(f"{'страница месяца':>24}: {timed(lambda: archive.month_articles(month, limit=20), 5)}")
+    for query in (RARE_WORD, "zzzzzz", f"{COMMON_WORD} {RARE_WORD}"):
+        print(f"{'архив: ' + query:>24}: {timed(lambda: archive.search_archive(query, limit=20), 3)}, "
+              f"найдено {len(archive.search_archive(query, limit=20))}")
+
+
+if __name__ == "__main__":
+    main()
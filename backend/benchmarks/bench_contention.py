@@ -0,0 +1,160 @@
+"""
+Бенчмарк конкуренции чтения и записи в SQLite: читатели в отдельных
+процессах (как export_news.py рядом с сервером) против непрерывной записи
+через ingest_writer.
+Каждый режим журнала запускается в отдельном процессе с чистой БД;
+выводятся задержки чтения, число ошибок "database is locked" и скорость записи.
+Запуск: python benchmarks/bench_contention.py [--seconds 5] [--readers 4] [--modes DELETE,WAL]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import multiprocessing
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_batch(run: int, count: int) -> list:
+    now = datetime.now(UTC)
+    return [
+        {
+            "title": f"Run {run} article {i} on model {run * count + i}",
+            "url": f"https://example.com/{run}/{i}",
+            "summary": f"Story {run}-{i}: " + "lorem ipsum dolor sit amet " * 8,
+            "content": "lorem ipsum dolor sit amet " * 80,
+            "author": "Bench",
+            "published_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def configure(mode: str, data_dir: str, busy_ms: int) -> None:
+    os.environ["DATA_DIR"] = data_dir
+    os.environ["SQLITE_JOURNAL_MODE"] = mode
+    os.environ["SQLITE_BUSY_TIMEOUT_MS"] = str(busy_ms)
+
+
+def reader(mode: str, data_dir: str, busy_ms: int, stop, results) -> None:
+    """Читать последние 200 статей с текстом, как экспорт, пока не попросят остановиться."""
+    configure(mode, data_dir, busy_ms)
+    from sqlalchemy import select
+    from sqlalchemy.exc import OperationalError
+
+    from app.database import SessionLocal
+    from app.models.article import Article
+    from app.models.source import Source  # noqa: F401
+
+    latencies = []
+    locked = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    select(Article.id, Article.title, Article.summary, Article.published_at)
+                    .order_by(Article.published_at.desc(), Article.id.desc())
+                    .limit(200)
+                ).all()
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    results.put((latencies, locked))
+
+
+def child(args) -> None:
+    data_dir = tempfile.mkdtemp(prefix="bench_contention_")
+    configure(args.child, data_dir, args.busy_ms)
+
+    from app.database import init_db, SessionLocal
+    from app.models.source import Source
+    from app.services.collector import _save_articles
+    from app.services.writer import ingest_writer
+
+    init_db()
+    with SessionLocal() as db:
+        source = Source(name="bench", url="https://example.com")
+        db.add(source)
+        db.commit()
+        source_id = source.id
+
+    async def write(seconds: float) -> int:
+        written = 0
+        run = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            batches = [make_batch(run + i, args.batch) for i in range(4)]
+            run += len(batches)
+            results = await asyncio.gather(*(
+                ingest_writer.submit(_save_articles, source_id, batch) for batch in batches
+            ))
+            written += sum(new for new, _ in results)
+        await ingest_writer.close()
+        return written
+
+    ctx = multiprocessing.get_context("spawn")
+    stop = ctx.Event()
+    results = ctx.Queue()
+    readers = [
+        ctx.Process(target=reader, args=(args.child, data_dir, args.busy_ms, stop, results))
+        for _ in range(args.readers)
+    ]
+    for process in readers:
+        process.start()
+    written = asyncio.run(write(args.seconds))
+    stop.set()
+
+    latencies = []
+    locked = 0
+    for _ in readers:
+        part, part_locked = results.get()
+        latencies.extend(part)
+        locked += part_locked
+    for process in readers:
+        process.join()
+
+    ordered = sorted(latencies) or [0.0]
+    p99 = ordered[max(0, int(len(ordered) * 0.99) - 1)]
+    print(
+        f"{args.child:>8}: чтений {len(latencies) / args.seconds:,.0f}/с, "
+        f"p50 {statistics.median(ordered) * 1000:.1f} мс, p99 {p99 * 1000:.1f} мс, "
+        f"max {ordered[-1] * 1000:.1f} мс, locked {locked}; "
+        f"записано {written / args.seconds:,.0f} статей/с"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=25)
+    parser.add_argument("--busy-ms", type=int, default=1000)
+    parser.add_argument("--modes", default="DELETE,WAL")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    for mode in args.modes.split(","):
+        subprocess.run(
+            [sys.executable, __file__, "--child", mode.strip().upper(),
+             "--seconds", str(args.seconds), "--readers", str(args.readers),
+             "--batch", str(args.batch), "--busy-ms", str(args.busy_ms)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
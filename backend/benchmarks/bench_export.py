@@ -0,0 +1,119 @@
+"""
+Бенчмарк полной выгрузки статей: постраничный обход /api/articles по 100
+строк (по next_cursor) против одного потокового ответа /api/articles/export
+в NDJSON — без сжатия и с gzip. Выводятся время, строк в секунду, объём
+ответа и пик памяти процесса за выгрузку (tracemalloc, отдельным прогоном);
+для выгрузки — ещё и на десятой части статей (по курсору since), чтобы было
+видно, что память от объёма не зависит.
+Запуск: python benchmarks/bench_export.py [--articles 100000]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from _common import populate, story  # первым: задаёт DATA_DIR до импорта app
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.routes import api_router
+from app.database import init_db
+from app.utils.cursor import encode_id_cursor
+
+SOURCES = 20
+
+
+def article(i: int) -> dict:
+    return story(
+        i, datetime(2024, 1, 1) + timedelta(minutes=i),
+        summary=f"Summary sentence {i} of the story. " * 8,
+    )
+
+
+async def paginate(client: httpx.AsyncClient):
+    rows, size, cursor = 0, 0, None
+    while True:
+        params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/articles", params=params)
+        size += len(response.content)
+        page = response.json()
+        rows += page["count"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return rows, size
+
+
+async def export(app, encoding: str, since=None):
+    """Выгрузка прямым ASGI-вызовом: тело читается кусками по мере отправки
+    (ASGITransport httpx копил бы весь ответ в памяти)."""
+    counter = {"rows": 0, "size": 0}
+    decompressor = zlib.decompressobj(31)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/articles/export",
+        "raw_path": b"/api/articles/export",
+        "query_string": urlencode({"since": since} if since else {}).encode(),
+        "root_path": "", "headers": [(b"host", b"bench"), (b"accept-encoding", encoding.encode())],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    async def receive():
+        await asyncio.Event().wait()  # клиент не отключается
+
+    async def send(message):
+        body = message.get("body", b"")
+        counter["size"] += len(body)
+        if encoding == "gzip":
+            body = decompressor.decompress(body)
+        counter["rows"] += body.count(b"\n")
+
+    await app(scope, receive, send)
+    return counter["rows"] - 1, counter["size"]
+
+
+async def measure(label: str, run, since=None, small_since=None) -> None:
+    started = time.perf_counter()
+    rows, size = await run(since)
+    elapsed = time.perf_counter() - started
+
+    peaks = []
+    for cursor in (since, small_since) if small_since else (since,):
+        tracemalloc.start()
+        await run(cursor)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    memory = " / ".join(f"{peak / 1024 / 1024:.1f}" for peak in peaks)
+    print(
+        f"{label:>16}: {elapsed:6.2f} с, {rows / elapsed:9,.0f} строк/с, "
+        f"{size / 1024 / 1024:7.1f} МБ, пик памяти {memory} МБ"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=100_000)
+    args = parser.parse_args()
+
+    init_db()
+    populate(args.articles, article, sources=SOURCES)
+    app = FastAPI()
+    app.include_router(api_router)
+    tenth = encode_id_cursor(args.articles - args.articles // 10)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for encoding in ("identity", "gzip"):
+            rows, _ = await export(app, encoding)
+            assert rows == args.articles, (encoding, rows)
+        print(f"статей: {args.articles:,}; пик памяти выгрузки — всех статей / десятой части")
+        await measure("страницы по 100", lambda _: paginate(client))
+        await measure("export", lambda since: export(app, "identity", since), small_since=tenth)
+        await measure("export + gzip", lambda since: export(app, "gzip", since), small_since=tenth)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Бенчмарк пакетной записи статей: построчный SELECT + add() против _save_articles.
+Оба пути делают одну и ту же работу на статью (проверка URL, строка статьи,
+счётчик источника, сжатый текст, полнотекстовый индекс, сюжеты) и коммитят
+пакетами по COLLECT_BATCH_SIZE, как коллектор; заголовки и аннотации из
+случайных слов, поэтому статьи не сливаются в один сюжет.
+Запуск: python benchmarks/bench_ingest.py [--items 10000] [--existing 0.5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_ingest_")
+
+from sqlalchemy import func  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import init_db, SessionLocal  # noqa: E402
+from app.models.article import Article  # noqa: E402
+from app.models.source import Source  # noqa: E402
+from app.services.bodies import save_bodies  # noqa: E402
+from app.services.collector import _hash, _save_articles  # noqa: E402
+from app.services.counters import adjust_source_count  # noqa: E402
+from app.services.dedup import assign_clusters, story_text  # noqa: E402
+from app.services.search import index_articles  # noqa: E402
+
+WORDS = [f"w{i:04d}" for i in range(5000)]
+
+
+def make_batch(prefix: str, count: int, rng: random.Random) -> list:
+    now = datetime.now(UTC)
+
+    def words(k: int) -> str:
+        return " ".join(rng.choices(WORDS, k=k))
+
+    return [
+        {
+            "title": words(10),
+            "url": f"https://example.com/{prefix}/{i}",
+            "summary": words(40),
+            "content": words(400),
+            "author": "Bench",
+            "published_at": now - timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def in_batches(save):
+    """Пакеты по COLLECT_BATCH_SIZE, commit после каждого (как ingest_writer)."""
+    def run(db, source, articles) -> int:
+        new_count = 0
+        for i in range(0, len(articles), settings.COLLECT_BATCH_SIZE):
+            new_count += save(db, source, articles[i:i + settings.COLLECT_BATCH_SIZE])
+            db.commit()
+        return new_count
+    return run
+
+
+@in_batches
+def save_bulk(db, source, articles) -> int:
+    """Текущий путь: _save_articles."""
+    return _save_articles(db, source.id, articles)[0]
+
+
+@in_batches
+def save_row_by_row(db, source, articles) -> int:
+    """Прежний путь: SELECT на каждый URL, add() и та же обработка по одной строке."""
+    new_count = 0
+    for data in articles:
+        url = data["url"]
+        if db.query(Article).filter(Article.url == url).first():
+            continue
+        article = Article(
+            source_id=source.id,
+            title=data["title"],
+            url=url,
+            summary=data["summary"],
+            author=data["author"],
+            published_at=data["published_at"],
+            content_hash=_hash(data["content"]),
+        )
+        db.add(article)
+        db.flush()
+        adjust_source_count(db, source.id, 1)
+        save_bodies(db, [(article.id, data["content"])])
+        index_articles(db, [(article.id, data["title"], data["summary"], data["content"])])
+        assign_clusters(db, [(article.id, story_text(data["title"], data["summary"]))])
+        new_count += 1
+    return new_count
+
+
+def run(label, save, items, existing_ratio):
+    db = SessionLocal()
+    try:
+        source = Source(name=f"bench-{label}", url="https://example.com")
+        db.add(source)
+        db.commit()
+
+        batch = make_batch(label, items, random.Random(1))
+        seeded = int(items * existing_ratio)
+        if seeded:
+            save(db, source, batch[:seeded])
+
+        started = time.perf_counter()
+        new_count = save(db, source, batch)
+        elapsed = time.perf_counter() - started
+        stories = db.query(func.count(func.distinct(Article.cluster_id))).filter(
+            Article.source_id == source.id
+        ).scalar()
+        print(
+            f"{label:>12}: {items} статей, новых {new_count}, сюжетов {stories}, "
+            f"{elapsed:.3f}с, {items / elapsed:,.0f} статей/с"
+        )
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--existing", type=float, default=0.5)
+    args = parser.parse_args()
+
+    init_db()
+    run("row-by-row", save_row_by_row, args.items, args.existing)
+    run("bulk", save_bulk, args.items, args.existing)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк разбора фидов: inline / thread / process (PARSE_MODE).
+Синтетический корпус крупных RSS с content:encoded разбирается параллельно,
+как при сборе; параллельно меряется задержка event loop'а (насколько разбор
+«подвешивает» API и бота в том же процессе).
+Запуск: python benchmarks/bench_parse.py [--feeds 16] [--items 200] [--body-kb 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.services.parse_pool import PARSE_MODES, run_parse, shutdown_pool  # noqa: E402
+from app.services.parsers.feed_parsing import parse_feed  # noqa: E402
+
+
+def make_feed(feed_no: int, items: int, body_kb: int) -> bytes:
+    paragraph = "<p>Large language models   keep\n getting <b>bigger</b> and cheaper. </p>"
+    body = paragraph * max(1, body_kb * 1024 // len(paragraph))
+    entries = "".join(
+        f"<item><title>Feed {feed_no} item {i}</title>"
+        f"<link>https://example.com/{feed_no}/{i}</link>"
+        f"<description>Summary of item {i} in   feed {feed_no}</description>"
+        f"<pubDate>Mon, 01 Jun 2026 {i % 24:02d}:00:00 GMT</pubDate>"
+        f"<content:encoded><![CDATA[{body}]]></content:encoded></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        f"<channel><title>Feed {feed_no}</title>{entries}</channel></rss>"
+    ).encode()
+
+
+async def measure(mode: str, corpus: list) -> tuple:
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - started - 0.005)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_parse(parse_feed, body, mode=mode) for body in corpus))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    return elapsed, max_lag, sum(len(r) for r in results)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feeds", type=int, default=16)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--body-kb", type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = [make_feed(i, args.items, args.body_kb) for i in range(args.feeds)]
+    size_mb = sum(len(b) for b in corpus) / 1024 / 1024
+    workers = settings.PARSE_WORKERS or os.cpu_count()
+    print(f"Корпус: {args.feeds} фидов × {args.items} статей, {size_mb:.1f} МБ; процессов: {workers}")
+
+    # Прогрев пула процессов, чтобы не мерить их запуск
+    await run_parse(parse_feed, corpus[0], mode="process")
+    try:
+        for mode in PARSE_MODES:
+            elapsed, lag, records = await measure(mode, corpus)
+            print(
+                f"{mode:>8}: {elapsed:.2f}с, {records / elapsed:,.0f} записей/с, "
+                f"макс. задержка event loop {lag * 1000:.0f} мс"
+            )
+    finally:
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+"""
+Бенчмарк ограничителя частоты: прежний RateLimitMiddleware (BaseHTTPMiddleware,
+список отметок времени на IP) против app.api.ratelimit (чистый ASGI, корзины
+токенов). Запросы подаются прямо в ASGI-приложение без сети; эндпоинт пустой,
+так что видна цена самого middleware. Число запросов в сценариях выбрано так,
+чтобы ни один не упёрся в лимит: один активный клиент с лимитом 1000/мин
+(длинный список отметок у прежней версии), много клиентов по 50 запросов при
+обычном лимите 60/мин, отказы 429; затем память после прохода уникальных IP.
+Запуск: python benchmarks/bench_ratelimit.py [--clients 2000] [--unique 100000]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="bench_ratelimit_")
+
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+
+from app.api.ratelimit import RateLimitMiddleware, RatePolicy, RateRule  # noqa: E402
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """Прежняя версия из main.py (до app.api.ratelimit), без изменений."""
+
+    def __init__(self, app, max_requests: int = 60, window_seconds: int = 60):
+        super().__init__(app)
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._requests: dict[str, list[float]] = {}
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        client_ip = request.client.host if request.client else "unknown"
+        now = time.time()
+
+        if request.url.path == "/api/collect" and request.method == "POST":
+            max_req = 2
+            window = 3600
+        else:
+            max_req = self.max_requests
+            window = self.window_seconds
+
+        key = f"{client_ip}:{request.url.path}" if max_req != self.max_requests else client_ip
+
+        if key not in self._requests:
+            self._requests[key] = []
+
+        self._requests[key] = [t for t in self._requests[key] if now - t < window]
+
+        if len(self._requests[key]) >= max_req:
+            return Response(
+                content='{"error": "Too many requests"}',
+                status_code=429,
+                media_type="application/json",
+            )
+
+        self._requests[key].append(now)
+        return await call_next(request)
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def build(kind: str, requests: int, window: float):
+    if kind == "legacy":
+        return LegacyRateLimitMiddleware(endpoint, max_requests=requests, window_seconds=window)
+    return RateLimitMiddleware(
+        endpoint,
+        default=RatePolicy(requests, window),
+        rules=(RateRule("POST", "/api/collect", RatePolicy(2, 3600)),),
+    )
+
+
+async def call(app, client_ip: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/api/articles/latest", "raw_path": b"/api/articles/latest",
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+        "client": (client_ip, 50000), "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def throughput(app, ips: list, total: int) -> tuple:
+    limited = 0
+    started = time.perf_counter()
+    for i in range(total):
+        limited += await call(app, ips[i % len(ips)]) == 429
+    return total / (time.perf_counter() - started), limited / total
+
+
+async def memory(kind: str, unique: int) -> tuple:
+    app = build(kind, 60, 60)
+    gc.collect()
+    tracemalloc.start()
+    for i in range(unique):
+        await call(app, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    if kind == "legacy":
+        return size, len(app._requests), len(app._requests)
+    # Клиенты ушли: через окно следующий запрос вычищает простаивающие корзины
+    app.acquire("192.0.2.1", app.default, time.monotonic() + app.default.window + 1)
+    return size, unique, len(app)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--unique", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rps, _ = await throughput(endpoint, ["127.0.0.1"], 100_000)
+    print(f"{'без ограничителя':>48}: {rps:9,.0f} req/s")
+
+    one = ["127.0.0.1"]
+    many = [f"10.0.{i >> 8 & 255}.{i & 255}" for i in range(args.clients)]
+    for label, requests, ips, total in (
+        ("1 клиент, 1000 запросов, лимит 1000/мин", 1000, one, 1000),
+        (f"{args.clients} клиентов по 50, лимит 60/мин", 60, many, args.clients * 50),
+        ("1 клиент сверх лимита 60/мин", 60, one, 20_000),
+    ):
+        for kind in ("legacy", "bucket"):
+            rps, limited = await throughput(build(kind, requests, 60), ips, total)
+            print(f"{label + ', ' + kind:>48}: {rps:9,.0f} req/s, отказов 429: {limited:.0%}")
+
+    for kind in ("legacy", "bucket"):
+        size, keys, kept = await memory(kind, args.unique)
+        print(
+            f"{f'{args.unique} уникальных IP, {kind}':>48}: {size / 1024 / 1024:6.1f} МБ, "
+            f"ключей {keys:,}, после простоя окна {kept:,}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Бенчмарк чтения списков статей: ORM (select(Article) + joinedload(source)
+и сборка словаря из объектов) против модели чтения (Core-запрос только
+нужных колонок, app.services.read_model). Для страниц разного размера
+выводятся строк в секунду и пик памяти на один запрос (tracemalloc).
+Запуск: python benchmarks/bench_read_model.py [--articles 20000] [--repeat 200]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from _common import populate, story  # первым: задаёт DATA_DIR до импорта app
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.database import init_db, SessionLocal
+from app.models.article import Article
+from app.services.read_model import article_dict, article_rows
+
+SOURCES = 20
+PAGE_SIZES = (20, 100, 200)
+
+
+def article(i: int, rng: random.Random) -> dict:
+    """Статья со всеми колонками, которые читает ORM-путь."""
+    published_at = datetime(2024, 1, 1) + timedelta(minutes=i)
+    return story(
+        i, published_at,
+        summary="Summary sentence of the story. " * 25,
+        fetched_at=(published_at + timedelta(seconds=30)).isoformat(" "),
+        tags='["ai", "agents"]', image_url=f"https://example.com/img/{i}.png", word_count=600,
+        content_hash=f"{i:064x}", minhash=rng.randbytes(256), cluster_id=None,
+    )
+
+
+def orm_page(limit: int) -> list:
+    """Прежний путь: ORM-объекты Article и Source, из них — словари ответа."""
+    with SessionLocal() as db:
+        articles = db.execute(
+            select(Article)
+            .options(joinedload(Article.source))
+            .order_by(Article.published_at.desc(), Article.id.desc())
+            .limit(limit)
+        ).scalars().all()
+        return [
+            {
+                "id": a.id,
+                "title": a.title,
+                "url": a.url,
+                "summary": (a.summary or "")[:300],
+                "author": a.author,
+                "source": a.source.name if a.source else None,
+                "published_at": a.published_at.isoformat() if a.published_at else None,
+            }
+            for a in articles
+        ]
+
+
+def projection_page(limit: int) -> list:
+    with SessionLocal() as db:
+        rows = db.execute(
+            article_rows().order_by(Article.published_at.desc(), Article.id.desc()).limit(limit)
+        )
+        return [article_dict(row) for row in rows]
+
+
+def measure(label: str, page, limit: int, repeat: int) -> None:
+    page(limit)  # прогрев: компиляция запроса, кэш страниц SQLite
+    started = time.perf_counter()
+    for _ in range(repeat):
+        page(limit)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    page(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:>12} x{limit:<4}: {limit * repeat / elapsed:10,.0f} строк/с, "
+        f"{elapsed / repeat * 1000:6.2f} мс/запрос, пик памяти {peak / 1024:7.1f} КБ"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    init_db()
+    rng = random.Random(1)
+    populate(args.articles, lambda i: article(i, rng), sources=SOURCES)
+    assert orm_page(50) == projection_page(50)
+
+    for limit in PAGE_SIZES:
+        measure("ORM", orm_page, limit, args.repeat)
+        measure("read model", projection_page, limit, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Бенчмарк кэша ответов (app.api.cache): запросов в секунду и задержка
+горячих эндпоинтов без кэша, с кэшем (200 из готовых байтов) и при
+ревалидации по ETag (304 без тела). Запросы идут через ASGI в одном
+процессе, как от дашборда с несколькими клиентами.
+Запуск: python benchmarks/bench_response_cache.py [--articles 20000] [--seconds 3] [--clients 8]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, UTC
+
+from _common import populate, story  # первым: задаёт DATA_DIR до импорта app
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.cache import response_cache
+from app.api.routes import api_router
+from app.database import init_db
+
+SOURCES = 20
+ENDPOINTS = (
+    ("/api/articles/latest", {"limit": 50}),
+    ("/api/articles/top", {"hours": 168, "limit": 50}),
+    ("/api/sources", {}),
+)
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, seconds: float,
+                  clients: int, revalidate: bool) -> tuple:
+    latencies = []
+    etag = (await client.get(path, params=params)).headers["etag"]
+    headers = {"If-None-Match": etag} if revalidate else {}
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            assert response.status_code == (304 if revalidate else 200)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    latencies.sort()
+    return len(latencies) / seconds, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--clients", type=int, default=8)
+    args = parser.parse_args()
+
+    init_db()
+    now = datetime.now(UTC).replace(tzinfo=None)
+    populate(args.articles, lambda i: story(i, now - timedelta(minutes=args.articles - i)), sources=SOURCES)
+
+    app = FastAPI()
+    app.include_router(api_router)
+    transport = httpx.ASGITransport(app=app)
+    ttl = response_cache.ttl
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path, params in ENDPOINTS:
+            for label, cache_ttl, revalidate in (
+                ("без кэша", -1, False),  # каждая запись сразу устаревшая
+                ("кэш, 200", ttl, False),
+                ("кэш, 304", ttl, True),
+            ):
+                response_cache.ttl = cache_ttl
+                rps, p50, p99 = await measure(
+                    client, path, params, args.seconds, args.clients, revalidate
+                )
+                print(
+                    f"{path:>22} {label:>9}: {rps:8,.0f} req/s, "
+                    f"p50 {p50 * 1000:6.2f} мс, p99 {p99 * 1000:6.2f} мс"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Бенчмарк HTML-скрейпера: страниц в секунду для списка и страницы статьи
+(lxml + скомпилированные CSS-селекторы) против BeautifulSoup на тех же страницах.
+Запуск: python benchmarks/bench_scrape.py [--cards 100] [--pages 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.parsers.deepmind import DEEPMIND_CONFIG  # noqa: E402
+from app.services.parsers.html_scraper import CompiledConfig, parse_detail, parse_list  # noqa: E402
+
+BASE_URL = DEEPMIND_CONFIG["list_url"]
+
+
+def make_list_page(cards: int) -> bytes:
+    items = "".join(
+        f'<div class="card"><a href="/discover/blog/post-{i}/"><img src="/i/{i}.png"></a>'
+        f'<a href="/discover/blog/post-{i}/"><h3>Post number {i}</h3>'
+        f'<p>Short teaser for post {i}</p><time datetime="2026-06-01T10:00:00Z">Jun 1</time></a></div>'
+        for i in range(cards)
+    )
+    nav = "".join(f'<a href="/section/{i}/">Section {i}</a>' for i in range(50))
+    return f"<html><head><title>Blog</title></head><body><nav>{nav}</nav><main>{items}</main></body></html>".encode()
+
+
+def make_detail_page() -> bytes:
+    paragraphs = "".join(f"<p>Paragraph {i} about models and agents.</p>" for i in range(400))
+    return (
+        '<html><head><meta property="og:title" content="Post title">'
+        '<meta property="og:description" content="Post description">'
+        '<meta property="article:published_time" content="2026-06-01T10:00:00Z"></head>'
+        f"<body><header>menu</header><article>{paragraphs}</article></body></html>"
+    ).encode()
+
+
+def bs4_list(html: bytes) -> int:
+    soup = BeautifulSoup(html, "lxml")
+    return len({a["href"] for a in soup.select("a[href*='/discover/blog/']")})
+
+
+def bs4_detail(html: bytes) -> int:
+    soup = BeautifulSoup(html, "lxml")
+    title = soup.select_one("meta[property='og:title']")["content"]
+    return len(title) + len(soup.select_one("article").get_text(" "))
+
+
+def rate(label: str, func, page: bytes, pages: int) -> None:
+    started = time.perf_counter()
+    for _ in range(pages):
+        func(page)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>16}: {pages / elapsed:,.0f} страниц/с ({len(page) / 1024:.0f} КБ/страница)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    config = CompiledConfig(DEEPMIND_CONFIG)
+    list_page = make_list_page(args.cards)
+    detail_page = make_detail_page()
+    assert len(parse_list(config, list_page, BASE_URL)) == args.cards
+
+    rate("lxml list", lambda html: parse_list(config, html, BASE_URL), list_page, args.pages)
+    rate("bs4 list", bs4_list, list_page, args.pages)
+    rate("lxml detail", lambda html: parse_detail(config, html), detail_page, args.pages)
+    rate("bs4 detail", bs4_detail, detail_page, args.pages)
+
+
+if __name__ == "__main__":
+    main()
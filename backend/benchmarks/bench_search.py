@@ -0,0 +1,112 @@
+"""
+Бенчмарк полнотекстового поиска (FTS5 + BM25) на синтетическом архиве.
+Статьи с текстом из словаря с распределением Ципфа загружаются напрямую
+в articles и articles_fts, затем измеряются p50/p99 search_articles()
+для частых, редких, составных и префиксных запросов, с фильтрами и без.
+Запуск: python benchmarks/bench_search.py [--articles 1000000] [--repeat 50]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from _common import populate, zipf_weights  # первым: задаёт DATA_DIR до импорта app
+
+from sqlalchemy import text
+
+from app.database import init_db, SessionLocal
+from app.services.search import optimize_index, search_articles
+
+VOCABULARY = 50_000
+SOURCES = 10
+CHUNK = 20_000
+
+
+# Слова запросов с заданным рангом частоты (0 — самое частое)
+QUERY_WORDS = {"model": 0, "agent": 40, "openai": 400, "robotics": 2_000, "regulation": 20_000}
+
+
+def make_vocabulary(rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < VOCABULARY - len(QUERY_WORDS):
+        word = "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        if word not in QUERY_WORDS:
+            words.add(word)
+    vocabulary = sorted(words)
+    rng.shuffle(vocabulary)
+    for word, rank in sorted(QUERY_WORDS.items(), key=lambda item: item[1]):
+        vocabulary.insert(rank, word)
+    return vocabulary
+
+
+def load(count: int, rng: random.Random) -> None:
+    vocabulary = make_vocabulary(rng)
+    cum_weights = zipf_weights(len(vocabulary))
+    started_at = datetime(2020, 1, 1)
+
+    def article(article_id: int) -> dict:
+        return {
+            "title": " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=8)),
+            "url": f"https://example.com/a/{article_id}",
+            "summary": " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=30)),
+            "content": " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=120)),
+            "published_at": (started_at + timedelta(minutes=article_id * 3)).isoformat(" "),
+        }
+
+    loaded = time.perf_counter()
+    populate(count, article, sources=SOURCES, index=True, chunk=CHUNK)
+    print(f"загружено {count:,} за {time.perf_counter() - loaded:.0f}с")
+
+    with SessionLocal() as db:
+        started = time.perf_counter()
+        optimize_index(db)
+        print(f"optimize: {time.perf_counter() - started:.1f}с")
+
+
+def measure(label: str, repeat: int, **kwargs) -> None:
+    timings = []
+    count = 0
+    with SessionLocal() as db:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            count = len(search_articles(db, **kwargs))
+            timings.append(time.perf_counter() - started)
+            db.expunge_all()
+    timings.sort()
+    p99 = timings[max(0, int(len(timings) * 0.99) - 1)]
+    print(
+        f"{label:>28}: p50 {statistics.median(timings) * 1000:6.1f} мс, "
+        f"p99 {p99 * 1000:6.1f} мс, результатов {count}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    init_db()
+    load(args.articles, random.Random(args.seed))
+    with SessionLocal() as db:
+        size = db.execute(text(
+            "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+        )).scalar()
+    print(f"размер БД: {size / 1024 / 1024:,.0f} МБ")
+
+    since = datetime(2020, 1, 1) + timedelta(minutes=args.articles * 3 // 2)
+    measure("редкое слово", args.repeat, query="regulation")
+    measure("частое слово", args.repeat, query="model")
+    measure("два слова", args.repeat, query="openai agent")
+    measure("префикс", args.repeat, query="robot*")
+    measure("частое + редкое", args.repeat, query="model regulation")
+    measure("частое + источник", args.repeat, query="model", source_id=3)
+    measure("частое + с даты", args.repeat, query="model", since=since)
+    measure("частое + до даты", args.repeat, query="agent", until=since)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Бенчмарк старта API: через сколько после запуска процесса uvicorn отвечает
+/health/live, отдаёт /api/articles/latest и готов по /health/ready, и когда
+заканчивается первый (фоновый) сбор — до него прежде не отвечал ни один
+запрос. Источники «висят»: все запросы к фидам идут через прокси, который
+принимает соединение и молчит, так что каждый источник упирается в
+SOURCE_TIMEOUT_SECONDS, как медленные фиды при деплое. Два сценария: БД уже
+со статьями (перезапуск) и пустая БД (первый запуск).
+Запуск: python benchmarks/bench_startup.py [--articles 20000] [--source-timeout 3]
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, UTC
+
+from _common import BACKEND, populate, story  # первым: задаёт DATA_DIR до импорта app
+
+import httpx
+
+from app.database import engine, init_db, SessionLocal
+from app.services.collector import seed_sources
+
+FINISHED = ("done", "failed", "interrupted")
+
+
+def blackhole() -> int:
+    """Прокси, который принимает соединения и ничего не отвечает."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(128)
+    held = []
+
+    def accept():
+        while True:
+            held.append(server.accept()[0])
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client: httpx.Client, path: str, check, deadline: float) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            response = client.get(path)
+            if check(response):
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(path)
+
+
+def run(label: str, data_dir: str, proxy_port: int, source_timeout: float) -> None:
+    port = free_port()
+    proxy = f"http://127.0.0.1:{proxy_port}"
+    env = dict(
+        os.environ, DATA_DIR=data_dir, HTTP_PROXY=proxy, HTTPS_PROXY=proxy, ALL_PROXY=proxy,
+        NO_PROXY="", SOURCE_TIMEOUT_SECONDS=str(source_timeout), TELEGRAM_BOT_TOKEN="",
+        RATE_LIMIT_REQUESTS="1000000",
+    )
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = started + 30 + source_timeout * 10
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", trust_env=False, timeout=5) as client:
+            live = wait_for(client, "/health/live", lambda r: r.status_code == 200, deadline)
+            latest = wait_for(client, "/api/articles/latest", lambda r: r.status_code == 200, deadline)
+            count = client.get("/api/articles/latest").json()["count"]
+            ready = wait_for(client, "/health/ready", lambda r: r.status_code == 200, deadline)
+            warm = wait_for(
+                client, "/api/collect",
+                lambda r: r.status_code == 200 and r.json()["runs"] and r.json()["runs"][0]["status"] in FINISHED,
+                deadline,
+            )
+    finally:
+        process.send_signal(signal.SIGINT)
+        process.wait(timeout=30)
+
+    print(f"--- {label}")
+    print(f"{'/health/live':>24}: {(live - started) * 1000:7.0f} мс")
+    print(f"{'/api/articles/latest':>24}: {(latest - started) * 1000:7.0f} мс (статей в ответе: {count})")
+    print(f"{'/health/ready':>24}: {(ready - started) * 1000:7.0f} мс")
+    print(f"{'первый сбор завершён':>24}: {(warm - started) * 1000:7.0f} мс "
+          f"(прежде до этого момента API не отвечал)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--source-timeout", type=float, default=3.0)
+    args = parser.parse_args()
+
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    imported = float(subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND, capture_output=True, text=True,
+        env=dict(os.environ, DATA_DIR=tempfile.mkdtemp(prefix="bench_startup_import_")),
+    ).stdout.strip().splitlines()[-1])
+    print(f"import main: {imported * 1000:.0f} мс")
+
+    proxy_port = blackhole()
+    init_db()
+    with SessionLocal() as db:
+        seed_sources(db)
+        db.commit()
+    now = datetime.now(UTC).replace(tzinfo=None)
+    populate(
+        args.articles,
+        lambda i: story(i, now - timedelta(minutes=args.articles - i), source_id=i % 10 + 1),
+        sources=0,
+    )
+    engine.dispose()
+    run(f"БД со статьями ({args.articles:,})", os.environ["DATA_DIR"], proxy_port, args.source_timeout)
+    run("пустая БД", tempfile.mkdtemp(prefix="bench_startup_empty_"), proxy_port, args.source_timeout)
+
+
+if __name__ == "__main__":
+    main()
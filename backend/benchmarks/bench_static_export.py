@@ -0,0 +1,95 @@
+"""
+Бенчмарк статического экспорта (export_news.py): размер news.json,
+sources.json и meta.json в прежнем виде (indent=2) против компактного JSON
+и его .gz/.br копий, время экспорта с записью и повторного экспорта без
+изменений (файлы не переписываются — нет коммита и деплоя). Синтетические
+аннотации сжимаются лучше настоящих, поэтому те же размеры выводятся и для
+закоммиченного data/news.json. Для ленты по шардам — сколько байт index.html
+качает до первого экрана (манифест и первые дни) против всей ленты одним
+файлом.
+Запуск: python benchmarks/bench_static_export.py [--articles 5000] [--per-day 40]
+"""
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from _common import populate, story  # первым: задаёт DATA_DIR до импорта app
+
+import export_news
+from app.database import init_db
+
+SOURCES = 10
+FILES = ("news.json", "sources.json", "meta.json")
+PER_PAGE = 20  # статей на первом экране index.html
+
+
+def report(label: str, data: bytes) -> None:
+    indented = json.dumps(json.loads(data), ensure_ascii=False, indent=2).encode()
+    compressed = export_news._compressed(data, (".gz", ".br"))
+    sizes = [len(indented), len(data)] + [len(payload) for payload in compressed.values()]
+    print(f"{label:>22} " + " ".join(f"{size / 1024:>{w}.1f}К" for size, w in zip(sizes, (9, 9, 7, 7))))
+
+
+def _dump_feed(out: Path, manifest: dict) -> bytes:
+    return export_news._dump([
+        article for shard in manifest["days"] for article in json.loads((out / "news" / shard["url"]).read_bytes())
+    ])
+
+
+def timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--per-day", type=int, default=40)
+    args = parser.parse_args()
+
+    init_db()
+    now = datetime.now()
+    populate(args.articles, lambda i: story(
+        i, now - timedelta(days=(args.articles - i) / args.per_day),
+        title=f"Новость {i}: модели и агенты",
+        summary=f"Аннотация {i}, несколько предложений о модели. " * 6,
+    ), sources=SOURCES)
+    out = Path(tempfile.mkdtemp(prefix="bench_static_export_out_"))
+    export_news.DATA_DIR = out
+    export_news.logger.setLevel("WARNING")
+
+    first = timed(export_news.export_news)
+    stamps = {p.name: p.stat().st_mtime_ns for p in out.iterdir()}
+    again = timed(export_news.export_news)
+    rewritten = [p.name for p in out.iterdir() if p.stat().st_mtime_ns != stamps[p.name]]
+
+    print(f"{'файл':>22} {'indent=2':>10} {'компактно':>10} {'.gz':>8} {'.br':>8}")
+    for name in FILES:
+        report(name, (out / name).read_bytes())
+    committed = export_news.settings.BASE_DIR / "data" / "news.json"
+    if committed.exists():
+        report("data/news.json (репо)", export_news._dump(json.loads(committed.read_bytes())))
+
+    manifest = json.loads((out / "news" / "manifest.json").read_bytes())
+    paths, shown = [out / "news" / "manifest.json"], 0
+    for shard in manifest["days"]:
+        if shown >= PER_PAGE:
+            break
+        paths.append(out / "news" / shard["url"])
+        shown += shard["count"]
+    first_paint = [sum((p.with_name(p.name + suffix)).stat().st_size for p in paths) for suffix in ("", ".gz")]
+    feed = _dump_feed(out, manifest)
+    whole = [len(feed), len(export_news._compressed(feed, (".gz",))[".gz"])]
+    print(f"лента: {manifest['total']:,} статей, {len(manifest['days'])} дней; до первого экрана "
+          f"{first_paint[0] / 1024:.1f}К (gzip {first_paint[1] / 1024:.1f}К) против "
+          f"{whole[0] / 1024:.1f}К (gzip {whole[1] / 1024:.1f}К) одним файлом")
+    print(f"экспорт с записью: {first * 1000:.0f} мс, без изменений: {again * 1000:.0f} мс, "
+          f"переписано файлов: {len(rewritten)}")
+
+
+if __name__ == "__main__":
+    main()
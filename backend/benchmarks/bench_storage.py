@@ -0,0 +1,120 @@
+"""
+Бенчмарк хранения полных текстов: размер БД и задержка списков статей
+до и после переноса Article.content в сжатую таблицу article_bodies.
+Сначала строится БД в прежней схеме (content в articles, FTS со своей
+копией текстов), затем init_db() выполняет миграцию, после неё VACUUM;
+при установленном zstandard дополнительно обучается словарь.
+Запуск: python benchmarks/bench_storage.py [--articles 20000] [--words 600]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from _common import populate, zipf_weights  # первым: задаёт DATA_DIR до импорта app
+
+from sqlalchemy import text
+
+from app.database import engine, init_db, SessionLocal
+from app.services.search import FTS_SOURCE_VIEW, FTS_TABLE
+from app.utils import compression
+
+LIST_SQL = (
+    "SELECT a.*, s.* FROM articles a LEFT JOIN sources s ON s.id = a.source_id "
+    "WHERE a.published_at < :before ORDER BY a.published_at DESC, a.id DESC LIMIT 20"
+)
+
+
+def make_legacy_schema() -> None:
+    """Вернуть схему к виду до миграции: content в articles, FTS со своей копией."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+        conn.execute(text(f"DROP VIEW {FTS_SOURCE_VIEW}"))
+        conn.execute(text("ALTER TABLE articles ADD COLUMN content TEXT"))
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, summary, content, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+
+
+def load(count: int, words: int, rng: random.Random) -> None:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = list({
+        "".join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(20_000)
+    })
+    cum_weights = zipf_weights(len(vocabulary))
+    boilerplate = "Subscribe to our newsletter for the latest AI news. " * 3
+    started_at = datetime(2024, 1, 1)
+
+    def article(article_id: int) -> dict:
+        title = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=10)).capitalize()
+        summary = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=45))
+        body = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=words))
+        return {
+            "title": title,
+            "url": f"https://example.com/{article_id}",
+            "summary": summary,
+            "content": f"{summary}. {body}. {boilerplate}",
+            "published_at": (started_at + timedelta(minutes=10 * article_id)).isoformat(" "),
+        }
+
+    # Схема до миграции: content — колонка articles, FTS со своей копией
+    populate(count, article, sources=1, bodies=False, index=True, chunk=5000)
+
+
+def vacuum() -> float:
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        conn.execute(text("VACUUM"))
+    return Path(engine.url.database).stat().st_size / 1024 / 1024
+
+
+def list_latency(count: int, repeat: int, rng: random.Random) -> tuple:
+    """p50/p99 страницы из 20 статей с произвольной позиции (мс)."""
+    started_at = datetime(2024, 1, 1)
+    timings = []
+    engine.dispose()  # холодный кэш страниц SQLite
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            before = started_at + timedelta(minutes=10 * rng.randint(20, count))
+            started = time.perf_counter()
+            conn.execute(text(LIST_SQL), {"before": before.isoformat(" ")}).all()
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.median(timings) * 1000, timings[int(len(timings) * 0.99) - 1] * 1000
+
+
+def report(label: str, size: float, latency: tuple) -> None:
+    print(f"{label:>22}: БД {size:8.1f} МБ, список p50 {latency[0]:.2f} мс, p99 {latency[1]:.2f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    make_legacy_schema()
+    load(args.articles, args.words, random.Random(1))
+    report("content в articles", vacuum(), list_latency(args.articles, args.repeat, random.Random(2)))
+
+    started = time.perf_counter()
+    init_db()  # миграция в article_bodies и пересоздание FTS
+    print(f"{'миграция':>22}: {time.perf_counter() - started:.1f}с, кодек {compression.default_codec()}")
+    report("article_bodies", vacuum(), list_latency(args.articles, args.repeat, random.Random(2)))
+
+    if compression.zstandard is not None:
+        from app.services.bodies import recompress_bodies, train_body_dictionary
+
+        with SessionLocal() as db:
+            train_body_dictionary(db, samples=5000, size=112_640)
+            recompress_bodies(db)
+        report("+ словарь zstd", vacuum(), list_latency(args.articles, args.repeat, random.Random(2)))
+
+
+if __name__ == "__main__":
+    main()
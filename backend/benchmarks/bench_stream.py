@@ -0,0 +1,132 @@
+"""
+Бенчмарк потока /api/stream: сколько стоит держать тысячи простаивающих
+SSE-подключений в одном процессе и как быстро новая статья доходит до всех.
+Подключения — ASGI-вызовы приложения в одном event loop (без сокетов, так
+что видна цена самого эндпоинта и рассылки, а не сетевого стека); статьи
+публикуются так же, как после commit в _save_articles.
+Запуск: python benchmarks/bench_stream.py [--connections 5000] [--rounds 20]
+"""
+import argparse
+import asyncio
+import gc
+import resource
+import statistics
+import time
+from datetime import datetime, timedelta, UTC
+
+from _common import populate, story  # первым: задаёт DATA_DIR до импорта app
+
+from fastapi import FastAPI
+
+from app.api.routes import api_router
+from app.config import settings
+from app.database import init_db, SessionLocal
+from app.services.events import article_broker, article_events
+
+SOURCES = 10
+
+
+class Delivery:
+    """Ожидание кадра с нужным id у всех подключений."""
+
+    def __init__(self, expected: int, prefix: bytes):
+        self.expected = expected
+        self.prefix = prefix
+        self.count = 0
+        self.done = asyncio.Event()
+
+    def received(self) -> None:
+        self.count += 1
+        if self.count == self.expected:
+            self.done.set()
+
+
+class Connection:
+    """Одно SSE-подключение (ASGI-вызов приложения до отключения)."""
+
+    delivery = None
+
+    def __init__(self, app):
+        self.app = app
+        self.disconnected = asyncio.Event()
+
+    async def run(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/stream", "raw_path": b"/api/stream",
+            "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+        }
+
+        async def receive():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            delivery = Connection.delivery
+            if delivery and message.get("body", b"").startswith(delivery.prefix):
+                delivery.received()
+
+        await self.app(scope, receive, send)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    settings.STREAM_MAX_CONNECTION_SECONDS = 3600
+    article_broker.max_subscribers = args.connections
+    init_db()
+    now = datetime.now(UTC).replace(tzinfo=None)
+    populate(args.rounds, lambda i: story(i, now - timedelta(minutes=args.rounds - i)), sources=SOURCES)
+    with SessionLocal() as db:
+        events = article_events(db, range(1, args.rounds + 1))
+
+    app = FastAPI()
+    app.include_router(api_router)
+
+    gc.collect()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    connections = [Connection(app) for _ in range(args.connections)]
+    tasks = [asyncio.create_task(connection.run()) for connection in connections]
+    while article_broker.subscribers < args.connections:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(0.5)
+    memory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) * 1024
+    print(
+        f"подключений: {args.connections:,} за {elapsed:.2f}с, "
+        f"прирост RSS {memory / 1024 / 1024:.1f} МБ ({memory / args.connections / 1024:.1f} КБ на подключение)"
+    )
+
+    # Простой: heartbeat раз в STREAM_HEARTBEAT_SECONDS, event loop свободен
+    started = time.perf_counter()
+    await asyncio.sleep(0)
+    print(f"отклик event loop при {args.connections:,} подключениях: {(time.perf_counter() - started) * 1e6:.0f} мкс")
+
+    publish_times, last_delivery = [], []
+    for event in events:
+        Connection.delivery = delivery = Delivery(args.connections, f"id: {event.id}\n".encode())
+        published = time.perf_counter()
+        article_broker.publish([event])
+        publish_times.append(time.perf_counter() - published)
+        await delivery.done.wait()
+        last_delivery.append(time.perf_counter() - published)
+
+    print(
+        f"публикация одной статьи: {statistics.median(publish_times) * 1000:.2f} мс (очереди подписчиков), "
+        f"доставлена всем за {statistics.median(last_delivery) * 1000:.1f} мс (p50 по {args.rounds} статьям), "
+        f"максимум {max(last_delivery) * 1000:.1f} мс"
+    )
+
+    for connection in connections:
+        connection.disconnected.set()
+    await asyncio.gather(*tasks)
+    print(f"после отключения подписчиков: {article_broker.subscribers}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
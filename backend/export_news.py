@@ -3,20 +3,34 @@ Standalone скрипт: сбор новостей + экспорт в JSON дл
 Запуск: python export_news.py
 """
 import asyncio
+import gzip
+import hashlib
 import json
 import logging
 import sys
-from datetime import datetime, UTC
+from datetime import datetime, timedelta, UTC
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+try:
+    import brotli
+except ImportError:  # необязательная зависимость (ставится с httpx[brotli])
+    brotli = None
+
+from sqlalchemy import select
+
 from app.config import settings
-from app.database import init_db, SessionLocal
+from app.database import async_engine, init_db, SessionLocal
 from app.models.article import Article
-from app.models.source import Source
-from app.services.collector import collect_all
-from sqlalchemy.orm import joinedload
+from app.services.counters import total_articles
+from app.services.dedup import story_representative
+from app.services.jobs import collect_jobs
+from app.services.parse_pool import shutdown_pool
+from app.services.read_model import article_dict, article_rows, source_rows, story_rows
+from app.services.writer import ingest_writer
+from app.utils.files import write_atomic
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,73 +39,251 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 DATA_DIR = settings.BASE_DIR / "data"
+# Шарды ленты для index.html: data/news/manifest.json и файлы, перечисленные в нём
+SHARDS_DIR = "news"
+# Сжатые копии рядом с каждым файлом (news.json.gz, news.json.br)
+COMPRESSED_SUFFIXES = (".gz", ".br") if brotli else (".gz",)
 
 
 def export_news():
-    """Экспортировать новости из БД в JSON-файлы."""
+    """Экспортировать новости из БД в JSON-файлы.
+
+    news.json — последние 200 сюжетов одним файлом (для внешних
+    потребителей), лента сайта — шарды export_shards(). Файл с прежним
+    содержимым не переписывается (не меняется и updated_at в meta.json), так
+    что повторный экспорт без новых статей не даёт коммита. Запись
+    атомарная, рядом лежат .gz/.br для статического хостинга.
+    """
     db = SessionLocal()
     try:
-        # Последние 200 статей
-        articles = (
-            db.query(Article)
-            .options(joinedload(Article.source))
-            .order_by(Article.published_at.desc())
-            .limit(200)
-            .all()
-        )
-
-        news = []
-        for a in articles:
-            news.append({
-                "id": a.id,
-                "title": a.title,
-                "url": a.url,
-                "summary": (a.summary or "")[:300],
-                "author": a.author or "",
-                "source": a.source.name if a.source else "",
-                "published_at": a.published_at.isoformat() if a.published_at else "",
-            })
+        # Последние 200 сюжетов (дубликаты из других источников скрыты)
+        news = [
+            article_dict(row, missing="")
+            for row in db.execute(story_rows(limit=200))
+        ]
 
-        # Источники
-        sources_list = db.query(Source).filter(Source.is_active == True).all()
+        # Источники. Время опроса (last_checked) меняется при каждом сборе и
+        # переписывало бы sources.json без новых статей, поэтому вместо него
+        # дата самой свежей статьи источника
         sources = []
-        for s in sources_list:
+        for s in db.execute(source_rows()):
             sources.append({
                 "id": s.id,
                 "name": s.name,
                 "url": s.url,
-                "articles_count": s.articles_count or 0,
-                "last_checked": s.last_checked.isoformat() if s.last_checked else "",
+                "articles_count": s.articles_count,
+                "last_published_at": s.last_published_at.isoformat() if s.last_published_at else "",
             })
 
-        total_articles = db.query(Article).count()
-
-        # Метаданные
-        meta = {
-            "updated_at": datetime.now(UTC).isoformat(),
-            "total_articles": total_articles,
-            "exported_articles": len(news),
-            "sources_count": len(sources),
-        }
+        total = total_articles(db)
 
         # Записать файлы
         DATA_DIR.mkdir(exist_ok=True)
+        changed = [
+            name
+            for name, data in (("news.json", news), ("sources.json", sources))
+            if write_export(DATA_DIR / name, _dump(data))
+        ]
+        changed += export_shards(db)
+    finally:
+        db.close()
 
-        with open(DATA_DIR / "news.json", "w", encoding="utf-8") as f:
-            json.dump(news, f, ensure_ascii=False, indent=2)
+    # Метаданные: updated_at — время последнего изменения данных
+    meta = {
+        "total_articles": total,
+        "exported_articles": len(news),
+        "sources_count": len(sources),
+    }
+    previous = _load(DATA_DIR / "meta.json")
+    if changed or previous is None or {k: v for k, v in previous.items() if k != "updated_at"} != meta:
+        meta = {"updated_at": datetime.now(UTC).isoformat(), **meta}
+    else:
+        meta = previous
+    if write_export(DATA_DIR / "meta.json", _dump(meta)):
+        changed.append("meta.json")
 
-        with open(DATA_DIR / "sources.json", "w", encoding="utf-8") as f:
-            json.dump(sources, f, ensure_ascii=False, indent=2)
+    logger.info(
+        f"Экспорт завершён: {len(news)} статей, {len(sources)} источников → data/ "
+        f"({_summary(changed) if changed else 'без изменений'})"
+    )
 
-        with open(DATA_DIR / "meta.json", "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
 
-        logger.info(
-            f"Экспорт завершён: {len(news)} статей, {len(sources)} источников → data/"
-        )
+def export_shards(db) -> List[str]:
+    """Лента сайта шардами, чтобы index.html не грузил её целиком.
 
-    finally:
-        db.close()
+    days/ГГГГ-ММ-ДД.json — сюжеты за день (UTC), лента «Все»;
+    sources/<id>/ГГГГ-ММ.json — сюжеты источника за месяц, фильтр по
+    источнику. Каждый шард — массив в форме news.json от новых к старым.
+    Прошедшие дни и месяцы не меняются, и экспорт переписывает один-два
+    файла, а не всю ленту. manifest.json перечисляет шарды от новых к
+    старым с числом статей и хешем содержимого (браузер добавляет его к URL,
+    чтобы не взять из кэша старую версию).
+    Статьи прошлого экспорта, которых нет в БД, остаются в ленте: в CI
+    экспорт начинается с пустой БД, и без них в шардах был бы только
+    последний сбор. Удаляются только шарды, выпавшие из STATIC_EXPORT_DAYS.
+    Returns: изменённые и удалённые файлы (пути относительно data/).
+    """
+    stmt = (
+        article_rows()
+        .add_columns(Article.source_id)
+        .where(story_representative())
+        .order_by(Article.published_at.desc(), Article.id.desc())
+    )
+    since = None
+    if settings.STATIC_EXPORT_DAYS:
+        since = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=settings.STATIC_EXPORT_DAYS)
+        stmt = stmt.where(Article.published_at >= since)
+
+    root = DATA_DIR / SHARDS_DIR
+    names: Dict[int, str] = {}
+    articles = []  # (source_id, статья) от новых к старым
+    for row in db.execute(stmt):
+        articles.append((row.source_id, article_dict(row, missing="")))
+        names[row.source_id] = row.source or ""
+
+    previous = _previous_articles(root, since)
+    known = _known_urls(db, [article["url"] for _, article in previous])
+    ids = {name: source_id for source_id, name in names.items()}
+    for source_id, article in previous:
+        source_id = ids.get(article["source"], source_id)
+        # Статьи, которые есть в БД, берутся только из неё (сюжет мог
+        # сменить представителя); источник сверяется по имени — id в новой
+        # БД могут быть другими
+        if article["url"] in known or names.setdefault(source_id, article["source"]) != article["source"]:
+            continue
+        articles.append((source_id, article))
+    articles.sort(key=lambda item: item[1]["published_at"], reverse=True)
+
+    days: Dict[str, list] = {}
+    months: Dict[int, Dict[str, list]] = {}
+    for source_id, article in articles:
+        day = article["published_at"][:10]
+        days.setdefault(day, []).append(article)
+        months.setdefault(source_id, {}).setdefault(day[:7], []).append(article)
+
+    written: set = set()
+    changed: List[str] = []
+
+    def shard(relative: str, articles: list) -> dict:
+        data = _dump(articles)
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if write_export(path, data):
+            changed.append(f"{SHARDS_DIR}/{relative}")
+        written.add(path)
+        return {"url": relative, "count": len(articles), "hash": hashlib.sha256(data).hexdigest()[:16]}
+
+    manifest = {
+        "total": sum(len(articles) for articles in days.values()),
+        "days": [{"day": day, **shard(f"days/{day}.json", articles)} for day, articles in days.items()],
+        "sources": [
+            {
+                "id": source_id,
+                "name": names[source_id],
+                "count": sum(len(articles) for articles in months[source_id].values()),
+                "shards": [
+                    {"month": month, **shard(f"sources/{source_id}/{month}.json", articles)}
+                    for month, articles in months[source_id].items()
+                ],
+            }
+            for source_id in sorted(months, key=lambda source_id: names[source_id].lower())
+        ],
+    }
+    root.mkdir(parents=True, exist_ok=True)
+    if write_export(root / "manifest.json", _dump(manifest)):
+        changed.append(f"{SHARDS_DIR}/manifest.json")
+    written.add(root / "manifest.json")
+
+    # Файлы, которых нет в манифесте (и недописанные .tmp); дети раньше каталогов
+    for path in sorted(root.rglob("*"), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif path.with_name(path.name.removesuffix(".gz").removesuffix(".br")) not in written:
+            path.unlink()
+            if path.suffix == ".json":
+                changed.append(f"{SHARDS_DIR}/{path.relative_to(root)}")
+    return changed
+
+
+def _previous_articles(root: Path, since: Optional[datetime]) -> List[Tuple[int, dict]]:
+    """(source_id, статья) из дневных шардов прошлого экспорта, не старше since."""
+    manifest = _load(root / "manifest.json") or {}
+    ids = {source["name"]: source["id"] for source in manifest.get("sources", [])}
+    cutoff = since.isoformat() if since else ""
+    return [
+        (ids[article["source"]], article)
+        for shard in manifest.get("days", [])
+        for article in _load(root / shard["url"]) or []
+        if article["published_at"] and article["published_at"] >= cutoff and article["source"] in ids
+    ]
+
+
+def _known_urls(db, urls: List[str], chunk: int = 500) -> set:
+    known = set()
+    for start in range(0, len(urls), chunk):
+        known.update(db.execute(
+            select(Article.url).where(Article.url.in_(urls[start:start + chunk]))
+        ).scalars())
+    return known
+
+
+def write_export(path: Path, data: bytes) -> bool:
+    """Записать файл и его сжатые копии, если содержимое изменилось.
+
+    Копии пишутся первыми, сам файл — последним: после сбоя посередине его
+    хеш не совпадёт, и следующий запуск перепишет всё заново.
+    Returns: True, если файл переписан.
+    """
+    unchanged = _digest(path) == hashlib.sha256(data).digest()
+    missing = [suffix for suffix in COMPRESSED_SUFFIXES if not _sibling(path, suffix).exists()]
+    if unchanged and not missing:
+        return False
+    for suffix, payload in _compressed(data, missing if unchanged else COMPRESSED_SUFFIXES).items():
+        write_atomic(_sibling(path, suffix), payload)
+    if brotli is None:
+        _sibling(path, ".br").unlink(missing_ok=True)  # иначе осталась бы устаревшая копия
+    if unchanged:
+        return False
+    write_atomic(path, data)
+    return True
+
+
+def _summary(changed: List[str], shown: int = 5) -> str:
+    names = ", ".join(changed[:shown]) + (", …" if len(changed) > shown else "")
+    return f"изменено файлов: {len(changed)} — {names}"
+
+
+def _dump(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _compressed(data: bytes, suffixes) -> dict:
+    # mtime=0: одинаковые данные дают побайтно одинаковый .gz
+    copies = {}
+    if ".gz" in suffixes:
+        copies[".gz"] = gzip.compress(data, compresslevel=9, mtime=0)
+    if ".br" in suffixes:
+        copies[".br"] = brotli.compress(data, quality=11)
+    return copies
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def _digest(path: Path) -> Optional[bytes]:
+    try:
+        return hashlib.sha256(path.read_bytes()).digest()
+    except FileNotFoundError:
+        return None
+
+
+def _load(path: Path) -> Optional[Any]:
+    try:
+        return json.loads(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
 
 
 async def main():
@@ -99,7 +291,12 @@ async def main():
     init_db()
 
     logger.info("Сбор новостей...")
-    result = await collect_all()
+    try:
+        result = await (await collect_jobs.submit("export")).wait()
+    finally:
+        await ingest_writer.close()
+        shutdown_pool()
+        await async_engine.dispose()
     logger.info(f"Сбор: {result}")
 
     logger.info("Экспорт в JSON...")
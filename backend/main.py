@@ -5,16 +5,18 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from fastapi.responses import JSONResponse
 import uvicorn
 
 from app.config import settings
-from app.database import init_db
+from app.database import async_engine, init_db, SessionLocal
+from app.api.ratelimit import RateLimitMiddleware, RatePolicy, default_rules
 from app.api.routes import api_router
-from app.tasks.scheduler import start_scheduler, stop_scheduler
-from app.services.collector import collect_all
+from app.services.counters import total_articles
+from app.services.events import article_broker
+from app.services.jobs import collect_jobs, mark_interrupted
+from app.services.parse_pool import shutdown_pool
+from app.services.writer import ingest_writer
 
 # Logging
 logging.basicConfig(
@@ -25,100 +27,121 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses.
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        return response
+    Plain ASGI rather than BaseHTTPMiddleware: long-lived streaming responses
+    (/api/stream) pass through without an extra task and buffer per connection.
+    """
 
+    HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    ]
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiter per IP."""
+    def __init__(self, app):
+        self.app = app
 
-    def __init__(self, app, max_requests: int = 60, window_seconds: int = 60):
-        super().__init__(app)
-        self.max_requests = max_requests
-        self.window_seconds = window_seconds
-        self._requests: dict[str, list[float]] = {}
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        import time
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                names = {name for name, _ in self.HEADERS}
+                message["headers"] = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in names
+                ] + self.HEADERS
+            await send(message)
 
-        client_ip = request.client.host if request.client else "unknown"
-        now = time.time()
+        await self.app(scope, receive, send_with_headers)
 
-        # Stricter limit for /api/collect
-        if request.url.path == "/api/collect" and request.method == "POST":
-            max_req = 2
-            window = 3600  # 1 hour
-        else:
-            max_req = self.max_requests
-            window = self.window_seconds
 
-        key = f"{client_ip}:{request.url.path}" if max_req != self.max_requests else client_ip
+def _mark_interrupted_runs():
+    with SessionLocal() as db:
+        count = mark_interrupted(db)
+    if count:
+        logger.warning(f"Сборов, прерванных прошлой остановкой: {count}")
 
-        if key not in self._requests:
-            self._requests[key] = []
 
-        # Clean old entries
-        self._requests[key] = [t for t in self._requests[key] if now - t < window]
+# Состояние запуска для /health/ready
+_startup = {"database": False, "has_articles": False, "warm_collect": "pending"}
+_background_tasks: set = set()
 
-        if len(self._requests[key]) >= max_req:
-            return Response(
-                content='{"error": "Too many requests"}',
-                status_code=429,
-                media_type="application/json",
-            )
 
-        self._requests[key].append(now)
-        return await call_next(request)
+def _has_articles() -> bool:
+    with SessionLocal() as db:
+        return total_articles(db) > 0
 
-# Бот запускается только если есть токен
-_bot_task = None
+
+async def _warm_collect():
+    """Первый сбор после старта — в фоне, API уже отдаёт данные из БД."""
+    _startup["warm_collect"] = "running"
+    try:
+        job = await collect_jobs.submit("startup")
+        result = await job.wait()
+        logger.info(f"Первый сбор: {result}")
+        _startup["warm_collect"] = "done"
+    except Exception as e:
+        logger.error(f"Ошибка первого сбора: {e}")
+        _startup["warm_collect"] = "failed"
+
+
+async def _run_bot():
+    # aiogram импортируется только при заданном токене и не задерживает старт API
+    from app.bot.bot import start_bot, setup_digest_job
+    setup_digest_job()
+    await start_bot()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _bot_task
-
-    # Startup
+    # Startup: до приёма запросов только схема БД (десятки мс на готовой БД);
+    # сбор, планировщик и бот запускаются в фоне
     logger.info("Инициализация базы данных...")
-    init_db()
+    await asyncio.to_thread(init_db)
+    await asyncio.to_thread(_mark_interrupted_runs)
+    _startup["has_articles"] = await asyncio.to_thread(_has_articles)
+    _startup["database"] = True
 
-    logger.info("Первоначальный сбор новостей...")
-    try:
-        result = await collect_all()
-        logger.info(f"Первый сбор: {result}")
-    except Exception as e:
-        logger.error(f"Ошибка первого сбора: {e}")
+    logger.info("Первоначальный сбор новостей (в фоне)...")
+    _spawn(_warm_collect())
 
     # Запуск бота
     if settings.TELEGRAM_BOT_TOKEN:
         logger.info("Запуск Telegram-бота...")
-        from app.bot.bot import start_bot, setup_digest_job
-        setup_digest_job()
-        _bot_task = asyncio.create_task(start_bot())
+        _spawn(_run_bot())
     else:
         logger.warning("TELEGRAM_BOT_TOKEN не задан — бот не запущен")
 
     # Запуск планировщика
+    from app.tasks.scheduler import start_scheduler
     start_scheduler()
 
     yield
 
     # Shutdown
+    from app.tasks.scheduler import stop_scheduler
+    article_broker.close()
     stop_scheduler()
-    if _bot_task:
-        _bot_task.cancel()
-        try:
-            await _bot_task
-        except asyncio.CancelledError:
-            pass
+    await collect_jobs.close()
+    for task in list(_background_tasks):
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    await ingest_writer.close()
+    shutdown_pool()
+    await async_engine.dispose()
     logger.info("Приложение остановлено")
 
 
@@ -126,22 +149,42 @@ app = FastAPI(title="AI News Monitor", lifespan=lifespan)
 
 # Security middleware
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(RateLimitMiddleware, max_requests=60, window_seconds=60)
+app.add_middleware(
+    RateLimitMiddleware,
+    default=RatePolicy(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS),
+    rules=default_rules(),
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_methods=["GET"],
     allow_headers=["Content-Type", "X-API-Key"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(api_router)
 
 
 @app.get("/health")
+@app.get("/health/live")
 def health():
+    """Liveness: процесс жив и обслуживает запросы."""
     return {"status": "ok"}
 
 
+@app.get("/health/ready")
+def health_ready():
+    """Readiness: схема БД готова и есть что отдавать (статьи в БД или первый сбор закончен)."""
+    ready = _startup["database"] and (
+        _startup["has_articles"] or _startup["warm_collect"] in ("done", "failed")
+    )
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "starting", **_startup},
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,188 @@
+"""
+Служебные команды обслуживания БД.
+Запуск: python manage.py <команда>   (список команд: python manage.py --help)
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import init_db, SessionLocal
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def cmd_reconcile_counts(args):
+    """Пересчитать Source.articles_count по фактическим строкам."""
+    from app.services.counters import reconcile_counts
+
+    db = SessionLocal()
+    try:
+        fixed = reconcile_counts(db)
+        logger.info(f"Исправлено счётчиков: {len(fixed)}")
+    finally:
+        db.close()
+
+
+def cmd_rebuild_clusters(args):
+    """Построить MinHash/LSH-индекс для статей, у которых его ещё нет."""
+    from sqlalchemy import select
+    from app.models.article import Article
+    from app.services.dedup import assign_clusters, story_text
+
+    db = SessionLocal()
+    try:
+        last_id = 0
+        processed = duplicates = 0
+        while True:
+            rows = db.execute(
+                select(Article.id, Article.title, Article.summary)
+                .where(Article.id > last_id, Article.minhash.is_(None))
+                .order_by(Article.id)
+                .limit(args.batch)
+            ).all()
+            if not rows:
+                break
+            duplicates += assign_clusters(
+                db, [(r.id, story_text(r.title, r.summary)) for r in rows]
+            )
+            db.commit()
+            processed += len(rows)
+            last_id = rows[-1].id
+        logger.info(f"Проиндексировано статей: {processed}, дубликатов: {duplicates}")
+    finally:
+        db.close()
+
+
+def cmd_fts_rebuild(args):
+    """Пересоздать полнотекстовый индекс по всем статьям."""
+    from app.services.search import optimize_index, rebuild_index
+
+    db = SessionLocal()
+    try:
+        count = rebuild_index(db)
+        optimize_index(db)
+        logger.info(f"Проиндексировано статей: {count}")
+    finally:
+        db.close()
+
+
+def cmd_fts_optimize(args):
+    """Слить сегменты полнотекстового индекса (после массовой загрузки)."""
+    from app.services.search import optimize_index
+
+    db = SessionLocal()
+    try:
+        optimize_index(db)
+        logger.info("Полнотекстовый индекс оптимизирован")
+    finally:
+        db.close()
+
+
+def cmd_train_body_dict(args):
+    """Обучить zstd-словарь на последних текстах статей (и пережать старые)."""
+    from app.services.bodies import recompress_bodies, train_body_dictionary
+
+    db = SessionLocal()
+    try:
+        train_body_dictionary(db, args.samples, args.size)
+        if args.recompress:
+            count, before, after = recompress_bodies(db)
+            logger.info(
+                f"Пережато текстов: {count}, {before / 1024 / 1024:.1f} МБ → "
+                f"{after / 1024 / 1024:.1f} МБ"
+            )
+    finally:
+        db.close()
+
+
+def cmd_vacuum(args):
+    """Сжать файл БД (VACUUM), например после переноса текстов статей."""
+    from sqlalchemy import text
+    from app.database import engine
+
+    db_path = Path(engine.url.database)
+    before = db_path.stat().st_size
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        conn.execute(text("VACUUM"))
+    after = db_path.stat().st_size
+    logger.info(f"Размер БД: {before / 1024 / 1024:.1f} МБ → {after / 1024 / 1024:.1f} МБ")
+
+
+def cmd_compact(args):
+    """Перенести статьи старше срока хранения в архив data/archive."""
+    from app.services.archive import compact, count_expired, retention_cutoff
+
+    cutoff = retention_cutoff(args.days)
+    if cutoff is None:
+        logger.info("Срок хранения не задан (RETENTION_DAYS=0), переносить нечего")
+        return
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            logger.info(f"Будет перенесено статей старше {cutoff:%Y-%m-%d}: {count_expired(db, cutoff)}")
+            return
+        moved = compact(db, cutoff)
+        logger.info(
+            f"Перенесено статей: {sum(moved.values())} "
+            f"({', '.join(f'{m}: {n}' for m, n in sorted(moved.items())) or 'нет'})"
+        )
+        if moved:
+            logger.info("Чтобы уменьшить файл БД, выполните: python manage.py vacuum")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser(
+        "reconcile-counts", help=cmd_reconcile_counts.__doc__
+    ).set_defaults(func=cmd_reconcile_counts)
+
+    rebuild = commands.add_parser(
+        "rebuild-clusters", help=cmd_rebuild_clusters.__doc__
+    )
+    rebuild.add_argument("--batch", type=int, default=1000)
+    rebuild.set_defaults(func=cmd_rebuild_clusters)
+
+    commands.add_parser(
+        "fts-rebuild", help=cmd_fts_rebuild.__doc__
+    ).set_defaults(func=cmd_fts_rebuild)
+
+    commands.add_parser(
+        "fts-optimize", help=cmd_fts_optimize.__doc__
+    ).set_defaults(func=cmd_fts_optimize)
+
+    train = commands.add_parser(
+        "train-body-dict", help=cmd_train_body_dict.__doc__
+    )
+    train.add_argument("--samples", type=int, default=5000)
+    train.add_argument("--size", type=int, default=112_640)
+    train.add_argument("--recompress", action="store_true")
+    train.set_defaults(func=cmd_train_body_dict)
+
+    commands.add_parser(
+        "vacuum", help=cmd_vacuum.__doc__
+    ).set_defaults(func=cmd_vacuum)
+
+    compact = commands.add_parser("compact", help=cmd_compact.__doc__)
+    compact.add_argument("--days", type=int, default=None, help="срок хранения (по умолчанию RETENTION_DAYS)")
+    compact.add_argument("--dry-run", action="store_true")
+    compact.set_defaults(func=cmd_compact)
+
+    args = parser.parse_args()
+    init_db()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
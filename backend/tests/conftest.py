@@ -0,0 +1,5 @@
+"""Тесты работают с отдельной временной БД, а не с data/ai_news.db."""
+import os
+import tempfile
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="ai_news_tests_")
@@ -0,0 +1,143 @@
+"""Разбор HTML-источников на сохранённых страницах (tests/fixtures), без сети."""
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.http_client import HTTPClient
+from app.services.parsers.ai_magazine import AI_MAGAZINE_CONFIG, AIMagazineParser
+from app.services.parsers.deepmind import DEEPMIND_CONFIG, DeepMindParser
+from app.services.parsers.html_scraper import CompiledConfig, parse_date, parse_detail, parse_list
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def fixture(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+def test_deepmind_list():
+    items = parse_list(CompiledConfig(DEEPMIND_CONFIG), fixture("deepmind_list.html"), DEEPMIND_CONFIG["list_url"])
+
+    # Навигация, категории, сам список и пагинация отфильтрованы; карточка
+    # из картинки и заголовка склеена в одну статью; якорь отрезан
+    assert [item["url"] for item in items] == [
+        "https://deepmind.google/discover/blog/gemini-robotics-brings-ai-into-the-physical-world/",
+        "https://deepmind.google/discover/blog/alphaevolve-a-gemini-powered-coding-agent/",
+        "https://deepmind.google/discover/blog/taking-a-responsible-path-to-agi/",
+    ]
+    assert [item["title"] for item in items] == [
+        "Gemini Robotics brings AI into the physical world",
+        "AlphaEvolve: A Gemini-powered coding agent for designing advanced algorithms",
+        "Taking a responsible path to AGI",
+    ]
+    assert [item["published_at"] for item in items] == ["2025-03-12", "2025-05-14", "April 2, 2025"]
+    assert items[1]["summary"].startswith("New AI agent evolves algorithms")
+
+
+def test_deepmind_detail():
+    detail = parse_detail(CompiledConfig(DEEPMIND_CONFIG), fixture("deepmind_article.html"))
+
+    assert detail["title"] == "AlphaEvolve: A Gemini-powered coding agent for designing advanced algorithms"
+    assert detail["published_at"] == "2025-05-14T15:00:00+00:00"
+    assert detail["author"] == "AlphaEvolve team"
+    assert detail["summary"].startswith("New AI agent evolves algorithms for math")
+    assert "evolutionary coding agent" in detail["content"]
+
+
+def test_ai_magazine_list():
+    items = parse_list(
+        CompiledConfig(AI_MAGAZINE_CONFIG), fixture("aimagazine_list.html"), AI_MAGAZINE_CONFIG["list_url"]
+    )
+
+    # Разделы, видео, ссылки с query и повтор картинкой отфильтрованы
+    assert [(item["url"], item["title"]) for item in items] == [
+        (
+            "https://aimagazine.com/articles/how-enterprises-are-scaling-agentic-ai-in-2025",
+            "How Enterprises are Scaling Agentic AI in 2025",
+        ),
+        (
+            "https://aimagazine.com/news/nvidia-unveils-new-ai-supercomputer",
+            "Nvidia Unveils New AI Supercomputer",
+        ),
+        ("https://aimagazine.com/articles/top-10-ai-platforms/", "Top 10: AI Platforms"),
+    ]
+    assert all("published_at" not in item for item in items)  # дата только на странице статьи
+
+
+def test_ai_magazine_detail():
+    detail = parse_detail(CompiledConfig(AI_MAGAZINE_CONFIG), fixture("aimagazine_article.html"))
+
+    assert detail["title"] == "How Enterprises are Scaling Agentic AI in 2025"
+    assert detail["published_at"] == "2025-06-05T09:30:00Z"
+    assert detail["author"] == "Jane Doe"
+    # Нет og:description и <article> — запасные селекторы
+    assert detail["summary"] == "Enterprises are moving agentic AI from pilots to production."
+    assert "orchestration platforms" in detail["content"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2025-05-14T15:00:00+00:00", datetime(2025, 5, 14, 15, tzinfo=timezone.utc)),
+        ("2025-06-05T09:30:00Z", datetime(2025, 6, 5, 9, 30, tzinfo=timezone.utc)),
+        ("2025-03-12", datetime(2025, 3, 12)),
+        ("April 2, 2025", datetime(2025, 4, 2)),
+        ("Thu, 05 Jun 2025 09:30:00 GMT", datetime(2025, 6, 5, 9, 30, tzinfo=timezone.utc)),
+        ("yesterday", None),
+        (None, None),
+    ],
+)
+def test_parse_date(value, expected):
+    assert parse_date(value) == expected
+
+
+def _serve(pages: dict) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url not in pages:
+            return httpx.Response(404)
+        return httpx.Response(200, content=fixture(pages[url]), headers={"Content-Type": "text/html"})
+
+    return httpx.MockTransport(handler)
+
+
+async def _collect(parser, pages: dict) -> list:
+    async with HTTPClient(transport=_serve(pages)) as http:
+        return [article async for article in parser.iter_articles(http)]
+
+
+def test_deepmind_iter_articles_merges_detail_page():
+    parser = DeepMindParser()
+    articles = asyncio.run(_collect(parser, {
+        DEEPMIND_CONFIG["list_url"]: "deepmind_list.html",
+        "https://deepmind.google/discover/blog/alphaevolve-a-gemini-powered-coding-agent/": "deepmind_article.html",
+    }))
+
+    assert len(articles) == 3
+    alpha = articles[1]
+    # Страница статьи уточняет дату и автора; без неё остаются поля списка
+    assert alpha["published_at"] == datetime(2025, 5, 14, 15, tzinfo=timezone.utc)
+    assert alpha["author"] == "AlphaEvolve team"
+    assert articles[2]["published_at"] == datetime(2025, 4, 2)
+    assert articles[2]["title"] == "Taking a responsible path to AGI"
+
+
+def test_ai_magazine_iter_articles_skips_seen_urls():
+    parser = AIMagazineParser()
+    parser.seen_urls = {
+        "https://aimagazine.com/news/nvidia-unveils-new-ai-supercomputer",
+        "https://aimagazine.com/articles/top-10-ai-platforms/",
+    }
+    articles = asyncio.run(_collect(parser, {
+        AI_MAGAZINE_CONFIG["list_url"]: "aimagazine_list.html",
+        "https://aimagazine.com/articles/how-enterprises-are-scaling-agentic-ai-in-2025": "aimagazine_article.html",
+    }))
+
+    assert [article["url"] for article in articles] == [
+        "https://aimagazine.com/articles/how-enterprises-are-scaling-agentic-ai-in-2025",
+    ]
+    assert articles[0]["published_at"] == datetime(2025, 6, 5, 9, 30, tzinfo=timezone.utc)
+    assert articles[0]["author"] == "Jane Doe"
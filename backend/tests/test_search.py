@@ -0,0 +1,82 @@
+"""Поиск по FTS5: частые слова не участвуют в BM25, но обязательны для совпадения."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from app.config import settings
+from app.database import init_db, SessionLocal
+from app.models.source import Source
+from app.services.search import count_matches, index_articles, search_articles
+
+# id с запасом: БД общая для всех тестов
+TITLES = {
+    1001: "zebra only here",
+    1002: "zebra and alpha",
+}
+
+
+@pytest.fixture(scope="module")
+def db():
+    init_db()
+    with SessionLocal() as session:
+        source = Source(name="search test", url="https://example.com")
+        session.add(source)
+        session.flush()
+        started_at = datetime(2026, 1, 1)
+        rows = [(article_id, title) for article_id, title in TITLES.items()]
+        # 400 статей со словом alpha — оно частое
+        rows += [(article_id, f"alpha story {article_id}") for article_id in range(1010, 1410)]
+        session.execute(
+            text(
+                "INSERT INTO articles (id, source_id, title, url, summary, published_at) "
+                "VALUES (:id, :source_id, :title, :url, '', :published_at)"
+            ),
+            [
+                {"id": article_id, "source_id": source.id, "title": title, "url": f"https://example.com/{article_id}",
+                 "published_at": started_at + timedelta(minutes=article_id - 1000)}
+                for article_id, title in rows
+            ],
+        )
+        index_articles(session, [(article_id, title, "", "") for article_id, title in rows])
+        session.commit()
+        yield session
+
+
+@pytest.fixture
+def common_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_COMMON_TERM_DOCS", 100)
+
+
+def titles(hits):
+    return [hit.article.title for hit in hits]
+
+
+def test_common_term_still_required(db, common_threshold):
+    hits = search_articles(db, "alpha zebra")
+
+    assert titles(hits) == ["zebra and alpha"]
+    assert all(hit.snippet for hit in hits)
+    assert count_matches(db, "alpha zebra") == 1
+
+
+def test_rare_terms_only(db, common_threshold):
+    assert titles(search_articles(db, "zebra")) == ["zebra and alpha", "zebra only here"]
+
+
+def test_only_common_terms_newest_first(db, common_threshold):
+    hits = search_articles(db, "alpha", limit=3)
+
+    assert titles(hits) == ["alpha story 1409", "alpha story 1408", "alpha story 1407"]
+
+
+def test_without_common_terms_same_results(db, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_COMMON_TERM_DOCS", 1_000_000)
+
+    assert titles(search_articles(db, "alpha zebra")) == ["zebra and alpha"]
+
+
+def test_common_and_rare_with_filters(db, common_threshold):
+    source_id = db.execute(select(Source.id).where(Source.name == "search test")).scalar_one()
+    assert titles(search_articles(db, "alpha zebra", source_id=source_id)) == ["zebra and alpha"]
+    assert search_articles(db, "alpha zebra", since=datetime(2026, 1, 1, 0, 5)) == []